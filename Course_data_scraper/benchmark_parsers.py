@@ -0,0 +1,42 @@
+import re
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from get_courses_data import get_courses_data
+from html_parsers import PARSERS, available_parsers
+
+# compares the parser backends against the original html.parser path on the checked-in pages:
+#   python benchmark_parsers.py
+
+courses_dir = 'all_faculties'
+legacy_requirements_handle = r"javascript:open_win\('Drishot_L\.aspx\?kurs=([\w\d]{8})"
+
+
+def parse_legacy(raw_html):
+    # the original path: full soup, then the regex over the re-serialized tree
+    soup = BeautifulSoup(raw_html.decode("utf-8"), "html.parser")
+    return re.findall(legacy_requirements_handle, str(soup)), get_courses_data(soup)
+
+
+def run(parse_page, pages):
+    start = time.perf_counter()
+    results = [parse_page(raw_html) for raw_html in pages]
+    return time.perf_counter() - start, results
+
+
+if __name__ == "__main__":
+    files = sorted(Path(courses_dir).glob("pg*.html"), key=lambda path: int(path.stem[2:]))
+    pages = [path.read_bytes() for path in files]
+    total_mb = sum(len(page) for page in pages) / 2**20
+    print(f"{len(pages)} pages, {total_mb:.1f} MB")
+
+    legacy_time, expected = run(parse_legacy, pages)
+    print(f"{'legacy (soup + str(soup))':<28}{legacy_time:>8.2f}s{'':>10}")
+
+    for name in available_parsers():
+        elapsed, results = run(PARSERS[name], pages)
+        identical = results == expected
+        print(f"{name:<28}{elapsed:>8.2f}s{legacy_time / elapsed:>8.1f}x  "
+              f"{'identical' if identical else 'OUTPUT DIFFERS'}")
@@ -6,20 +6,27 @@ def get_html_txt(row, html_obj):
 
 def get_courses_data(soup):
     rows = soup.find_all("tr")
+    return group_course_rows(rows,
+                             lambda row: "listtdbld" in row.get("class", []),
+                             get_html_txt)
+
+
+def group_course_rows(rows, is_course_row, row_texts):
+    # shared by all parser backends: is_course_row(row) -> bool, row_texts(row, tag) -> list of cell texts
     courses_data = []
     i = 0
     while i < len(rows):
         row = rows[i]
 
         # Check if the current <tr> has class 'listtdbld'
-        if "listtdbld" in row.get("class", []):
+        if is_course_row(row):
             # Take this row and the next 3 rows
             course_data = []
             # extracting text from html <tr>
-            course_data.append(get_html_txt(row, "td"))
-            course_data.append(get_html_txt(rows[i + 1], "td"))
-            course_data.append(get_html_txt(rows[i + 2], "th"))  # this <tr> has text in form of <th>
-            course_data.append(get_html_txt(rows[i + 3], "td"))
+            course_data.append(row_texts(row, "td"))
+            course_data.append(row_texts(rows[i + 1], "td"))
+            course_data.append(row_texts(rows[i + 2], "th"))  # this <tr> has text in form of <th>
+            course_data.append(row_texts(rows[i + 3], "td"))
 
             courses_data.append(course_data)
             i += 4  # Move to the next potential "listtdbld"
@@ -0,0 +1,85 @@
+import re
+
+from get_courses_data import get_courses_data, group_course_rows
+
+# parser backends for the course search pages. every backend takes the raw page bytes and
+# returns (courses that might have requirements, course rows in the get_courses_data format)
+
+requirements_handle = rb"javascript:open_win\('Drishot_L\.aspx\?kurs=([\w\d]{8})"  # str appears only if there are requi
+
+
+def find_requirement_courses(raw_html):
+    # regex over the raw bytes - no need to re-serialize a parsed tree
+    return [match.decode("ascii") for match in re.findall(requirements_handle, raw_html)]
+
+
+def is_listtdbld(class_attr):
+    return "listtdbld" in (class_attr or "").split()
+
+
+def parse_html_parser(raw_html):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(raw_html.decode("utf-8"), "html.parser")
+    return find_requirement_courses(raw_html), get_courses_data(soup)
+
+
+def parse_lxml(raw_html):
+    from lxml import html
+    doc = html.document_fromstring(raw_html, parser=html.HTMLParser(encoding="utf-8"))
+
+    def row_texts(row, tag):  # same as bs4 get_text(strip=True): strip every text node and join
+        return ["".join(text.strip() for text in cell.itertext()) for cell in row.iter(tag)]
+
+    rows = list(doc.iter("tr"))
+    return find_requirement_courses(raw_html), group_course_rows(rows,
+                                                                 lambda row: is_listtdbld(row.get("class")),
+                                                                 row_texts)
+
+
+def parse_selectolax(raw_html):
+    from selectolax.lexbor import LexborHTMLParser
+    tree = LexborHTMLParser(raw_html)
+
+    def row_texts(row, tag):
+        return [cell.text(deep=True, separator="", strip=True) for cell in row.css(tag)]
+
+    rows = tree.css("tr")
+    return find_requirement_courses(raw_html), group_course_rows(rows,
+                                                                 lambda row: is_listtdbld(row.attributes.get("class")),
+                                                                 row_texts)
+
+
+PARSERS = {
+    "html.parser": parse_html_parser,
+    "lxml": parse_lxml,
+    "selectolax": parse_selectolax,
+}
+PREFERRED_ORDER = ["selectolax", "lxml", "html.parser"]  # fastest first
+
+
+def available_parsers():
+    available = []
+    for name in PREFERRED_ORDER:
+        try:
+            if name == "html.parser":
+                import bs4  # noqa: F401
+            elif name == "lxml":
+                import lxml.html  # noqa: F401
+            else:
+                import selectolax.lexbor  # noqa: F401
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+
+def get_parser(name="auto"):
+    # "auto" picks the fastest installed backend, they all produce the same output
+    if name == "auto":
+        available = available_parsers()
+        if not available:
+            raise ImportError("no HTML parser backend installed (need bs4, lxml or selectolax)")
+        name = available[0]
+    if name not in PARSERS:
+        raise ValueError(f"unknown parser backend '{name}', choose from {list(PARSERS)}")
+    return PARSERS[name]
@@ -1,10 +1,8 @@
-import re
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
-from get_courses_data import get_courses_data
 from course_requirements import get_course_requirements
-
-requirements_handle = r"javascript:open_win\('Drishot_L\.aspx\?kurs=([\w\d]{8})"  # str appears only if there are requi
+from html_parsers import get_parser
 
 
 # courses_dir = "Math_courses"
@@ -13,17 +11,27 @@ def clean_str(st):  # cleans unwanted characters from txt
     return st.replace("\xa0", " ")
 
 
-def create_courses_json(html_files, get_course_requi=False):
+def parse_file(file_name, parser="auto"):
+    with open(file_name, "rb") as file:
+        return get_parser(parser)(file.read())
+
+
+def create_courses_json(html_files, get_course_requi=False, parser="auto", workers=1):
+    # parser: "html.parser", "lxml", "selectolax" or "auto" for the fastest installed one
+    # workers > 1 parses the pages in a process pool. results come back in file order and are merged
+    # serially, so the output (including group order in specific_data) is the same as a serial run
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(html_files) // (workers * 4))
+            parsed_pages = list(executor.map(partial(parse_file, parser=parser), html_files, chunksize=chunksize))
+    else:
+        parsed_pages = (parse_file(file_name, parser) for file_name in html_files)
+
     output_data = {}
-    for file_name in html_files:
+    for matches, courses_data in parsed_pages:
         extracted_data = {}
-        with open(file_name, "r", encoding="utf-8") as file:
-            # html_content = file.read()
-            soup = BeautifulSoup(file, "html.parser")
-            matches = re.findall(requirements_handle, str(soup))
-            for match in matches:
-                extracted_data[match] = True  # to know which courses might have דרישות קדם
-            courses_data = get_courses_data(soup)
+        for match in matches:
+            extracted_data[match] = True  # to know which courses might have דרישות קדם
         dict_creator(courses_data, extracted_data, get_course_requi, output_data)
     return output_data
 
@@ -0,0 +1,107 @@
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from json_file_creator import dict_creator, parse_file, r1_extractor
+
+# incremental re-scrape: the manifest remembers the content hash of every page and the course numbers
+# extracted from it, so only pages whose content changed are parsed again and only their courses rebuilt
+
+
+def hash_page(file_name):
+    with open(file_name, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def load_json(path, default):
+    if Path(path).is_file():
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    return default
+
+
+def page_course_numbers(courses_data):
+    numbers = []
+    for course_data in courses_data:
+        course_number = r1_extractor(course_data[0])[0]
+        if course_number not in numbers:
+            numbers.append(course_number)
+    return numbers
+
+
+def parse_files(html_files, parser, workers):
+    if workers > 1 and len(html_files) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(html_files, executor.map(partial(parse_file, parser=parser), html_files)))
+    return {file_name: parse_file(file_name, parser) for file_name in html_files}
+
+
+def update_courses_json(html_files, courses_json_path, manifest_path, get_course_requi=False,
+                        parser="auto", workers=1, full=False):
+    # returns the updated courses and writes courses.json + the manifest. with full=True every page is reparsed
+    old_courses = load_json(courses_json_path, {})
+    manifest = load_json(manifest_path, {"pages": {}})
+    old_pages = manifest["pages"]
+    if not old_courses:
+        full = True
+
+    hashes = {file_name: hash_page(file_name) for file_name in html_files}
+    changed = [file_name for file_name in html_files
+               if full or old_pages.get(file_name, {}).get("sha256") != hashes[file_name]]
+    removed = [file_name for file_name in old_pages if file_name not in hashes]
+    if not changed and not removed:
+        print("no pages changed, nothing to rebuild")
+        return old_courses
+
+    parsed = parse_files(changed, parser, workers)
+    page_courses = {file_name: old_pages[file_name]["courses"] for file_name in html_files if file_name not in parsed}
+    for file_name, (matches, courses_data) in parsed.items():
+        page_courses[file_name] = page_course_numbers(courses_data)
+
+    # courses that appear (or used to appear) on a changed page must be rebuilt from all their rows,
+    # so unchanged pages that share one of those courses are parsed too
+    affected = set()
+    for file_name in changed:
+        affected.update(page_courses[file_name])
+        affected.update(old_pages.get(file_name, {}).get("courses", []))
+    for file_name in removed:
+        affected.update(old_pages[file_name]["courses"])
+    for file_name in html_files:  # anything missing from courses.json is rebuilt as well
+        affected.update(course_num for course_num in page_courses[file_name] if course_num not in old_courses)
+    neighbours = [file_name for file_name in html_files
+                  if file_name not in parsed and affected.intersection(page_courses[file_name])]
+    parsed.update(parse_files(neighbours, parser, workers))
+    print(f"{len(changed)} changed and {len(removed)} removed pages, {len(affected)} courses to rebuild "
+          f"({len(neighbours)} unchanged pages reparsed for shared courses)")
+
+    rebuilt = {}
+    for file_name in html_files:  # file order keeps the group order of a full run
+        if file_name not in parsed:
+            continue
+        matches, courses_data = parsed[file_name]
+        extracted_data = {match: True for match in matches}
+        rows = [course_data for course_data in courses_data if r1_extractor(course_data[0])[0] in affected]
+        dict_creator(rows, extracted_data, get_course_requi, rebuilt)
+
+    if not get_course_requi:  # to keep existing requirements
+        for course_num, course in rebuilt.items():
+            if course_num in old_courses:
+                course["pre_req"] = old_courses[course_num].get("pre_req", [])
+                course["parallel_req"] = old_courses[course_num].get("parallel_req", [])
+
+    # same course order as a full run: first appearance over the pages in file order
+    output_data = {}
+    for file_name in html_files:
+        for course_num in page_courses[file_name]:
+            if course_num not in output_data:
+                output_data[course_num] = rebuilt[course_num] if course_num in affected else old_courses[course_num]
+
+    with open(courses_json_path, "w", encoding="utf-8") as output_file:
+        json.dump(output_data, output_file, ensure_ascii=False, indent=4)
+    manifest = {"pages": {file_name: {"sha256": hashes[file_name], "courses": page_courses[file_name]}
+                          for file_name in html_files}}
+    with open(manifest_path, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, ensure_ascii=False)
+    return output_data
@@ -8,6 +8,7 @@ let elements = {
 };
 let initialLayout = null;
 let initialNodePositions = null;
+let graphLayout = null;  // Precomputed by courses/graph_layout.py, see fetchGraphLayout
 let showSeminars = false;
 let showGuidedReading = false;
 let showProjects = false;
@@ -347,17 +348,101 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 });
 
+// Decode a compact catalog (see courses/compact_catalog.py) into the course JSON format
+function decodeCompactCatalog(doc) {
+    const strings = doc.strings;
+    const columns = doc.columns;
+    const code = value => typeof value === 'number' ? String(value).padStart(doc.code_width, '0') : value;
+
+    const decodeValue = (field, value, courseNumber) => {
+        if (value === null) return null;
+        if (typeof value === 'object' && !Array.isArray(value)) return value.raw;
+        switch (field) {
+            case 'faculty':
+            case 'type':
+            case 'last_offered':
+            case 'eval_type':
+                return Array.isArray(value) ? value.map(i => strings[i]) : strings[value];
+            case 'preq':
+            case 'pareq':
+                return value.map(code);
+            case 'groups': {
+                const groups = [];
+                for (let i = 0; i < value.length; i += 2) {
+                    groups.push({ group: String(value[i]), lecturer: strings[value[i + 1]] });
+                }
+                return groups;
+            }
+            case 'grade_distribution':
+                return Object.fromEntries(doc.grade_ranges.map((range, i) => [range, value[i]]));
+            default:
+                if (doc.url_templates[field]) {
+                    return value.reduce((url, param, i) => url.replace(`{${i}}`, String(param)),
+                        doc.url_templates[field].replace('{code}', courseNumber));
+                }
+                return value;
+        }
+    };
+
+    const courses = {};
+    doc.codes.forEach((number, row) => {
+        const courseNumber = code(number);
+        const course = {};
+        for (const field of doc.key_orders[doc.key_order[row]]) {
+            course[field] = decodeValue(field, columns[field][row], courseNumber);
+        }
+        courses[courseNumber] = course;
+    });
+    return courses;
+}
+
+// Fetch a department's courses, preferring the compact catalog over the full JSON
+async function fetchCourseCatalog(name) {
+    try {
+        const response = await fetch(`courses/compact/${name}.compact.json`);
+        if (response.ok) {
+            return decodeCompactCatalog(await response.json());
+        }
+    } catch (error) {
+        console.warn(`Compact catalog for ${name} unavailable, loading the full JSON`, error);
+    }
+    const response = await fetch(`courses/JSONs/${name}.json`);
+    return response.json();
+}
+
+// Fetch the precomputed graph artifact (prerequisite paths, and depths, complexity and positions
+// per view). Returns null if it's missing, in which case the graph is laid out in the browser.
+async function fetchGraphLayout() {
+    try {
+        const response = await fetch('courses/graph/graph_layout.json');
+        if (!response.ok) {
+            return null;
+        }
+        const artifact = await response.json();
+        const paths = new Map(artifact.nodes.map((node, index) =>
+            [node.id, new Set(artifact.paths[index].map(i => artifact.nodes[i].id))]));
+        // Each view maps course id -> { depth, complexity, x, y } for exactly its courses
+        const views = artifact.views.map(view => new Map(view.nodes.map((nodeIndex, i) => [
+            artifact.nodes[nodeIndex].id,
+            { depth: view.depth[i], complexity: view.complexity[i], x: view.x[i], y: view.y[i] }
+        ])));
+        return { paths, views };
+    } catch (error) {
+        console.warn('Graph layout unavailable, computing it in the browser', error);
+        return null;
+    }
+}
+
 // Load and transform course data from JSON files
 async function loadCourseData() {
     try {
-        // Load both math and physics data
-        const [mathResponse, physicsResponse] = await Promise.all([
-            fetch('courses/JSONs/math.json'),
-            fetch('courses/JSONs/physics.json')
+        // Load both math and physics data, and the precomputed layout alongside them
+        const [mathData, physicsData, layoutData] = await Promise.all([
+            fetchCourseCatalog('math'),
+            fetchCourseCatalog('physics'),
+            fetchGraphLayout()
         ]);
-
-        const mathData = await mathResponse.json();
-        const physicsData = await physicsResponse.json();
+        graphLayout = layoutData;
 
         // Store the raw JSON data
         courses_math = mathData;
@@ -917,8 +1002,8 @@ function handleNodeClick(event) {
         // First, hide all elements
         cy.elements().addClass('hidden');
         
-        // Get minimal prerequisite path
-        const criticalPath = getMinimalPrerequisitePath(courseId, courses);
+        // Get minimal prerequisite path, precomputed when the graph artifact is loaded
+        const criticalPath = graphLayout?.paths.get(courseId) || getMinimalPrerequisitePath(courseId, courses);
         
         // Calculate complexity and depths for the critical path
         const { complexity, depths } = calculateCourseComplexity(
@@ -1285,8 +1370,18 @@ function updateGraph() {
         return isTypeAllowed && isConnectivityAllowed;
     });
 
-    // Calculate complexity and depths for all filtered courses
-    const { complexity, depths } = calculateCourseComplexity(filteredCourses);
+    // Use the precomputed complexity, depths and positions of an artifact view holding exactly
+    // the filtered courses; any other set is laid out for the filtered courses here
+    const filteredIds = new Set(filteredCourses.map(course => course.id));
+    const layoutNodes = graphLayout?.views.find(view =>
+        view.size === filteredIds.size && [...filteredIds].every(id => view.has(id))) || null;
+    let complexity, depths;
+    if (layoutNodes) {
+        complexity = new Map(filteredCourses.map(course => [course.id, layoutNodes.get(course.id).complexity]));
+        depths = new Map(filteredCourses.map(course => [course.id, layoutNodes.get(course.id).depth]));
+    } else {
+        ({ complexity, depths } = calculateCourseComplexity(filteredCourses));
+    }
     
     // Create graph elements with complexity information
     const elements = {
@@ -1369,7 +1464,15 @@ function updateGraph() {
     );
     
     // Apply layout
-    const layout = cy.layout({
+    const layout = layoutNodes ? cy.layout({
+        name: 'preset',
+        padding: 30,
+        animate: false,
+        positions: (node) => {
+            const { x, y } = layoutNodes.get(node.id());
+            return { x, y };
+        }
+    }) : cy.layout({
         name: 'dagre',
         rankDir: 'TB',
         padding: 30,
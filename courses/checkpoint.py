@@ -0,0 +1,87 @@
+import json
+import sqlite3
+import time
+from typing import Dict
+
+
+class CheckpointStore:
+    """
+    Durable record of enriched course fields, kept in an SQLite side table next to the course JSON.
+
+    Each course is committed as soon as its enrichment finishes, so an interrupted
+    run can be resumed without fetching the completed courses again.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: Path to the checkpoint database (created if missing)
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS enrichment (
+                course_number TEXT NOT NULL,
+                field TEXT NOT NULL,
+                value TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (course_number, field)
+            )
+        """)
+        self.conn.commit()
+
+    def save_course(self, course_number: str, fields: Dict):
+        """
+        Commit the enriched fields of a single course.
+
+        Args:
+            course_number: Course number the fields belong to
+            fields: Field name -> value (any JSON-serializable value)
+        """
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO enrichment (course_number, field, value, updated_at) VALUES (?, ?, ?, ?)",
+                [(course_number, field, json.dumps(value, ensure_ascii=False), now)
+                 for field, value in fields.items()]
+            )
+
+    def load(self) -> Dict[str, Dict]:
+        """
+        Load every checkpointed field.
+
+        Returns:
+            Dictionary mapping course numbers to their enriched fields
+        """
+        courses = {}
+        for course_number, field, value in self.conn.execute(
+                "SELECT course_number, field, value FROM enrichment"):
+            courses.setdefault(course_number, {})[field] = json.loads(value)
+        return courses
+
+    def apply(self, courses: Dict[str, Dict]) -> int:
+        """
+        Copy checkpointed fields into the given courses.
+
+        Args:
+            courses: Course data to update in place
+
+        Returns:
+            Number of courses that received checkpointed fields
+        """
+        restored = 0
+        for course_number, fields in self.load().items():
+            if course_number in courses:
+                courses[course_number].update(fields)
+                restored += 1
+        return restored
+
+    def clear(self):
+        """Drop all checkpointed progress."""
+        with self.conn:
+            self.conn.execute("DELETE FROM enrichment")
+
+    def close(self):
+        self.conn.close()
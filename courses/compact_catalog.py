@@ -0,0 +1,296 @@
+import gzip
+import json
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from grade_summary import GRADE_RANGES
+
+FORMAT_NAME = "coursesearch-compact"
+FORMAT_VERSION = 1
+
+# Compact catalogs live apart from the department JSONs, which the importers load as a whole directory
+COMPACT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'compact')
+
+# {code} is the course's own number; {0}, {1}, ... are stored per course
+URL_TEMPLATES = {
+    'course_link': "https://www.ims.tau.ac.il/Tal/Syllabus/Syllabus_L.aspx?course={code}{0}&year={1}",
+    'req_url': "https://www.ims.tau.ac.il/Tal/kr/Drishot_L.aspx?kurs={code}&sem={0}",
+}
+
+# Columns whose strings are stored once in the string table and referenced by index
+DICTIONARY_COLUMNS = ('faculty', 'type', 'last_offered', 'eval_type')
+COURSE_LIST_COLUMNS = ('preq', 'pareq')
+
+
+class CatalogEncoder:
+    """
+    Encodes a course collection into the compact columnar catalog format.
+
+    Layout of the encoded document:
+        codes: course numbers as integers (zero-padded back to code_width digits)
+        key_orders / key_order: the distinct key lists and each course's index into them,
+            so absent keys and key order survive the round trip
+        strings: string table for faculty, type, last offered, eval type and lecturers
+        url_templates: URL patterns; course_link and req_url store only their parameters
+        grade_ranges: bucket labels; grade_distribution stores only the counts
+        columns: one list per field, aligned with codes
+
+    Any value that doesn't fit its column's encoding is stored as {"raw": value}.
+    """
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._string_index: Dict[str, int] = {}
+        # Escaped templates; {code} is filled in per course so it can't swallow a parameter
+        self._url_patterns = {
+            field: re.escape(template).replace(r'\{0\}', '(.*?)').replace(r'\{1\}', '(.*?)')
+            for field, template in URL_TEMPLATES.items()
+        }
+
+    def _string(self, value: str) -> int:
+        index = self._string_index.get(value)
+        if index is None:
+            index = self._string_index[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    @staticmethod
+    def _raw(value: Any) -> Dict:
+        return {'raw': value}
+
+    @staticmethod
+    def _number(value: str, width: int) -> Any:
+        """Course number as an integer if it pads back to the same string."""
+        if value.isdigit() and len(value) == width and value.isascii():
+            return int(value)
+        return value
+
+    @staticmethod
+    def _param(value: str) -> Any:
+        """URL parameter as an integer if that round-trips exactly."""
+        return int(value) if value.isdigit() and value.isascii() and str(int(value)) == value else value
+
+    def _encode_value(self, field: str, value: Any, course_number: str, code_width: int) -> Any:
+        if value is None:
+            return None
+        if field in DICTIONARY_COLUMNS:
+            if isinstance(value, str):
+                return self._string(value)
+            if isinstance(value, list) and all(isinstance(item, str) for item in value):
+                return [self._string(item) for item in value]
+        elif field in COURSE_LIST_COLUMNS:
+            # Course numbers become integers; logic words such as 'או' stay strings
+            if isinstance(value, list) and all(isinstance(item, str) for item in value):
+                return [self._number(item, code_width) for item in value]
+        elif field == 'groups':
+            # Flattened [group, lecturer, group, lecturer, ...]
+            if isinstance(value, list) and all(
+                    isinstance(group, dict) and list(group) == ['group', 'lecturer']
+                    and isinstance(group['group'], str) and isinstance(group['lecturer'], str)
+                    for group in value):
+                encoded = []
+                for group in value:
+                    encoded.append(self._param(group['group']))
+                    encoded.append(self._string(group['lecturer']))
+                return encoded
+        elif field in URL_TEMPLATES:
+            if isinstance(value, str):
+                pattern = self._url_patterns[field].replace(r'\{code\}', re.escape(course_number))
+                match = re.fullmatch(pattern, value)
+                if match:
+                    return [self._param(param) for param in match.groups()]
+        elif field == 'grade_distribution':
+            if isinstance(value, dict) and list(value) == GRADE_RANGES \
+                    and all(type(count) is int for count in value.values()):
+                return list(value.values())
+        elif not isinstance(value, dict):
+            return value
+        return self._raw(value)
+
+    def encode(self, courses: Dict[str, Dict]) -> Dict:
+        """
+        Encode a course collection.
+
+        Args:
+            courses: Course number -> course data, as written to courses/JSONs
+
+        Returns:
+            The compact document (JSON-serializable)
+        """
+        widths = {len(code) for code in courses if code.isdigit()}
+        code_width = max(widths) if widths else 0
+
+        key_orders: List[List[str]] = []
+        key_order_index: Dict[tuple, int] = {}
+        key_order = []
+        columns: Dict[str, List] = {}
+        codes = []
+
+        for row, (course_number, course_data) in enumerate(courses.items()):
+            codes.append(self._number(course_number, code_width))
+            keys = tuple(course_data)
+            if keys not in key_order_index:
+                key_order_index[keys] = len(key_orders)
+                key_orders.append(list(keys))
+            key_order.append(key_order_index[keys])
+
+            for field, value in course_data.items():
+                column = columns.get(field)
+                if column is None:
+                    # Fields first seen on a later course are absent (null) for the earlier ones
+                    column = columns[field] = [None] * row
+                column.append(self._encode_value(field, value, course_number, code_width))
+            for field, column in columns.items():
+                if len(column) == row:
+                    column.append(None)
+
+        return {
+            'format': FORMAT_NAME,
+            'version': FORMAT_VERSION,
+            'code_width': code_width,
+            'codes': codes,
+            'key_orders': key_orders,
+            'key_order': key_order,
+            'strings': self.strings,
+            'url_templates': URL_TEMPLATES,
+            'grade_ranges': GRADE_RANGES,
+            'columns': columns
+        }
+
+
+def encode_catalog(courses: Dict[str, Dict]) -> Dict:
+    """Encode a course collection into the compact catalog format (see CatalogEncoder)."""
+    return CatalogEncoder().encode(courses)
+
+
+def decode_catalog(document: Dict) -> Dict[str, Dict]:
+    """
+    Decode a compact catalog back into the course collection it was encoded from.
+
+    Args:
+        document: Parsed compact catalog
+
+    Returns:
+        Course number -> course data, identical to the encoded collection (key order included)
+    """
+    if document.get('format') != FORMAT_NAME or document.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Not a {FORMAT_NAME} v{FORMAT_VERSION} document")
+
+    width = document['code_width']
+    strings = document['strings']
+    templates = document['url_templates']
+    grade_ranges = document['grade_ranges']
+    columns = document['columns']
+
+    def code(value):
+        return str(value).zfill(width) if isinstance(value, int) else value
+
+    def decode_value(field, value, course_number):
+        if isinstance(value, dict):
+            return value['raw']
+        if value is None:
+            return None
+        if field in DICTIONARY_COLUMNS:
+            return [strings[i] for i in value] if isinstance(value, list) else strings[value]
+        if field in COURSE_LIST_COLUMNS:
+            return [code(item) for item in value]
+        if field == 'groups':
+            return [{'group': str(value[i]), 'lecturer': strings[value[i + 1]]}
+                    for i in range(0, len(value), 2)]
+        if field in templates:
+            url = templates[field].replace('{code}', course_number)
+            for i, param in enumerate(value):
+                url = url.replace(f'{{{i}}}', str(param))
+            return url
+        if field == 'grade_distribution':
+            return dict(zip(grade_ranges, value))
+        return value
+
+    courses = {}
+    for row, (number, order) in enumerate(zip(document['codes'], document['key_order'])):
+        course_number = code(number)
+        courses[course_number] = {
+            field: decode_value(field, columns[field][row], course_number)
+            for field in document['key_orders'][order]
+        }
+    return courses
+
+
+def write_compact_catalog(courses: Dict[str, Dict], path: str) -> int:
+    """
+    Write a course collection as a compact catalog file.
+
+    Returns:
+        Size of the written file in bytes
+    """
+    encoded = json.dumps(encode_catalog(courses), ensure_ascii=False, separators=(',', ':'))
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(encoded)
+    return os.path.getsize(path)
+
+
+def read_compact_catalog(path: str) -> Dict[str, Dict]:
+    """Read a compact catalog file back into a course collection."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return decode_catalog(json.load(f))
+
+
+def compact_path(json_path: str, compact_dir: str = COMPACT_DIR) -> str:
+    """Path of the compact catalog of a course JSON file (<compact_dir>/<name>.compact.json)."""
+    name = os.path.splitext(os.path.basename(json_path))[0]
+    return os.path.join(compact_dir, f"{name}.compact.json")
+
+
+def benchmark(json_path: str, repeat: int = 20) -> Dict:
+    """
+    Compare a pretty-printed course JSON with its compact catalog.
+
+    Args:
+        json_path: Course JSON written with indent=2
+        repeat: Parse repetitions for the timings
+
+    Returns:
+        Dictionary with raw and gzip sizes and parse times of both formats, and whether
+        the compact file decodes back to the same courses
+    """
+    with open(json_path, 'rb') as f:
+        original = f.read()
+    courses = json.loads(original)
+    compact = json.dumps(encode_catalog(courses), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def parse_time(parse) -> float:
+        start_time = time.perf_counter()
+        for _ in range(repeat):
+            parse()
+        return (time.perf_counter() - start_time) / repeat
+
+    return {
+        'courses': len(courses),
+        'json_bytes': len(original),
+        'compact_bytes': len(compact),
+        'json_gzip_bytes': len(gzip.compress(original)),
+        'compact_gzip_bytes': len(gzip.compress(compact)),
+        'json_parse_ms': parse_time(lambda: json.loads(original)) * 1000,
+        'compact_parse_ms': parse_time(lambda: json.loads(compact)) * 1000,
+        'compact_decode_ms': parse_time(lambda: decode_catalog(json.loads(compact))) * 1000,
+        'round_trip': decode_catalog(json.loads(compact)) == courses
+    }
+
+
+if __name__ == "__main__":
+    json_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'JSONs')
+    print(f"{'file':<16}{'JSON':>10}{'compact':>10}{'JSON gz':>10}{'compact gz':>12}"
+          f"{'JSON ms':>10}{'compact ms':>12}{'+decode ms':>12}")
+    for name in sorted(os.listdir(json_dir)):
+        if not name.endswith('.json'):
+            continue
+        result = benchmark(os.path.join(json_dir, name))
+        print(f"{name:<16}{result['json_bytes']:>10}{result['compact_bytes']:>10}"
+              f"{result['json_gzip_bytes']:>10}{result['compact_gzip_bytes']:>12}"
+              f"{result['json_parse_ms']:>10.2f}{result['compact_parse_ms']:>12.2f}"
+              f"{result['compact_decode_ms']:>12.2f}"
+              + ("" if result['round_trip'] else "  ROUND TRIP FAILED"))
@@ -1,15 +1,25 @@
 from fetch_courses import CourseDownloader
 from proc_courses import CourseProcessor
+from pipeline import CoursePipeline
+from graph_layout import GRAPH_LAYOUT_PATH, write_graph_artifact
+from requirement_validator import RequirementValidator
 from typing import List
+import json
 import os
 from typing import Optional
+import argparse
 
 class CourseSearchDB:
-    def __init__(self):
+    def __init__(self, max_workers: int = 4, requests_per_second: float = 1.0):
+        """
+        Args:
+            max_workers: Number of courses enriched concurrently
+            requests_per_second: Politeness budget for the TAU course pages
+        """
         self.downloader = CourseDownloader()
-        self.processor = CourseProcessor()
+        self.processor = CourseProcessor(max_workers=max_workers, requests_per_second=requests_per_second)
         
-    def generate_course_trees(self, years: List[str], faculty: str, departments: Optional[List[str]] = None, keys: List[str] = ['lessons', 'exams', 'exam_links'], merge: bool = True, limit: int = None) -> None:
+    def generate_course_trees(self, years: List[str], faculty: str, departments: Optional[List[str]] = None, keys: List[str] = ['lessons', 'exams', 'exam_links'], merge: bool = True, limit: int = None, resume: bool = False) -> None:
         """
         Generate and process course data for the specified years, faculty, and departments.
         
@@ -18,6 +28,7 @@ class CourseSearchDB:
             faculty: Faculty name (e.g. 'מדעים מדויקים')
             departments: List of departments to process (e.g. ['פיזיקה', 'מתמטיקה'])
             merge: Whether to merge courses from multiple years
+            resume: Whether to continue an interrupted run from its enrichment checkpoint
         """
         # Create base directory for JSONs if it doesn't exist
         json_dir = os.path.join(os.path.dirname(__file__))
@@ -40,44 +51,100 @@ class CourseSearchDB:
         
         json_path = os.path.join(json_dir, f"{base_filename}.json")
         
-        # Download raw courses from Arazim Project
+        # Download raw courses from Arazim Project - kept in memory, no intermediate file
         print("\nStep 1: Downloading courses...")
-        self.downloader.fetch_courses(
+        courses = self.downloader.fetch_courses(
             years=years,
             faculty=faculty,
             departments=departments,
+            save_to_file=False,
             merge=merge
         )
-        
-        # Delete tirgulim entries
-        print("\nStep 2: Removing unneeded keys...")
-        self.processor.delete_keys(json_path, keys)
-        
+        if not merge:
+            # Results are keyed by term, most recent first - keep each course's latest offering
+            merged_courses = {}
+            for term_courses in courses.values():
+                for course_number, course_data in term_courses.items():
+                    merged_courses.setdefault(course_number, course_data)
+            courses = merged_courses
+
         """
         # Validate and fix course types
-        print("\nStep 3: Validating course types...")
         changes = self.processor.validate_course_type(json_path)
         if changes:
             print(f"Updated types for {len(changes)} courses")
         """
 
-        # Complete course data with links, eval types, and requirements
-        print("\nStep 4: Completing course data...")
-        courses = self.processor.complete_course_data(json_path, limit=limit)
-        
-        # Split data by department
-        print("\nStep 5: Splitting data by department...")
-        dept_counts = self.processor.split_by_department(json_path)
-        
-        # Remove logic words
-        print("\nStep 6: Removing logic words...")
-        self.processor.remove_logic_words(json_path, logic_words=['וגם'])
+        # Every stage works on the same in-memory collection; the department
+        # split runs last so the department files get the cleaned data
+        departments = {}
+        validator = RequirementValidator()
+
+        def remove_keys(courses):
+            # Delete tirgulim entries
+            self.processor.delete_keys_from_courses(courses, keys)
+            return courses
+
+        def complete_data(courses):
+            # Complete course data with links, eval types, and requirements, re-checking
+            # the requirements of every finished batch as it comes in
+            validator.validate(courses)
 
-        # reorgnize keys to the new format
-        print("\nStep 7: Reorganizing keys...")
-        self.processor.reorgnize_keys(json_path)
+            def check_batch(course_numbers):
+                validator.update(courses, course_numbers)
+                validator.print_summary(only_changes=True)
+
+            return self.processor.complete_courses(courses, limit=limit, resume=resume,
+                                                   checkpoint_path=f"{json_path}.checkpoint.db",
+                                                   on_batch=check_batch)
+
+        def remove_logic_words(courses):
+            self.processor.remove_logic_words_from_courses(courses, logic_words=['וגם'])
+            return courses
+
+        def reorganize_keys(courses):
+            # reorgnize keys to the new format
+            return self.processor.reorganize_course_keys(courses)[0]
+
+        def validate_requirements(courses):
+            # Cycles, dangling references and self-references over the final requirement lists
+            validator.validate(courses)
+            validator.print_summary()
+            validator.write_report(f"{os.path.splitext(json_path)[0]}.validation.json")
+            return courses
+
+        def split_departments(courses):
+            departments.update(self.processor.split_courses_by_department(courses))
+            return courses
+
+        def build_graph_layout(courses):
+            # Precompute the course graph layout for the departments course_graph.js shows, in its order
+            catalogs = [departments[dept] for dept in ('מתמטיקה', 'פיזיקה') if dept in departments]
+            stats = write_graph_artifact(catalogs)
+            print(f"Graph layout ({GRAPH_LAYOUT_PATH}): {stats['nodes']} nodes, {stats['edges']} edges, "
+                  f"{stats['bytes']} bytes in {stats['elapsed_seconds']:.3f}s")
+            return courses
+
+        pipeline = (
+            CoursePipeline()
+            .add_stage("Removing unneeded keys", remove_keys)
+            .add_stage("Completing course data", complete_data)
+            .add_stage("Removing logic words", remove_logic_words)
+            .add_stage("Reorganizing keys", reorganize_keys)
+            .add_stage("Validating requirements", validate_requirements)
+            .add_stage("Splitting data by department", split_departments)
+            .add_stage("Building graph layout", build_graph_layout)
+        )
+        courses = pipeline.run(courses)
+
+        # Single serialization of the results
+        print("\nSaving results...")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(courses, f, ensure_ascii=False, indent=2)
+        dept_counts = self.processor.save_departments(departments, json_dir)
 
         # Print final summary
+        pipeline.print_report()
         print("\nProcessing completed!")
         print("Created the following department files:")
         for dept, count in dept_counts.items():
@@ -85,11 +152,20 @@ class CourseSearchDB:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the course tree JSONs")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue an interrupted run instead of re-fetching finished courses")
+    parser.add_argument('--limit', type=int, default=None, help="maximum number of courses to enrich")
+    parser.add_argument('--workers', type=int, default=4, help="number of courses enriched concurrently")
+    args = parser.parse_args()
+
     # Example usage
-    course_search_db = CourseSearchDB()
+    course_search_db = CourseSearchDB(max_workers=args.workers)
     course_search_db.generate_course_trees(
         years=['2025', '2024', '2023', '2022', '2021'],
         faculty='מדעים מדויקים',
         keys=['lessons', 'exams' 'exam_links'],
-        merge=True
-    )
\ No newline at end of file
+        merge=True,
+        limit=args.limit,
+        resume=args.resume
+    )
@@ -0,0 +1,598 @@
+import itertools
+import json
+import math
+import os
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from prereq_graph import COREQ, UNREACHABLE, CourseGraph
+
+# Regular semesters; a course is offered in the semester of its last_offered entry
+# ('2025b' -> 'b') every year, and in every semester if that is unknown
+TERMS = ('a', 'b')
+
+
+def next_term(term: str) -> str:
+    """'2025a' -> '2025b' -> '2026a'."""
+    year, letter = int(term[:-1]), term[-1]
+    index = TERMS.index(letter) + 1
+    return f"{year + index // len(TERMS)}{TERMS[index % len(TERMS)]}"
+
+
+class DegreePlanner:
+    """
+    Builds semester plans that respect prerequisites (an earlier semester), parallel
+    requirements (the same or an earlier semester), the semester each course is offered
+    in and a per-semester course and/or credit cap.
+
+    plan() runs a topological list scheduler: semester by semester, it takes the available
+    courses with the longest remaining chain first. With optimize=True, a branch-and-bound
+    search over the maximal course sets of each semester then tries to shorten that plan
+    within a time limit. Both are repeated for every choice of 'או' alternatives (within the
+    time limit), keeping the shortest plan.
+    """
+
+    def __init__(self, catalogs: List[Dict[str, Dict]], credits: Optional[Dict[str, float]] = None,
+                 default_credits: float = 1.0, offerings: Optional[Dict[str, Iterable[str]]] = None,
+                 graph: Optional[CourseGraph] = None):
+        """
+        Args:
+            catalogs: Department course collections (course number -> course data)
+            credits: Course number -> credits; falls back to a course's 'credits' key, then
+                to default_credits (the course JSONs carry no credits yet)
+            default_credits: Credits of courses without credit data
+            offerings: Course number -> semester letters it is offered in, overriding the
+                letter of its last_offered entry
+            graph: Prebuilt CourseGraph of the same catalogs
+        """
+        self.graph = graph or CourseGraph(catalogs)
+        self.default_credits = float(default_credits)
+        self.offered: Dict[int, Set[str]] = {}
+        self.credits: Dict[int, float] = {}
+        credits = credits or {}
+        offerings = offerings or {}
+        for catalog in catalogs:
+            for course_number, course_data in catalog.items():
+                node = self.graph.index[course_number]
+                if node in self.offered:
+                    continue
+                last_offered = course_data.get('last_offered') or ''
+                if course_number in offerings:
+                    self.offered[node] = set(offerings[course_number]) & set(TERMS) or set(TERMS)
+                else:
+                    self.offered[node] = {last_offered[-1]} if last_offered[-1:] in TERMS else set(TERMS)
+                self.credits[node] = float(credits.get(course_number, course_data.get('credits') or default_credits))
+        # External courses (other faculties, retired courses) only have the given credits
+        for node in range(self.graph.num_courses, self.graph.num_nodes):
+            self.credits[node] = float(credits.get(self.graph.codes[node], default_credits))
+
+        # Requirement clauses of every node: (kind, alternatives)
+        in_offsets = self.graph.in_offsets.tolist()
+        in_sources = self.graph.in_sources.tolist()
+        in_kinds = self.graph.in_kinds.tolist()
+        in_clauses = self.graph.in_clauses.tolist()
+        self._clauses: List[List[Tuple[int, List[int]]]] = []
+        for node in range(self.graph.num_nodes):
+            clauses: Dict[int, Tuple[int, List[int]]] = {}
+            for edge in range(in_offsets[node], in_offsets[node + 1]):
+                clauses.setdefault(in_clauses[edge], (in_kinds[edge], []))[1].append(in_sources[edge])
+            self._clauses.append(list(clauses.values()))
+
+    def _offered(self, node: int, letter: str) -> bool:
+        # External courses (other faculties) have no offering data
+        return letter in self.offered.get(node, TERMS)
+
+    def _credits(self, node: int) -> float:
+        return self.credits.get(node, self.default_credits)
+
+    def required_courses(self, completed: Iterable[str], targets: Iterable[str]) -> List[str]:
+        """
+        The courses that have to be taken to reach the targets: the targets and, transitively,
+        one course of every requirement clause that isn't already met. Of an 'או' clause, a
+        course already required is preferred, then the one available earliest.
+
+        Raises:
+            ValueError: If a target is unknown or its requirements can't be met
+        """
+        completed_nodes, target_nodes = self._resolve(completed, targets)
+        earliest = self._reachable(completed_nodes, target_nodes)
+        return [self.graph.codes[node] for node in next(self._selections(completed_nodes, target_nodes, earliest))]
+
+    def _resolve(self, completed: Iterable[str], targets: Iterable[str]) -> Tuple[Set[int], List[int]]:
+        completed_nodes = {self.graph.index[code] for code in completed if code in self.graph.index}
+        target_nodes = []
+        for code in targets:
+            if code not in self.graph.index:
+                raise ValueError(f"Unknown course {code}")
+            if self.graph.index[code] not in completed_nodes:
+                target_nodes.append(self.graph.index[code])
+        return completed_nodes, target_nodes
+
+    def _reachable(self, completed: Set[int], targets: List[int]) -> List[int]:
+        """Earliest semester of every node (see CourseGraph), checking that the targets can be reached."""
+        earliest = self.graph._earliest(self.graph._ids(self.graph.codes[node] for node in completed)).tolist()
+        unreachable = [self.graph.codes[node] for node in targets if earliest[node] == UNREACHABLE]
+        if unreachable:
+            raise ValueError(f"Requirements of {', '.join(unreachable)} can't be met (requirement cycle)")
+        return earliest
+
+    def _forced(self, completed: Set[int], targets: List[int], earliest: List[int]) -> List[int]:
+        """The courses every selection holds: the targets and, transitively, the only reachable course of a clause."""
+        forced = list(dict.fromkeys(targets))
+        members = set(forced)
+        for node in forced:  # Grows while iterating
+            for _, alternatives in self._clauses[node]:
+                if any(alternative in completed for alternative in alternatives):
+                    continue
+                reachable = [alternative for alternative in alternatives if earliest[alternative] != UNREACHABLE]
+                if len(reachable) == 1 and reachable[0] not in members:
+                    forced.append(reachable[0])
+                    members.add(reachable[0])
+        return forced
+
+    def _selections(self, completed: Set[int], targets: List[int], earliest: List[int]) -> Iterator[List[int]]:
+        """
+        Every set of courses that meets the targets' requirements: per unmet clause, one of
+        its reachable courses is chosen to meet it, whether or not that course is already
+        required (taking an extra alternative can make a plan shorter). Any plan meets each
+        clause with some course, so one of these sets is the set of the shortest plan.
+
+        Generated lazily and deduplicated, in preference order: the first set chooses a
+        course already required, then the one available earliest (see required_courses).
+        """
+        seen: Set[frozenset] = set()
+
+        def search(required: Dict[int, None], pending: List[List[int]]) -> Iterator[List[int]]:
+            # Clauses with a single choice are resolved in place; only 'או' choices branch
+            while pending:
+                alternatives = pending[-1]
+                if any(alternative in completed for alternative in alternatives):
+                    pending.pop()
+                    continue
+                reachable = [alternative for alternative in alternatives if earliest[alternative] != UNREACHABLE]
+                if len(reachable) > 1:
+                    break
+                pending.pop()
+                if reachable[0] not in required:
+                    required[reachable[0]] = None
+                    pending.extend(alternatives for _, alternatives in reversed(self._clauses[reachable[0]]))
+            else:
+                key = frozenset(required)
+                if key not in seen:
+                    seen.add(key)
+                    yield list(required)
+                return
+
+            rest = pending[:-1]
+            if any(alternative in required for alternative in reachable):
+                yield from search(dict(required), list(rest))
+            for alternative in sorted((alternative for alternative in reachable if alternative not in required),
+                                      key=lambda alternative: (earliest[alternative], alternative)):
+                added = dict(required)
+                added[alternative] = None
+                yield from search(added, rest + [alternatives for _, alternatives
+                                                 in reversed(self._clauses[alternative])])
+
+        required = dict.fromkeys(targets)
+        yield from search(required, [alternatives for node in reversed(list(required))
+                                     for _, alternatives in reversed(self._clauses[node])])
+
+    def _constraints(self, completed: Set[int], required: List[int], earliest: Optional[List[int]] = None):
+        """
+        Per required course, its unmet prerequisite and parallel requirement clauses (within
+        required). Given earliest, only the clauses with a single reachable course are kept,
+        the constraints every selection shares (see _forced).
+        """
+        required_set = set(required)
+        prereqs: Dict[int, List[List[int]]] = {}
+        coreqs: Dict[int, List[List[int]]] = {}
+        for node in required:
+            prereqs[node], coreqs[node] = [], []
+            for kind, alternatives in self._clauses[node]:
+                if any(alternative in completed for alternative in alternatives):
+                    continue
+                if earliest is not None and sum(earliest[alternative] != UNREACHABLE
+                                                for alternative in alternatives) > 1:
+                    continue
+                options = [alternative for alternative in alternatives if alternative in required_set]
+                (coreqs if kind == COREQ else prereqs)[node].append(options)
+        return prereqs, coreqs
+
+    def _tails(self, required: List[int], prereqs, coreqs, first_letter_index: int) -> Dict[int, List[int]]:
+        """
+        Lower bound on the semesters from a semester of each parity until a course and
+        everything that can only follow it are done (caps ignored). Only single-course
+        clauses count, since an 'או' clause may be met another way.
+        """
+        dependents: Dict[int, List[Tuple[int, bool]]] = {node: [] for node in required}
+        for node in required:
+            for clauses, is_prereq in ((prereqs[node], True), (coreqs[node], False)):
+                for options in clauses:
+                    if len(options) == 1:
+                        dependents[options[0]].append((node, is_prereq))
+
+        # Depth-first postorder: every course after its dependents, except for the edges back
+        # into a group of parallel requirements of each other, which are left out of the bound
+        order: List[int] = []
+        visited: Set[int] = set()
+        for root in required:
+            if root in visited:
+                continue
+            visited.add(root)
+            stack = [(root, iter(dependents[root]))]
+            while stack:
+                node, children = stack[-1]
+                for child, _ in children:
+                    if child not in visited:
+                        visited.add(child)
+                        stack.append((child, iter(dependents[child])))
+                        break
+                else:
+                    stack.pop()
+                    order.append(node)
+
+        tails: Dict[int, List[int]] = {}
+        for node in order:
+            tails[node] = []
+            for parity in range(len(TERMS)):
+                letter = TERMS[(first_letter_index + parity) % len(TERMS)]
+                wait = 0 if self._offered(node, letter) else 1
+                tail = wait + 1
+                for dependent, is_prereq in dependents[node]:
+                    if dependent not in tails:
+                        continue
+                    start = wait + 1 if is_prereq else wait
+                    tail = max(tail, start + tails[dependent][(parity + start) % len(TERMS)])
+                tails[node].append(tail)
+        return tails
+
+    def plan(self, completed: Iterable[str], targets: Iterable[str], max_courses: Optional[int] = None,
+             max_credits: Optional[float] = None, start_term: str = '2026a', optimize: bool = False,
+             time_limit: float = 0.04) -> Dict:
+        """
+        Plan the semesters needed to complete the target courses.
+
+        Args:
+            completed: Courses already completed
+            targets: Courses to complete (their requirements are added)
+            max_courses: Most courses per semester (None for no limit)
+            max_credits: Most credits per semester (None for no limit)
+            start_term: First planned semester, e.g. '2026a'
+            optimize: Whether to search for a shorter plan with branch-and-bound
+            time_limit: Seconds the search over the 'או' alternatives (and branch-and-bound)
+                may take; past it, alternatives are only tried until one can be scheduled
+
+        Returns:
+            Dictionary with semesters (term, courses, credits and the external courses among
+            them per semester, including empty semesters spent waiting for an offering),
+            num_semesters, lower_bound, optimal (whether the plan is proven shortest over
+            every choice of 'או' alternatives), external (the planned courses missing from
+            the catalogs, e.g. of other faculties; they are assumed to be offered every
+            semester) and elapsed_ms
+
+        Raises:
+            ValueError: If a target is unknown, its requirements can't be met or a course
+                doesn't fit the caps
+        """
+        start_time = time.perf_counter()
+        deadline = start_time + time_limit
+        if max_courses is not None and max_courses < 1:
+            raise ValueError("max_courses must be at least 1")
+        completed_nodes, target_nodes = self._resolve(completed, targets)
+        earliest = self._reachable(completed_nodes, target_nodes)
+        first_letter_index = TERMS.index(start_term[-1])
+        # Bound shared by every selection: their common courses under their common constraints
+        forced = self._forced(completed_nodes, target_nodes, earliest)
+        lower_bound = _Scheduler(self, forced, completed_nodes, max_courses, max_credits, first_letter_index,
+                                 earliest).lower_bound(0, set(forced))
+
+        best: Optional[Tuple[int, Dict[int, int], _Scheduler, List[int]]] = None
+        error: Optional[ValueError] = None
+        tried_bound: Optional[int] = None  # Lowest bound of the selections tried
+        unproven: List[int] = []  # Lower bounds of the selections whose shortest plan isn't known
+        exhausted = True
+        for required in self._selections(completed_nodes, target_nodes, earliest):
+            if best is not None and best[0] <= lower_bound:
+                exhausted = False
+                break
+            # Past the time limit, further selections are only tried until one can be scheduled
+            if best is not None and time.perf_counter() > deadline:
+                exhausted = False
+                break
+            if max_credits is not None:
+                too_large = [self.graph.codes[node] for node in required if self._credits(node) > max_credits]
+                if too_large:
+                    error = error or ValueError(f"{', '.join(too_large)} exceed the {max_credits} credit cap")
+                    continue
+
+            scheduler = _Scheduler(self, required, completed_nodes, max_courses, max_credits, first_letter_index)
+            bound = scheduler.lower_bound(0, set(required))
+            tried_bound = bound if tried_bound is None else min(tried_bound, bound)
+            if best is not None and bound >= best[0]:
+                continue
+            try:
+                schedule = scheduler.list_schedule()
+            except ValueError as schedule_error:
+                error = error or schedule_error
+                unproven.append(bound)
+                continue
+            length = max(schedule.values()) + 1 if schedule else 0
+            proven = length <= bound
+            if optimize and not proven:
+                schedule, proven = scheduler.branch_and_bound(schedule, deadline)
+                length = max(schedule.values()) + 1 if schedule else 0
+            if not proven:
+                unproven.append(bound)
+            if best is None or length < best[0]:
+                best = (length, schedule, scheduler, required)
+        if best is None:
+            raise error
+        length, schedule, scheduler, required = best
+        if exhausted:
+            lower_bound = max(lower_bound, tried_bound)
+        optimal = length <= lower_bound or (exhausted and all(bound >= length for bound in unproven))
+
+        semesters = []
+        term = start_term
+        for semester in range(length):
+            courses = sorted((node for node, planned in schedule.items() if planned == semester),
+                             key=scheduler.priority(semester))
+            semesters.append({
+                'term': term,
+                'courses': [self.graph.codes[node] for node in courses],
+                'credits': sum((self._credits(node) for node in courses), 0.0),
+                'external': [self.graph.codes[node] for node in courses if node >= self.graph.num_courses]
+            })
+            term = next_term(term)
+
+        return {
+            'semesters': semesters,
+            'num_semesters': length,
+            'lower_bound': lower_bound,
+            'optimal': optimal,
+            'external': sorted(self.graph.codes[node] for node in required if node >= self.graph.num_courses),
+            'elapsed_ms': round((time.perf_counter() - start_time) * 1000, 2)
+        }
+
+
+class _Scheduler:
+    """Scheduling state of one plan() call; semesters are indices from the start term."""
+
+    def __init__(self, planner: DegreePlanner, required: List[int], completed: Set[int],
+                 max_courses: Optional[int], max_credits: Optional[float], first_letter_index: int,
+                 earliest: Optional[List[int]] = None):
+        self.planner = planner
+        self.required = required
+        self.max_courses = max_courses
+        self.max_credits = max_credits
+        self.first_letter_index = first_letter_index
+        self.prereqs, self.coreqs = planner._constraints(completed, required, earliest)
+        self.tails = planner._tails(required, self.prereqs, self.coreqs, first_letter_index)
+        self.credits = {node: planner._credits(node) for node in required}
+        # Courses offered in a single semester of the year, by that semester's letter
+        self.only_in = {node: next(iter(planner.offered[node])) for node in required
+                        if len(planner.offered.get(node, TERMS)) == 1}
+        self.dependents = {node: 0 for node in required}
+        for node in required:
+            for options in self.prereqs[node] + self.coreqs[node]:
+                for option in options:
+                    self.dependents[option] += 1
+
+    def letter(self, semester: int) -> str:
+        return TERMS[(self.first_letter_index + semester) % len(TERMS)]
+
+    def priority(self, semester: int):
+        """
+        Sort key: longest remaining chain, then courses offered once a year, then most
+        dependents, then course number.
+        """
+        parity = semester % len(TERMS)
+        codes = self.planner.graph.codes
+        return lambda node: (-self.tails[node][parity], node not in self.only_in, -self.dependents[node], codes[node])
+
+    def _semesters_for(self, nodes: List[int]) -> int:
+        """Fewest semesters the caps allow for taking some courses."""
+        bound = 1
+        if self.max_courses:
+            bound = max(bound, math.ceil(len(nodes) / self.max_courses))
+        if self.max_credits:
+            bound = max(bound, math.ceil(sum(self.credits[node] for node in nodes) / self.max_credits - 1e-9))
+        return bound
+
+    def lower_bound(self, semester: int, unscheduled: Set[int]) -> int:
+        """Fewest semesters any plan needs, counted from the start term, given the courses left."""
+        if not unscheduled:
+            return semester
+        parity = semester % len(TERMS)
+        bound = max(max(self.tails[node][parity] for node in unscheduled), self._semesters_for(list(unscheduled)))
+        # Courses offered once a year also need enough semesters of their own letter
+        by_letter: Dict[str, List[int]] = {}
+        for node in unscheduled:
+            if node in self.only_in:
+                by_letter.setdefault(self.only_in[node], []).append(node)
+        for letter, nodes in by_letter.items():
+            first = (TERMS.index(letter) - TERMS.index(self.letter(semester))) % len(TERMS)
+            bound = max(bound, first + (self._semesters_for(nodes) - 1) * len(TERMS) + 1)
+        return semester + bound
+
+    def _available(self, node: int, semester: int, schedule: Dict[int, int]) -> bool:
+        """Offered this semester with every prerequisite clause met in an earlier semester."""
+        return self.planner._offered(node, self.letter(semester)) and all(
+            any(schedule.get(option, semester) < semester for option in options)
+            for options in self.prereqs[node])
+
+    def _group(self, node: int, semester: int, schedule: Dict[int, int], rank: Dict[int, int]) -> Optional[List[int]]:
+        """
+        A candidate plus the candidates that have to be taken alongside it for its parallel
+        requirements (transitively, the highest-ranked option of each unmet clause), or None
+        if a clause can't be met this semester.
+        """
+        group = [node]
+        members = {node}
+        for member in group:  # Grows while iterating
+            for options in self.coreqs[member]:
+                if any(option in members or schedule.get(option, semester + 1) <= semester for option in options):
+                    continue
+                options = [option for option in options if option in rank and option not in schedule]
+                if not options:
+                    return None
+                option = min(options, key=rank.get)
+                group.append(option)
+                members.add(option)
+        return group
+
+    def _fits(self, count: int, credits: float, nodes: List[int]) -> bool:
+        return ((self.max_courses is None or count + len(nodes) <= self.max_courses)
+                and (self.max_credits is None
+                     or credits + sum(self.credits[node] for node in nodes) <= self.max_credits + 1e-9))
+
+    def _fill(self, semester: int, candidates: List[int], schedule: Dict[int, int],
+              taken: List[int]) -> List[int]:
+        """
+        Greedily add candidates (in order) together with the candidates their parallel
+        requirements need, until the caps are hit.
+        """
+        rank = {node: i for i, node in enumerate(candidates)}
+        credits = sum(self.credits[node] for node in taken)
+        progress = True
+        while progress:
+            progress = False
+            for node in candidates:
+                if node in schedule or not self._fits(len(taken), credits, [node]):
+                    continue
+                group = self._group(node, semester, schedule, rank) if self.coreqs[node] else [node]
+                if group is None or not self._fits(len(taken), credits, group):
+                    continue
+                for member in group:
+                    schedule[member] = semester
+                taken.extend(group)
+                credits += sum(self.credits[member] for member in group)
+                progress = True
+        return taken
+
+    def list_schedule(self) -> Dict[int, int]:
+        schedule: Dict[int, int] = {}
+        unscheduled = set(self.required)
+        semester = 0
+        idle = 0
+        while unscheduled:
+            candidates = sorted((node for node in unscheduled if self._available(node, semester, schedule)),
+                                key=self.priority(semester))
+            taken = self._fill(semester, candidates, schedule, [])
+            unscheduled.difference_update(taken)
+            # Every course is offered at least once a year, so a whole year without progress is final
+            idle = 0 if taken else idle + 1
+            if idle > len(TERMS):
+                stuck = ', '.join(sorted(self.planner.graph.codes[node] for node in unscheduled))
+                raise ValueError(f"Can't schedule {stuck}: parallel requirements that only meet each other")
+            semester += 1
+        return schedule
+
+    def _choices(self, semester: int, candidates: List[int], schedule: Dict[int, int]) -> Iterator[List[int]]:
+        """
+        Maximal sets of candidates that can be taken together: every subset of up to
+        max_courses candidates, in priority order (the list scheduler's choice first),
+        completed greedily and deduplicated. Taking more courses never delays a plan, so
+        only maximal sets need to be tried. Generated lazily; there can be very many.
+        """
+        if not candidates:
+            yield []
+            return
+        size = min(len(candidates), self.max_courses or len(candidates))
+        seen = set()
+        for subset in itertools.combinations(candidates, size):
+            credits = 0.0
+            taken = []
+            for node in subset:
+                if self._fits(len(taken), credits, [node]):
+                    taken.append(node)
+                    credits += self.credits[node]
+            # Drop courses whose parallel requirements aren't in the set, until none are left to drop
+            kept = taken
+            while True:
+                still_met = [node for node in kept if self._coreqs_met_with(node, semester, schedule, kept)]
+                if len(still_met) == len(kept):
+                    break
+                kept = still_met
+            trial = dict(schedule)
+            for node in kept:
+                trial[node] = semester
+            kept = self._fill(semester, candidates, trial, kept)
+            key = frozenset(kept)
+            if key not in seen:
+                seen.add(key)
+                yield kept
+
+    def _coreqs_met_with(self, node: int, semester: int, schedule: Dict[int, int], taken: List[int]) -> bool:
+        return all(any(option in taken or schedule.get(option, semester + 1) <= semester for option in options)
+                   for options in self.coreqs[node])
+
+    def branch_and_bound(self, schedule: Dict[int, int], deadline: float) -> Tuple[Dict[int, int], bool]:
+        """
+        Depth-first search over the semesters, trying every maximal course set per semester
+        and pruning with lower_bound and a (parity, remaining courses) memo.
+
+        Returns:
+            The best schedule found and whether the search finished (proving it shortest)
+        """
+        best = {'schedule': schedule, 'length': max(schedule.values()) + 1}
+        memo: Dict[Tuple[int, frozenset], int] = {}
+        finished = True
+
+        def search(semester: int, current: Dict[int, int], unscheduled: Set[int]):
+            nonlocal finished
+            if not unscheduled:
+                length = max(current.values()) + 1 if current else 0
+                if length < best['length']:
+                    best['schedule'], best['length'] = dict(current), length
+                return
+            if self.lower_bound(semester, unscheduled) >= best['length']:
+                return
+            key = (semester % len(TERMS), frozenset(unscheduled))
+            if memo.get(key, semester + 1) <= semester:
+                return
+            memo[key] = semester
+
+            candidates = sorted((node for node in unscheduled if self._available(node, semester, current)),
+                                key=self.priority(semester))
+            for taken in self._choices(semester, candidates, current):
+                if time.perf_counter() > deadline:
+                    finished = False
+                    return
+                for node in taken:
+                    current[node] = semester
+                search(semester + 1, current, unscheduled.difference(taken))
+                for node in taken:
+                    del current[node]
+
+        search(0, {}, set(self.required))
+        return best['schedule'], finished
+
+
+def benchmark(planner: DegreePlanner, completed: List[str], targets: List[str], repeat: int = 5, **caps) -> Dict:
+    """Time plan() with and without optimization, in milliseconds (best of repeat)."""
+    results = {}
+    for optimize in (False, True):
+        timings = []
+        for _ in range(repeat):
+            plan = planner.plan(completed, targets, optimize=optimize, **caps)
+            timings.append(plan['elapsed_ms'])
+        results['optimized' if optimize else 'list'] = {
+            'ms': min(timings), 'num_semesters': plan['num_semesters'],
+            'lower_bound': plan['lower_bound'], 'optimal': plan['optimal']
+        }
+    return results
+
+
+if __name__ == "__main__":
+    json_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'JSONs')
+    catalogs = []
+    for name in ('math', 'physics'):
+        with open(os.path.join(json_dir, f"{name}.json"), 'r', encoding='utf-8') as f:
+            catalogs.append(json.load(f))
+    planner = DegreePlanner(catalogs)
+    # Every regular lecture course of both departments as the target
+    targets = [code for catalog in catalogs for code, course in catalog.items() if course.get('type') == 'שיעור']
+    for max_courses in (4, 6, 8):
+        result = benchmark(planner, [], targets, max_courses=max_courses)
+        print(f"{len(targets)} targets, {max_courses} courses per semester: {result}")
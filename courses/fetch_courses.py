@@ -1,19 +1,22 @@
 import json
 import requests
 import time
-from typing import Optional, List, Dict, Union, Set
+from typing import Optional, List, Dict, Union, Set, Iterable
 from datetime import datetime
 from bs4 import BeautifulSoup
 import re
 import os
 import sqlite3
 from statistics import mean
+from http_cache import get_json
+from grade_summary import get_summary_store
 
 class CourseDownloader:
     """Class to handle downloading and filtering TAU course data from Arazim Project database"""
     
     BASE_URL = "https://arazim-project.com/data"
     ALL_COURSES_URL = f"{BASE_URL}/courses.json"
+    GRADES_URL = f"{BASE_URL}/grades.json"
     
     def __init__(self):
         # Cache the all courses data to avoid multiple downloads
@@ -77,9 +80,7 @@ class CourseDownloader:
                 for semester in sorted_semesters:
                     url = f"{self.BASE_URL}/courses-{year}{semester}.json"
                     try:
-                        response = requests.get(url)
-                        response.raise_for_status()
-                        data = response.json()
+                        data = get_json(url)
                         
                         # Filter by faculty and department
                         filtered_data = {}
@@ -96,9 +97,9 @@ class CourseDownloader:
                             if departments and not any(dep.lower() == dept.lower() for dep in departments):
                                 continue
                                 
-                            filtered_data[k] = v
-                            # Add last_offered information
-                            filtered_data[k]['last_offered'] = f"{year}{semester}"
+                            # Copy the course since the downloaded dataset is shared through the cache,
+                            # then add last_offered information
+                            filtered_data[k] = dict(v, last_offered=f"{year}{semester}")
                             
                             # If merging, update merged_courses with this course if it's newer
                             if merge:
@@ -126,9 +127,7 @@ class CourseDownloader:
                 for semester in ['b', 'a']:  # Process 'b' before 'a' to keep latest
                     url = f"{self.BASE_URL}/courses-{year}{semester}.json"
                     try:
-                        response = requests.get(url)
-                        response.raise_for_status()
-                        semester_data = response.json()
+                        semester_data = get_json(url)
                         
                         # Filter by faculty and department
                         for k, v in semester_data.items():
@@ -144,8 +143,9 @@ class CourseDownloader:
                             if departments and not any(dep.lower() == dept.lower() for dep in departments):
                                 continue
                                 
-                            # Add last_offered information
-                            v['last_offered'] = f"{year}{semester}"
+                            # Copy the course since the downloaded dataset is shared through the cache,
+                            # then add last_offered information
+                            v = dict(v, last_offered=f"{year}{semester}")
                             
                             # Update merged_data with this course if it's newer
                             if k not in merged_data or \
@@ -191,21 +191,24 @@ class CourseDownloader:
         # After filtering courses and before returning/saving:
         if fetch_grades:
             print("\nFetching grades for courses...")
-            grades_data = self.fetch_grades_for_courses(results)
+            # results is keyed by term, so enrich every term's courses in a single batch
+            all_term_courses = {}
+            for term_courses in results.values():
+                all_term_courses.update(term_courses)
+            grades_data = self.fetch_grades_for_courses(all_term_courses)
             
             # Add average grades to course data
-            for course_code, course_data in results.items():
-                if course_code in grades_data:
-                    course_data['avg_grade'] = grades_data[course_code].get('avg_grade')
+            for term_courses in results.values():
+                for course_code, course_data in term_courses.items():
+                    if course_code in grades_data:
+                        course_data['avg_grade'] = grades_data[course_code].get('avg_grade')
         
         return results
     
     def _get_all_courses(self, faculty: Optional[str] = None, departments: Optional[List[str]] = None, save_to_file: bool = True) -> Dict:
         """Get the complete courses dataset"""
         if not self.all_courses:
-            response = requests.get(self.ALL_COURSES_URL)
-            response.raise_for_status()
-            self.all_courses = response.json()
+            self.all_courses = get_json(self.ALL_COURSES_URL)
         
         filtered_data = {k: v for k, v in self.all_courses.items() 
                         if (not faculty or faculty.lower() in v.get('faculty', '').lower()) and
@@ -264,56 +267,53 @@ class CourseDownloader:
         Returns:
             Dictionary containing the average grade and distribution if available
         """
-        GRADES_URL = "https://arazim-project.com/data/grades.json"
-        
         try:
-            response = requests.get(GRADES_URL)
-            response.raise_for_status()
-            all_grades = response.json()
-            
-            # Get grades for specific course
-            course_grades = all_grades.get(course_code, {})
-            
-            if not course_grades:
-                return {}
-            
-            # Calculate average grade across all years/semesters/groups
-            all_means = []
-            total_distribution = [0] * 101  # Initialize distribution array (0-100)
-            
-            for semester, groups in course_grades.items():
-                for group_num, grade_infos in groups.items():
-                    for grade_info in grade_infos:
-                        if isinstance(grade_info, dict):
-                            mean_grade = grade_info.get('mean')
-                            distribution = grade_info.get('distribution', [])
-                            
-                            # Add to total distribution if available
-                            if distribution:
-                                for i, count in enumerate(distribution):
-                                    total_distribution[i] += count
-                                    
-                            # Only include non-zero grades for average
-                            if mean_grade is not None and mean_grade != 0.0:
-                                all_means.append(mean_grade)
-            
-            result = {}
-            
-            # Calculate overall average if we have valid grades
-            if all_means:
-                result['avg_grade'] = round(sum(all_means) / len(all_means), 2)
-                result['grades_counted'] = len(all_means)
-                
-            # Include distribution if we have any data
-            if any(x > 0 for x in total_distribution):
-                result['distribution'] = total_distribution
-                
-            return result
-            
+            return self.fetch_grades_batch([course_code], verbose=False)['grades'].get(course_code, {})
         except Exception as e:
             print(f"Error fetching grades for course {course_code}: {e}")
             return {}
 
+    def fetch_grades_batch(self, course_codes: Iterable[str], verbose: bool = True) -> Dict:
+        """
+        Get average grade and distribution for any number of courses from the grade
+        summary table, which is refreshed first for the courses whose grades changed.
+        
+        Args:
+            course_codes: Course numbers to get grades for
+            verbose: Whether to print the throughput summary
+            
+        Returns:
+            Dictionary with the per-course 'grades' and throughput statistics
+        """
+        start_time = time.perf_counter()
+        summary_store = get_summary_store()
+        load_seconds = time.perf_counter() - start_time
+        
+        course_codes = list(course_codes)
+        courses_processed = len(course_codes)
+        grades_data = {
+            course_code: summary
+            for course_code, summary in summary_store.get_many(course_codes).items()
+            if summary['avg_grade'] is not None or summary['distribution']
+        }
+        
+        elapsed = time.perf_counter() - start_time
+        stats = {
+            'grades': grades_data,
+            'courses_processed': courses_processed,
+            'courses_with_grades': len(grades_data),
+            'load_seconds': round(load_seconds, 4),
+            'elapsed_seconds': round(elapsed, 4),
+            'courses_per_sec': round(courses_processed / elapsed, 1) if elapsed > 0 else float('inf')
+        }
+        
+        if verbose:
+            print(f"Computed grades for {stats['courses_with_grades']}/{courses_processed} courses "
+                  f"in {stats['elapsed_seconds']:.3f}s ({stats['courses_per_sec']} courses/sec, "
+                  f"dataset load {stats['load_seconds']:.3f}s)")
+        
+        return stats
+
     def fetch_grades_for_courses(self, courses: Dict, save_to_file: bool = True) -> Dict:
         """
         Fetch grades for a set of courses and optionally save to file
@@ -325,13 +325,8 @@ class CourseDownloader:
         Returns:
             Dictionary mapping course codes to their grade data
         """
-        grades_data = {}
-        
-        for course_code in courses.keys():
-            print(f"Fetching grades for course {course_code}")
-            grades = self.fetch_course_grades(course_code)
-            if grades:
-                grades_data[course_code] = grades
+        print(f"Fetching grades for {len(courses)} courses")
+        grades_data = self.fetch_grades_batch(courses.keys())['grades']
                 
         if save_to_file and grades_data:
             # Create grades directory if it doesn't exist
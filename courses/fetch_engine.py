@@ -0,0 +1,124 @@
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class TokenBucket:
+    """Thread-safe token bucket: allows `rate` requests per second with bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimitedSession:
+    """
+    HTTP client for scraping the TAU course pages politely from many threads.
+
+    Every request waits for a token from its host's bucket, so the overall
+    request rate per host (e.g. ims.tau.ac.il) is bounded regardless of how many
+    workers are running. Each thread keeps its own keep-alive session, and
+    429/5xx responses are retried with exponential backoff.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self,
+                 requests_per_second: float = 1.0,
+                 burst: int = 2,
+                 pool_size: int = 8,
+                 max_retries: int = 4,
+                 backoff_factor: float = 2.0,
+                 timeout: int = 30):
+        """
+        Args:
+            requests_per_second: Politeness budget per host
+            burst: Number of requests a host may receive back to back
+            pool_size: Keep-alive connections per session
+            max_retries: Retries on 429/5xx and connection errors
+            backoff_factor: Base delay in seconds, doubled on every retry
+            timeout: Request timeout in seconds
+        """
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _bucket_for(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc.lower()
+        with self._buckets_lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.requests_per_second, self.burst)
+            return self._buckets[host]
+
+    def _session(self) -> requests.Session:
+        """Get this thread's pooled keep-alive session."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+        return session
+
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """Delay before the next attempt, honoring Retry-After when the server sends it."""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return float(retry_after)
+        return self.backoff_factor * (2 ** attempt) + random.uniform(0, 1)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Rate-limited GET with retries.
+
+        Raises:
+            requests.RequestException: If the request still fails after all retries
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        bucket = self._bucket_for(url)
+
+        for attempt in range(self.max_retries + 1):
+            bucket.acquire()
+            try:
+                response = self._session().get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._retry_delay(attempt, None))
+                continue
+
+            if response.status_code in self.RETRY_STATUSES and attempt < self.max_retries:
+                time.sleep(self._retry_delay(attempt, response))
+                continue
+
+            response.raise_for_status()
+            return response
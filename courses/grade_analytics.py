@@ -0,0 +1,362 @@
+import time
+from itertools import chain, repeat
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from grade_summary import GRADE_RANGES
+
+# Lower and upper grade bounds of the GRADE_RANGES buckets
+BUCKET_LOWER = np.array([0, 50, 60, 65, 70, 75, 80, 85, 90, 95], dtype=np.float64)
+BUCKET_UPPER = np.array([50, 60, 65, 70, 75, 80, 85, 90, 95, 100], dtype=np.float64)
+
+SEMESTERS = 'abc'
+
+
+class GradeAnalytics:
+    """
+    Columnar view of grades.json with vectorized per-course reductions.
+
+    Every grade row (course, semester, group, moed) becomes one entry of a set of NumPy
+    columns. Rows are stored grouped by course, so per-course reductions are single
+    np.add.reduceat / np.bincount calls over the whole dataset instead of Python loops.
+    Course codes are stored without dashes.
+    """
+
+    def __init__(self, course_codes: List[str], course: np.ndarray, year: np.ndarray,
+                 semester: np.ndarray, group: np.ndarray, moed: np.ndarray, mean: np.ndarray,
+                 median: np.ndarray, std: np.ndarray, buckets: np.ndarray):
+        """
+        Args:
+            course_codes: Course code of every course index
+            course: Course index of every row (non-decreasing)
+            year: Year of every row
+            semester: Semester of every row as an index into SEMESTERS (-1 if unknown)
+            group: Group number of every row (-1 if not numeric)
+            moed: Exam moed of every row
+            mean, median, std: Grade statistics of every row (NaN if missing)
+            buckets: Student counts per GRADE_RANGES bucket, shape (rows, 10)
+        """
+        self.course_codes = course_codes
+        self.course_index = {code: i for i, code in enumerate(course_codes)}
+        self.course = course
+        self.year = year
+        self.semester = semester
+        self.group = group
+        self.moed = moed
+        self.mean = mean
+        self.median = median
+        self.std = std
+        self.buckets = buckets
+        self.students = buckets.sum(axis=1)
+        # Row offset where each course starts; courses without rows are never indexed
+        self.course_offsets = np.searchsorted(course, np.arange(len(course_codes)))
+
+    @classmethod
+    def from_grades(cls, grades_data: Dict, course_codes: Optional[Iterable[str]] = None) -> 'GradeAnalytics':
+        """
+        Flatten the grades dataset into columns.
+
+        Args:
+            grades_data: Parsed grades.json (course -> semester -> group -> list of grade infos)
+            course_codes: Only load these courses (with or without dashes); all if None
+
+        Returns:
+            GradeAnalytics over the loaded rows
+        """
+        if course_codes is not None:
+            wanted = {code.replace('-', '') for code in course_codes}
+        codes = []
+        seen = set()
+        # Keys shared by the rows of a semester / a group, and their counts one level down
+        course_semesters, semester_year, semester_semester, semester_groups = [], [], [], []
+        group_keys, group_rows, infos = [], [], []
+
+        for course_code, course_grades in grades_data.items():
+            key = course_code.replace('-', '')
+            if key in seen or not isinstance(course_grades, dict) or (course_codes is not None and key not in wanted):
+                continue
+            seen.add(key)
+            codes.append(key)
+            course_semesters.append(len(course_grades))
+
+            for semester_key, groups in course_grades.items():
+                semester_year.append(int(semester_key[:-1]) if semester_key[:-1].isdigit() else -1)
+                semester_semester.append(SEMESTERS.find(semester_key[-1:]))
+                semester_groups.append(len(groups))
+                group_keys.extend(groups)
+                group_rows.extend(map(len, groups.values()))
+                infos.extend(chain.from_iterable(groups.values()))
+
+        # Repeat the keys down to the rows, then drop rows that aren't grade infos
+        rows = np.array(group_rows, dtype=np.int64)
+        groups_per_semester = np.array(semester_groups, dtype=np.int64)
+        semester_course = np.repeat(np.arange(len(codes), dtype=np.int32),
+                                    np.array(course_semesters, dtype=np.int64))
+        course = np.repeat(np.repeat(semester_course, groups_per_semester), rows)
+        year = np.repeat(np.repeat(np.array(semester_year, dtype=np.int16), groups_per_semester), rows)
+        semester = np.repeat(np.repeat(np.array(semester_semester, dtype=np.int8), groups_per_semester), rows)
+        group = np.repeat(np.array([int(group_num) if group_num.isdigit() else -1 for group_num in group_keys],
+                                   dtype=np.int16), rows)
+        if set(map(type, infos)) - {dict}:
+            valid = np.array([type(info) is dict for info in infos], dtype=bool)
+            course, year, semester, group = course[valid], year[valid], semester[valid], group[valid]
+            infos = [info for info in infos if type(info) is dict]
+
+        def column(name: str) -> list:
+            return list(map(dict.get, infos, repeat(name)))
+
+        # Distributions are 10-count lists; other shapes (GRADE_RANGES dicts, missing) are converted first
+        dists = column('distribution')
+        if set(map(type, dists)) <= {list}:
+            lengths = np.fromiter(map(len, dists), dtype=np.int64, count=len(dists))
+            malformed = np.flatnonzero(lengths != len(GRADE_RANGES)).tolist()
+        else:
+            malformed = [i for i, dist in enumerate(dists) if type(dist) is not list or len(dist) != len(GRADE_RANGES)]
+        empty = [0] * len(GRADE_RANGES)
+        for i in malformed:
+            dist = dists[i]
+            if isinstance(dist, dict):
+                dist = [dist.get(grade_range, 0) for grade_range in GRADE_RANGES]
+            if not isinstance(dist, list) or len(dist) != len(GRADE_RANGES):
+                dist = empty
+            dists[i] = dist
+        buckets = np.fromiter(chain.from_iterable(dists), dtype=np.int64,
+                              count=len(dists) * len(GRADE_RANGES)).reshape(-1, len(GRADE_RANGES))
+
+        return cls(
+            codes,
+            course,
+            year,
+            semester,
+            group,
+            np.nan_to_num(np.array(column('moed'), dtype=np.float64)).astype(np.int8),
+            # None becomes NaN
+            np.array(column('mean'), dtype=np.float64),
+            np.array(column('median'), dtype=np.float64),
+            np.array(column('standard_deviation'), dtype=np.float64),
+            buckets
+        )
+
+    def __len__(self) -> int:
+        return len(self.course)
+
+    def _per_course_sum(self, values: np.ndarray) -> np.ndarray:
+        """Sum a row column per course."""
+        return np.bincount(self.course, weights=values, minlength=len(self.course_codes))
+
+    def histograms(self) -> np.ndarray:
+        """All-time student counts per GRADE_RANGES bucket, shape (courses, 10)."""
+        result = np.zeros((len(self.course_codes), len(GRADE_RANGES)), dtype=np.int64)
+        if len(self.course):
+            # Rows are grouped by course, so every course is one contiguous run
+            present = np.unique(self.course)
+            result[present] = np.add.reduceat(self.buckets, self.course_offsets[present], axis=0)
+        return result
+
+    def course_view(self, course_code: str) -> Optional['GradeAnalytics']:
+        """
+        Get the rows of one course as their own GradeAnalytics (sharing the column memory).
+
+        Args:
+            course_code: Course number, with or without dashes
+
+        Returns:
+            Single-course GradeAnalytics, or None if the course isn't loaded
+        """
+        index = self.course_index.get(course_code.replace('-', ''))
+        if index is None:
+            return None
+        start = self.course_offsets[index]
+        end = self.course_offsets[index + 1] if index + 1 < len(self.course_codes) else len(self.course)
+        rows = slice(start, end)
+        return GradeAnalytics(
+            [self.course_codes[index]], np.zeros(end - start, dtype=np.int32), self.year[rows],
+            self.semester[rows], self.group[rows], self.moed[rows], self.mean[rows],
+            self.median[rows], self.std[rows], self.buckets[rows]
+        )
+
+    def histogram(self, course_code: str) -> Optional[np.ndarray]:
+        """All-time histogram of one course, or None if it isn't loaded."""
+        view = self.course_view(course_code)
+        return None if view is None else view.buckets.sum(axis=0)
+
+    def _valid_means(self) -> np.ndarray:
+        # Means of 0.0 mark exams without published grades
+        return ~np.isnan(self.mean) & (self.mean != 0.0)
+
+    def mean_grades(self) -> np.ndarray:
+        """Mean of the row means per course, ignoring means of 0.0 (NaN if none)."""
+        valid = self._valid_means()
+        totals = self._per_course_sum(np.where(valid, self.mean, 0.0))
+        counts = self._per_course_sum(valid.astype(np.float64))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return totals / counts
+
+    def weighted_means(self) -> np.ndarray:
+        """Mean grade per course weighted by the students of each row (NaN if no row has both)."""
+        weights = np.where(self._valid_means(), self.students, 0).astype(np.float64)
+        totals = self._per_course_sum(np.where(weights > 0, self.mean, 0.0) * weights)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return totals / self._per_course_sum(weights)
+
+    def percentiles(self, q, histograms: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Estimate grade percentiles per course from the histograms, interpolating linearly
+        inside a bucket.
+
+        Args:
+            q: Percentile or sequence of percentiles in [0, 100]
+            histograms: Histograms to use instead of the all-time ones
+
+        Returns:
+            Array of shape (courses,) or (courses, len(q)); NaN for courses without students
+        """
+        hist = self.histograms() if histograms is None else histograms
+        scalar = np.ndim(q) == 0
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        cumulative = np.cumsum(hist, axis=1)
+        totals = cumulative[:, -1:]
+        targets = totals * (q / 100.0)  # (courses, len(q))
+
+        # First non-empty bucket whose cumulative count reaches the target
+        reached = (cumulative[:, None, :] >= targets[:, :, None]) & (hist[:, None, :] > 0)
+        bucket = reached.argmax(axis=2)
+        rows = np.arange(len(hist))[:, None]
+        counts = hist[rows, bucket]
+        before = np.where(bucket > 0, cumulative[rows, np.maximum(bucket - 1, 0)], 0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fraction = np.where(counts > 0, (targets - before) / counts, 0.0)
+        result = BUCKET_LOWER[bucket] + fraction * (BUCKET_UPPER[bucket] - BUCKET_LOWER[bucket])
+        result[totals[:, 0] == 0] = np.nan
+        return result[:, 0] if scalar else result
+
+    def pass_rates(self, passing_grade: int = 60) -> np.ndarray:
+        """
+        Share of students at or above a passing grade per course (NaN if no students).
+
+        Args:
+            passing_grade: Lower bound of one of the GRADE_RANGES buckets
+        """
+        if passing_grade not in BUCKET_LOWER:
+            raise ValueError(f"passing_grade must be a bucket lower bound: {BUCKET_LOWER.astype(int).tolist()}")
+        hist = self.histograms()
+        first_passing = int(np.searchsorted(BUCKET_LOWER, passing_grade))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return hist[:, first_passing:].sum(axis=1) / hist.sum(axis=1)
+
+    def yearly_means(self) -> Dict[str, np.ndarray]:
+        """
+        Student-weighted mean grade per course and year.
+
+        Returns:
+            Dictionary of equal-length arrays 'course', 'year', 'weighted_mean' and
+            'students', sorted by course then year; weighted_mean is NaN for years
+            without usable rows
+        """
+        keep = self.year >= 0
+        keys = self.course[keep].astype(np.int64) * 10000 + self.year[keep]
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        weights = np.where(self._valid_means()[keep], self.students[keep], 0).astype(np.float64)
+        weighted = np.bincount(inverse, weights=np.where(weights > 0, self.mean[keep], 0.0) * weights,
+                               minlength=len(unique_keys))
+        totals = np.bincount(inverse, weights=weights, minlength=len(unique_keys))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weighted_mean = weighted / totals
+        return {
+            'course': (unique_keys // 10000).astype(np.int32),
+            'year': (unique_keys % 10000).astype(np.int16),
+            'weighted_mean': weighted_mean,
+            'students': np.bincount(inverse, weights=self.students[keep],
+                                    minlength=len(unique_keys)).astype(np.int64)
+        }
+
+    def year_over_year_deltas(self) -> Dict[str, np.ndarray]:
+        """
+        Change of the weighted mean grade from a course's previous year with grades.
+
+        Returns:
+            yearly_means() plus a 'delta' array, NaN for a course's first year
+        """
+        yearly = self.yearly_means()
+        delta = np.full(len(yearly['course']), np.nan)
+        same_course = yearly['course'][1:] == yearly['course'][:-1]
+        delta[1:][same_course] = np.diff(yearly['weighted_mean'])[same_course]
+        yearly['delta'] = delta
+        return yearly
+
+    def course_report(self, course_code: str, passing_grade: int = 60) -> Optional[Dict]:
+        """
+        Collect the analytics of one course.
+
+        Args:
+            course_code: Course number, with or without dashes
+            passing_grade: Passing grade for the pass rate
+
+        Returns:
+            Dictionary with histogram, total_students, mean_grade, weighted_mean, median
+            and quartiles (estimated from the histogram), pass_rate and yearly
+            (year -> weighted_mean, delta, students), or None if the course isn't loaded
+        """
+        view = self.course_view(course_code)
+        if view is None:
+            return None
+        hist = view.histograms()
+        q1, median, q3 = view.percentiles([25, 50, 75], histograms=hist)[0]
+        hist = hist[0]
+        total = int(hist.sum())
+        passing = int(hist[int(np.searchsorted(BUCKET_LOWER, passing_grade)):].sum())
+
+        yearly = view.year_over_year_deltas()
+        return {
+            'histogram': hist.tolist(),
+            'total_students': total,
+            'mean_grade': _to_float(view.mean_grades()[0]),
+            'weighted_mean': _to_float(view.weighted_means()[0]),
+            'median': _to_float(median),
+            'quartiles': (_to_float(q1), _to_float(q3)),
+            'pass_rate': passing / total if total else None,
+            'yearly': {
+                int(year): {'weighted_mean': _to_float(mean), 'delta': _to_float(delta), 'students': int(students)}
+                for year, mean, delta, students in zip(yearly['year'], yearly['weighted_mean'],
+                                                       yearly['delta'], yearly['students'])
+            }
+        }
+
+
+def _to_float(value) -> Optional[float]:
+    """NumPy scalar to float, NaN to None."""
+    return None if np.isnan(value) else round(float(value), 2)
+
+
+def benchmark(grades_data: Dict) -> Dict[str, float]:
+    """
+    Time loading the dataset and computing every all-course reduction.
+
+    Returns:
+        Dictionary with the row count and seconds per step
+    """
+    timings = {}
+    start_time = time.perf_counter()
+    analytics = GradeAnalytics.from_grades(grades_data)
+    timings['load_seconds'] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    analytics.histograms()
+    analytics.mean_grades()
+    analytics.weighted_means()
+    analytics.percentiles([10, 25, 50, 75, 90])
+    analytics.pass_rates()
+    analytics.year_over_year_deltas()
+    timings['analytics_seconds'] = time.perf_counter() - start_time
+    timings['rows'] = len(analytics)
+    timings['courses'] = len(analytics.course_codes)
+    return timings
+
+
+if __name__ == "__main__":
+    from http_cache import get_json
+    grades = get_json("https://arazim-project.com/data/grades.json")
+    timings = benchmark(grades)
+    print(f"{timings['rows']} grade rows of {timings['courses']} courses: "
+          f"loaded in {timings['load_seconds']:.3f}s, all-course analytics in {timings['analytics_seconds']:.3f}s")
@@ -7,10 +7,14 @@ import numpy as np
 from collections import defaultdict
 import os
 from datetime import datetime
+from http_cache import get_json
+from grade_summary import GRADE_RANGES, get_summary_store
+from grade_analytics import GradeAnalytics
 
 class gradeCourse:
     def __init__(self):
-        pass
+        # (grades data, GradeAnalytics built from it) of the last analyzed dataset
+        self._analytics = None
 
 
     def print_course_average(self, json_file_path: str, course_number: str) -> None:
@@ -63,9 +67,7 @@ class gradeCourse:
             print("=" * 50)
             
             GRADES_URL = "https://arazim-project.com/data/grades.json"
-            response = requests.get(GRADES_URL)
-            response.raise_for_status()
-            all_grades = response.json()
+            all_grades = get_json(GRADES_URL)
             
             course_grades = all_grades.get(course_number, {})
             if not course_grades:
@@ -122,49 +124,13 @@ class gradeCourse:
             course_number: The course number to look up
         """
         try:
-            # Fetch grade data
-            GRADES_URL = "https://arazim-project.com/data/grades.json"
-            response = requests.get(GRADES_URL)
-            response.raise_for_status()
-            all_grades = response.json()
-            
-            course_grades = all_grades.get(course_number, {})
-            if not course_grades:
+            # All-time distribution, summed over every semester and group
+            summary = get_summary_store().get(course_number)
+            if not summary:
                 print("No grade history available")
                 return
             
-            # Aggregate all distributions
-            total_distribution = defaultdict(int)
-            semester_count = 0
-            
-            # Define standard grade ranges
-            grade_ranges = ['0-49', '50-59', '60-64', '65-69', '70-74', 
-                          '75-79', '80-84', '85-89', '90-94', '95-100']
-            
-            for semester, groups in course_grades.items():
-                for group_num, grade_infos in groups.items():
-                    for grade_info in grade_infos:
-                        if isinstance(grade_info, dict):
-                            dist = grade_info.get('distribution')
-                            if dist is not None:
-                                # Handle list format (direct counts for each range)
-                                if isinstance(dist, list):
-                                    # If length matches our grade ranges, assume it's in order
-                                    if len(dist) == len(grade_ranges):
-                                        for i, count in enumerate(dist):
-                                            total_distribution[grade_ranges[i]] += count
-                                    else:
-                                        print(f"Warning: Unexpected distribution list length: {len(dist)}")
-                                        continue
-                                
-                                # Handle dictionary format
-                                elif isinstance(dist, dict):
-                                    for grade_range, count in dist.items():
-                                        total_distribution[grade_range] += count
-                                
-                                semester_count += 1
-
-            if not total_distribution:
+            if not summary['distribution']:
                 print("No distribution data could be constructed")
                 return
 
@@ -174,7 +140,8 @@ class gradeCourse:
             course_name = courses.get(course_number, {}).get('name', course_number)
 
             # Prepare data for plotting
-            counts = [total_distribution[range_] for range_ in grade_ranges]
+            grade_ranges = GRADE_RANGES
+            counts = summary['distribution']
             
             # Create the plot
             plt.figure(figsize=(12, 6))
@@ -223,9 +190,7 @@ class gradeCourse:
         try:
             # Download grades data
             print("Downloading grades data...")
-            response = requests.get(GRADES_URL)
-            response.raise_for_status()
-            grades_data = response.json()
+            grades_data = get_json(GRADES_URL)
             
             # Create grades directory if it doesn't exist
             current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -255,29 +220,19 @@ class gradeCourse:
         Sums up distributions across all semesters and groups.
         
         Args:
-            grades_data: The complete grades JSON data
+            grades_data: The complete grades JSON data, or a GradeAnalytics built from it
             course_number: The course number to analyze
         """
-        if course_number not in grades_data:
+        analytics = grades_data if isinstance(grades_data, GradeAnalytics) \
+            else GradeAnalytics.from_grades(grades_data, [course_number])
+        histogram = analytics.histogram(course_number)
+        if histogram is None:
             print(f"Course {course_number} not found in grades data")
             return
         
         # Grade ranges for x-axis
-        grade_ranges = ['0-49', '50-59', '60-64', '65-69', '70-74', 
-                    '75-79', '80-84', '85-89', '90-94', '95-100']
-        
-        # Initialize total distribution
-        total_distribution = [0] * 10
-        
-        # Sum up distributions across all semesters and groups
-        course_data = grades_data[course_number]
-        for semester in course_data.values():  # Iterate through semesters
-            for group in semester.values():    # Iterate through groups
-                for exam_data in group:        # Iterate through exam instances
-                    if 'distribution' in exam_data:
-                        # Add this distribution to the total
-                        for i in range(10):
-                            total_distribution[i] += exam_data['distribution'][i]
+        grade_ranges = GRADE_RANGES
+        total_distribution = histogram.tolist()
         
         # Create the histogram
         plt.figure(figsize=(12, 6))
@@ -311,18 +266,31 @@ class gradeCourse:
         
         Args:
             course_number: The course number to analyze
-            grades_file: Optional path to grades JSON file. If None, downloads fresh data.
+            grades_file: Optional path to grades JSON file. If None, uses the shared download cache.
         """
         if grades_file and os.path.exists(grades_file):
             with open(grades_file, 'r', encoding='utf-8') as f:
                 grades_data = json.load(f)
         else:
-            # Download fresh data
-            response = requests.get("https://arazim-project.com/data/grades.json")
-            response.raise_for_status()
-            grades_data = response.json()
+            # Download (or revalidate the cached copy of) the grades data
+            grades_data = get_json("https://arazim-project.com/data/grades.json")
+        
+        # Columnar view of the whole dataset, built once per dataset
+        if self._analytics is None or self._analytics[0] is not grades_data:
+            self._analytics = (grades_data, GradeAnalytics.from_grades(grades_data))
+        analytics = self._analytics[1]
+        
+        report = analytics.course_report(course_number)
+        if report and report['total_students']:
+            q1, q3 = report['quartiles']
+            print(f"Course {course_number}: {report['total_students']} students, "
+                  f"weighted mean {report['weighted_mean']}, median ~{report['median']} "
+                  f"(IQR {q1}-{q3}), pass rate {report['pass_rate']:.1%}")
+            for year, year_data in report['yearly'].items():
+                delta = f"{year_data['delta']:+.2f}" if year_data['delta'] is not None else "n/a"
+                print(f"  {year}: {year_data['weighted_mean']} ({delta}, {year_data['students']} students)")
         
-        return self.plot_course_grade_distribution(grades_data, course_number)
+        return self.plot_course_grade_distribution(analytics, course_number)
 
 if __name__ == "__main__":
     debug = gradeCourse()
@@ -0,0 +1,286 @@
+import hashlib
+import json
+import marshal
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from http_cache import get_cache
+
+GRADES_URL = "https://arazim-project.com/data/grades.json"
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'grade_summary.db')
+
+# Buckets of the 10-value distributions in grades.json
+GRADE_RANGES = [
+    "0-49", "50-59", "60-64", "65-69", "70-74",
+    "75-79", "80-84", "85-89", "90-94", "95-100"
+]
+
+
+def grades_fingerprint(course_grades: Dict) -> str:
+    """Hash of a course's raw grade data; changes whenever any of its grade rows change."""
+    # marshal writes floats in binary and is ~7x faster than json.dumps here. Version 2
+    # has no back-references, so the bytes depend only on the values and their order.
+    return hashlib.blake2b(marshal.dumps(course_grades, 2), digest_size=16).hexdigest()
+
+
+def summarize_course_grades(course_grades: Dict) -> Dict:
+    """
+    Aggregate a course's raw grade data.
+
+    Args:
+        course_grades: Semester -> group -> list of grade infos, as found in grades.json
+
+    Returns:
+        Dictionary with avg_grade (all-time mean, ignoring means of 0.0), grades_counted,
+        weighted_avg (mean weighted by the students in each distribution), distribution
+        (10 buckets, see GRADE_RANGES), total_students, yearly_trend (year -> avg_grade,
+        weighted_avg and students) and group_count
+    """
+    means = []
+    weighted_sum = 0.0
+    weighted_students = 0
+    distribution = [0] * len(GRADE_RANGES)
+    years: Dict[str, Dict] = {}
+    groups_seen = set()
+
+    for semester, groups in course_grades.items():
+        year = years.setdefault(semester[:-1], {'means': [], 'weighted_sum': 0.0,
+                                                'weighted_students': 0, 'students': 0})
+        for group_num, grade_infos in groups.items():
+            groups_seen.add((semester, group_num))
+            for grade_info in grade_infos:
+                if not isinstance(grade_info, dict):
+                    continue
+
+                # Distributions come as a list of 10 counts or as a range -> count mapping
+                dist = grade_info.get('distribution')
+                if isinstance(dist, dict):
+                    dist = [dist.get(grade_range, 0) for grade_range in GRADE_RANGES]
+                students = 0
+                if isinstance(dist, list) and len(dist) == len(GRADE_RANGES):
+                    for i, count in enumerate(dist):
+                        distribution[i] += count
+                    students = sum(dist)
+                    year['students'] += students
+
+                # Only include non-zero grades in the averages
+                mean_grade = grade_info.get('mean')
+                if mean_grade is not None and mean_grade != 0.0:
+                    means.append(mean_grade)
+                    year['means'].append(mean_grade)
+                    if students:
+                        weighted_sum += mean_grade * students
+                        weighted_students += students
+                        year['weighted_sum'] += mean_grade * students
+                        year['weighted_students'] += students
+
+    total_students = sum(distribution)
+    return {
+        'avg_grade': round(sum(means) / len(means), 2) if means else None,
+        'grades_counted': len(means),
+        'weighted_avg': round(weighted_sum / weighted_students, 2) if weighted_students else None,
+        'distribution': distribution if total_students else None,
+        'total_students': total_students,
+        'yearly_trend': {
+            year_key: {
+                'avg_grade': round(sum(year['means']) / len(year['means']), 2) if year['means'] else None,
+                'weighted_avg': (round(year['weighted_sum'] / year['weighted_students'], 2)
+                                 if year['weighted_students'] else None),
+                'students': year['students']
+            }
+            for year_key, year in sorted(years.items())
+        },
+        'group_count': len(groups_seen)
+    }
+
+
+class GradeSummaryStore:
+    """
+    Per-course grade aggregates materialized in an SQLite table.
+
+    Every row keeps a fingerprint of the raw grade data it was computed from, so a refresh
+    only recomputes the courses whose grades changed, and a refresh against the same cached
+    grades.json does nothing at all. Course codes are stored without dashes.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        """
+        Args:
+            db_path: Path to the summary database (created if missing)
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS course_grade_summary (
+                course_code TEXT PRIMARY KEY,
+                avg_grade REAL,
+                grades_counted INTEGER NOT NULL,
+                weighted_avg REAL,
+                distribution TEXT,
+                total_students INTEGER NOT NULL,
+                yearly_trend TEXT NOT NULL,
+                group_count INTEGER NOT NULL,
+                fingerprint TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS summary_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def refresh(self, grades_data: Optional[Dict] = None, force: bool = False) -> Dict:
+        """
+        Bring the summaries up to date with the grades dataset.
+
+        Args:
+            grades_data: Parsed grades.json to summarize; downloaded through the shared cache if None
+            force: Recompute every course even if its grades didn't change
+
+        Returns:
+            Dictionary with the number of courses checked, updated and removed, and elapsed_seconds
+        """
+        start_time = time.perf_counter()
+        stats = {'courses_checked': 0, 'courses_updated': 0, 'courses_removed': 0}
+
+        with self._lock:
+            dataset_version = None
+            if grades_data is None:
+                # The cached body only changes when a newer grades.json was downloaded
+                http_cache = get_cache()
+                body = os.stat(http_cache.fetch_path(GRADES_URL))
+                dataset_version = f"{body.st_size}:{body.st_mtime_ns}"
+                stored = self.conn.execute(
+                    "SELECT value FROM summary_meta WHERE key = 'dataset_version'").fetchone()
+                if not force and stored and stored[0] == dataset_version:
+                    stats['elapsed_seconds'] = round(time.perf_counter() - start_time, 4)
+                    return stats
+                grades_data = http_cache.get_json(GRADES_URL)
+
+            fingerprints = dict(self.conn.execute("SELECT course_code, fingerprint FROM course_grade_summary"))
+            now = time.time()
+            rows = []
+            seen = set()
+            for course_code, course_grades in grades_data.items():
+                key = course_code.replace('-', '')
+                if key in seen or not isinstance(course_grades, dict):
+                    continue
+                seen.add(key)
+                stats['courses_checked'] += 1
+
+                fingerprint = grades_fingerprint(course_grades)
+                if not force and fingerprints.get(key) == fingerprint:
+                    continue
+                summary = summarize_course_grades(course_grades)
+                rows.append((
+                    key, summary['avg_grade'], summary['grades_counted'], summary['weighted_avg'],
+                    json.dumps(summary['distribution']) if summary['distribution'] else None,
+                    summary['total_students'], json.dumps(summary['yearly_trend']),
+                    summary['group_count'], fingerprint, now
+                ))
+            removed = [(code,) for code in fingerprints if code not in seen]
+
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO course_grade_summary VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                self.conn.executemany("DELETE FROM course_grade_summary WHERE course_code = ?", removed)
+                if dataset_version:
+                    self.conn.execute("INSERT OR REPLACE INTO summary_meta (key, value) VALUES ('dataset_version', ?)",
+                                      (dataset_version,))
+
+        stats['courses_updated'] = len(rows)
+        stats['courses_removed'] = len(removed)
+        stats['elapsed_seconds'] = round(time.perf_counter() - start_time, 4)
+        return stats
+
+    @staticmethod
+    def _row_to_summary(row) -> Dict:
+        (course_code, avg_grade, grades_counted, weighted_avg, distribution,
+         total_students, yearly_trend, group_count) = row
+        return {
+            'avg_grade': avg_grade,
+            'grades_counted': grades_counted,
+            'weighted_avg': weighted_avg,
+            'distribution': json.loads(distribution) if distribution else None,
+            'total_students': total_students,
+            'yearly_trend': json.loads(yearly_trend),
+            'group_count': group_count
+        }
+
+    def get(self, course_code: str) -> Optional[Dict]:
+        """
+        Get the grade summary of one course.
+
+        Args:
+            course_code: Course number, with or without dashes
+
+        Returns:
+            The summary (see summarize_course_grades), or None if the course has no grade data
+        """
+        return self.get_many([course_code]).get(course_code)
+
+    def get_many(self, course_codes: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Get the grade summaries of several courses with one query.
+
+        Args:
+            course_codes: Course numbers, with or without dashes
+
+        Returns:
+            Dictionary mapping the given course numbers to their summaries; courses
+            without grade data are left out
+        """
+        keys = {}
+        for course_code in course_codes:
+            keys.setdefault(course_code.replace('-', ''), []).append(course_code)
+        if not keys:
+            return {}
+
+        with self._lock:
+            # json_each keeps this a single statement regardless of the number of codes
+            rows = self.conn.execute("""
+                SELECT course_code, avg_grade, grades_counted, weighted_avg, distribution,
+                       total_students, yearly_trend, group_count
+                FROM course_grade_summary
+                WHERE course_code IN (SELECT value FROM json_each(?))
+            """, (json.dumps(list(keys)),)).fetchall()
+
+        summaries = {}
+        for row in rows:
+            for course_code in keys[row[0]]:
+                summaries[course_code] = self._row_to_summary(row)
+        return summaries
+
+    def close(self):
+        self.conn.close()
+
+
+_default_store: Optional[GradeSummaryStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_summary_store(refresh: bool = True) -> GradeSummaryStore:
+    """
+    Get the shared summary store, brought up to date with the cached grades.json.
+
+    Args:
+        refresh: Whether to check the grades dataset for changes first
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = GradeSummaryStore()
+    if refresh:
+        _default_store.refresh()
+    return _default_store
@@ -0,0 +1,362 @@
+import json
+import os
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+# Build-time port of the layout work course_graph.js used to do on every load: course
+# depths, complexity scores, hierarchical node positions and minimal prerequisite paths.
+# The result is written as a graph artifact (nodes, edges, paths and per-view positions) that
+# the page loads instead of laying the graph out itself:
+#   python courses/graph_layout.py
+
+LOGIC_WORDS = ('וגם', 'או')
+
+# Same spacing as createHierarchicalLayout in course_graph.js
+LEVEL_HEIGHT = 150
+NODE_SPACING = 100
+
+ARTIFACT_VERSION = 2
+
+# Written apart from the department JSONs, which the importers load as a whole directory
+GRAPH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'graph')
+GRAPH_LAYOUT_PATH = os.path.join(GRAPH_DIR, 'graph_layout.json')
+
+
+def build_graph_courses(catalogs: List[Dict[str, Dict]]) -> List[Dict]:
+    """
+    Turn department course collections into the course list course_graph.js works on.
+
+    Like loadCourseData, courses are identified by name and requirement course numbers are
+    resolved to names through the catalogs in order; unknown courses and logic words are dropped.
+
+    Args:
+        catalogs: Department course collections (course number -> course data), in page order
+
+    Returns:
+        List of courses with id, code, prereqs and coreqs
+    """
+    def resolve(numbers: List[str]) -> List[str]:
+        names = []
+        for number in numbers or []:
+            if number in LOGIC_WORDS:
+                continue
+            course = next((catalog[number] for catalog in catalogs if number in catalog), None)
+            if course:
+                names.append(course['name'])
+        return names
+
+    return [
+        {
+            'id': course_data['name'],
+            'code': course_number,
+            'prereqs': resolve(course_data.get('preq')),
+            'coreqs': resolve(course_data.get('pareq'))
+        }
+        for catalog in catalogs
+        for course_number, course_data in catalog.items()
+    ]
+
+
+def _index_courses(courses: List[Dict]) -> Dict[str, Dict]:
+    """Course id -> course; the first course wins, like Array.find."""
+    by_id = {}
+    for course in courses:
+        by_id.setdefault(course['id'], course)
+    return by_id
+
+
+def calculate_course_complexity(courses: List[Dict]) -> Tuple[Dict[str, float], Dict[str, int]]:
+    """
+    Port of calculateCourseComplexity: a course's complexity is 1 plus the complexity of its
+    prerequisites plus half that of its corequisites, and its depth is one more than its
+    deepest prerequisite. A course reached again while it is being computed counts as 0.
+
+    Returns:
+        Tuple of (course id -> complexity, course id -> depth)
+    """
+    by_id = _index_courses(courses)
+    complexity: Dict[str, float] = {}
+    depths: Dict[str, int] = {}
+    visiting: Set[str] = set()
+
+    def node_complexity(course_id: str) -> float:
+        if course_id in complexity:
+            return complexity[course_id]
+        if course_id in visiting:
+            return 0
+        course = by_id.get(course_id)
+        if course is None:
+            return 0
+
+        visiting.add(course_id)
+        total = 0
+        max_prereq_depth = 0
+        for prereq in course['prereqs']:
+            total += node_complexity(prereq)
+            max_prereq_depth = max(max_prereq_depth, depths.get(prereq, 0))
+        for coreq in course['coreqs']:
+            total += node_complexity(coreq) * 0.5  # Weight coreqs less
+
+        complexity[course_id] = 1 + total
+        depths[course_id] = max_prereq_depth + 1 if course['prereqs'] else 0
+        visiting.discard(course_id)
+        return complexity[course_id]
+
+    for course in courses:
+        node_complexity(course['id'])
+    return complexity, depths
+
+
+def calculate_course_depths(courses: List[Dict]) -> Dict[str, int]:
+    """
+    Port of calculateCourseDepths: one more than the deepest prerequisite or corequisite.
+    The JS version recursed forever on requirement cycles; here a cycle contributes depth 0.
+
+    Returns:
+        Course id -> depth
+    """
+    by_id = _index_courses(courses)
+    depths: Dict[str, int] = {}
+    visiting: Set[str] = set()
+
+    def get_depth(course_id: str) -> int:
+        if course_id in depths:
+            return depths[course_id]
+        course = by_id.get(course_id)
+        if course is None or course_id in visiting:
+            return 0
+        requirements = course['prereqs'] + course['coreqs']
+        if not requirements:
+            depths[course_id] = 0
+            return 0
+        visiting.add(course_id)
+        depths[course_id] = max(get_depth(requirement) for requirement in requirements) + 1
+        visiting.discard(course_id)
+        return depths[course_id]
+
+    for course in courses:
+        get_depth(course['id'])
+    return depths
+
+
+def create_hierarchical_layout(courses: List[Dict], depths: Dict[str, int]) -> Dict[str, Dict]:
+    """
+    Port of createHierarchicalLayout: one row per depth, LEVEL_HEIGHT apart, with the row's
+    nodes NODE_SPACING apart and centered on x = 0.
+
+    Unlike the JS version, which kept the input order, each row is ordered by the mean x of
+    the node's prerequisites in the rows above (barycenter heuristic) to cut edge crossings.
+
+    Returns:
+        Course id -> {'x', 'y'}
+    """
+    by_id = _index_courses(courses)
+    nodes_by_level: Dict[int, List[str]] = {}
+    for course_id in by_id:
+        nodes_by_level.setdefault(depths.get(course_id, 0), []).append(course_id)
+
+    positions: Dict[str, Dict] = {}
+    for level_index, level in enumerate(sorted(nodes_by_level)):
+        def barycenter(item: Tuple[int, str]) -> Tuple[float, int]:
+            index, course_id = item
+            placed = [positions[prereq]['x'] for prereq in by_id[course_id]['prereqs'] if prereq in positions]
+            return (sum(placed) / len(placed) if placed else float('-inf'), index)
+
+        ordered = [course_id for _, course_id in sorted(enumerate(nodes_by_level[level]), key=barycenter)]
+        start_x = -len(ordered) * NODE_SPACING / 2
+        for index, course_id in enumerate(ordered):
+            positions[course_id] = {'x': start_x + index * NODE_SPACING, 'y': level_index * LEVEL_HEIGHT}
+    return positions
+
+
+def get_minimal_prerequisite_path(course_id: str, by_id: Dict[str, Dict]) -> List[str]:
+    """
+    Port of getMinimalPrerequisitePath: all direct prerequisites of the course, then only the
+    most complex prerequisite (most requirements) of each of those, plus corequisites that
+    themselves require a course already on the path.
+
+    Args:
+        course_id: Course to start from
+        by_id: Course id -> course, see build_graph_courses
+
+    Returns:
+        Course ids on the path, in visiting order (starting with course_id)
+    """
+    critical_path: Dict[str, None] = {}  # Ordered set
+    visited: Set[str] = set()
+
+    def find_critical_path(current_id: str, depth: int = 0):
+        if current_id in visited:
+            return
+        visited.add(current_id)
+        course = by_id.get(current_id)
+        if course is None:
+            return
+        critical_path[current_id] = None
+
+        # Sort prerequisites by complexity (stable, like Array.sort) to prioritize more complex paths
+        prereqs = sorted(
+            course['prereqs'],
+            key=lambda prereq: -(len(by_id[prereq]['prereqs']) + len(by_id[prereq]['coreqs'])
+                                 if prereq in by_id else 0)
+        )
+        # Take only the most complex prerequisite path unless at top level
+        for prereq in (prereqs if depth == 0 else prereqs[:1]):
+            find_critical_path(prereq, depth + 1)
+
+        # Essential corequisites: only those that require a course already on the path
+        for coreq in course['coreqs']:
+            coreq_course = by_id.get(coreq)
+            if coreq_course and any(prereq in critical_path for prereq in coreq_course['prereqs']):
+                find_critical_path(coreq, depth)
+
+    find_critical_path(course_id)
+    return list(critical_path)
+
+
+def build_graph_edges(courses: List[Dict], complexity: Dict[str, float]) -> List[Dict]:
+    """
+    Prerequisite (prereq -> course) and corequisite (course -> coreq) edges, skipping an edge
+    whose reverse was already added, as updateGraph does.
+    """
+    visible = set(_index_courses(courses))
+    added: Set[Tuple[str, str]] = set()
+    edges = []
+
+    def add_edge(source: str, target: str, edge_type: str):
+        if (source, target) in added or (target, source) in added:
+            return
+        added.add((source, target))
+        edges.append({'source': source, 'target': target, 'type': edge_type,
+                      'weight': complexity.get(source, 0)})
+
+    for course in courses:
+        for prereq in course['prereqs']:
+            if prereq in visible:
+                add_edge(prereq, course['id'], 'prereq')
+        for coreq in course['coreqs']:
+            if coreq in visible:
+                add_edge(course['id'], coreq, 'coreq')
+    return edges
+
+
+def connected_course_ids(courses: List[Dict]) -> Set[str]:
+    """
+    Courses updateGraph keeps when isolated courses are hidden: those with prerequisites or
+    corequisites, and the courses they require.
+    """
+    connected: Set[str] = set()
+    for course in courses:
+        if course['prereqs'] or course['coreqs']:
+            connected.add(course['id'])
+            connected.update(course['prereqs'])
+            connected.update(course['coreqs'])
+    return connected
+
+
+def build_graph_view(name: str, courses: List[Dict], node_index: Dict[str, int]) -> Dict:
+    """
+    Depths, complexity and positions computed over one set of visible courses, the way
+    updateGraph would compute them if exactly these courses were shown.
+
+    Args:
+        name: View name
+        courses: The view's courses
+        node_index: Course id -> index into the artifact's nodes
+
+    Returns:
+        Dictionary with 'name' and, per node of the view, 'nodes' (node indices), 'depth',
+        'complexity', 'x' and 'y'
+    """
+    by_id = _index_courses(courses)
+    complexity, depths = calculate_course_complexity(courses)
+    positions = create_hierarchical_layout(courses, depths)
+    return {
+        'name': name,
+        'nodes': [node_index[course_id] for course_id in by_id],
+        'depth': [depths.get(course_id, 0) for course_id in by_id],
+        'complexity': [complexity.get(course_id, 0) for course_id in by_id],
+        'x': [positions[course_id]['x'] for course_id in by_id],
+        'y': [positions[course_id]['y'] for course_id in by_id]
+    }
+
+
+def build_graph_artifact(catalogs: List[Dict[str, Dict]]) -> Dict:
+    """
+    Compute the full graph artifact for the given department collections.
+
+    Args:
+        catalogs: Department course collections, in the order the page loads them
+
+    Depths, complexity and positions depend on which courses are visible, so they are stored
+    per view: 'all' (every course) and 'connected' (isolated courses hidden). The page only
+    uses a view whose courses are exactly the ones it shows.
+
+    Returns:
+        Dictionary with 'nodes' (id, code, topological_depth), 'edges' (source, target,
+        type, weight), 'paths' (per node, the node indices of its minimal prerequisite path)
+        and 'views' (see build_graph_view)
+    """
+    courses = build_graph_courses(catalogs)
+    by_id = _index_courses(courses)
+    complexity, _ = calculate_course_complexity(courses)
+    topological_depths = calculate_course_depths(courses)
+    node_index = {course_id: index for index, course_id in enumerate(by_id)}
+    connected = connected_course_ids(courses)
+
+    return {
+        'version': ARTIFACT_VERSION,
+        'level_height': LEVEL_HEIGHT,
+        'node_spacing': NODE_SPACING,
+        'nodes': [
+            {
+                'id': course_id,
+                'code': course['code'],
+                'topological_depth': topological_depths.get(course_id, 0)
+            }
+            for course_id, course in by_id.items()
+        ],
+        'edges': build_graph_edges(courses, complexity),
+        # Paths as node indices; course names would make up most of the file otherwise
+        'paths': [[node_index[path_id] for path_id in get_minimal_prerequisite_path(course_id, by_id)]
+                  for course_id in by_id],
+        'views': [
+            build_graph_view('all', courses, node_index),
+            build_graph_view('connected', [course for course in courses if course['id'] in connected], node_index)
+        ]
+    }
+
+
+def write_graph_artifact(catalogs: List[Dict[str, Dict]], output_path: str = GRAPH_LAYOUT_PATH) -> Dict:
+    """
+    Build the graph artifact and write it as compact JSON (by default where course_graph.js
+    loads it from).
+
+    Returns:
+        Dictionary with the node, edge, path and view counts, the file size and elapsed_seconds
+    """
+    start_time = time.perf_counter()
+    artifact = build_graph_artifact(catalogs)
+    if os.path.dirname(output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(artifact, f, ensure_ascii=False, separators=(',', ':'))
+    return {
+        'nodes': len(artifact['nodes']),
+        'edges': len(artifact['edges']),
+        'paths': len(artifact['paths']),
+        'views': len(artifact['views']),
+        'bytes': os.path.getsize(output_path),
+        'elapsed_seconds': round(time.perf_counter() - start_time, 4)
+    }
+
+
+if __name__ == "__main__":
+    json_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'JSONs')
+    catalogs = []
+    for name in ('math', 'physics'):  # The departments course_graph.js shows, in its order
+        with open(os.path.join(json_dir, f"{name}.json"), 'r', encoding='utf-8') as f:
+            catalogs.append(json.load(f))
+    stats = write_graph_artifact(catalogs)
+    print(f"Wrote {GRAPH_LAYOUT_PATH}: {stats['nodes']} nodes, {stats['edges']} edges, "
+          f"{stats['paths']} paths, {stats['views']} views, {stats['bytes']} bytes in {stats['elapsed_seconds']:.3f}s")
@@ -0,0 +1,231 @@
+import json
+import os
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+
+
+class HttpCache:
+    """
+    On-disk response cache for the Arazim Project datasets.
+
+    Every download of ``courses-{year}{sem}.json`` / ``grades.json`` goes through
+    this cache. Responses are stored together with their ETag/Last-Modified
+    headers and revalidated with a conditional GET, so an unchanged dataset is
+    never transferred twice. A process-wide in-memory layer keeps the parsed
+    JSON, so repeated lookups in the same run don't touch the disk or network.
+    """
+
+    DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'http')
+
+    # Process-wide in-memory layer shared by all instances: url -> parsed JSON
+    _memory: Dict[str, Any] = {}
+    _memory_lock = threading.Lock()
+
+    def __init__(self,
+                 cache_dir: Optional[str] = None,
+                 max_size_bytes: int = 512 * 1024 * 1024,
+                 max_age_seconds: int = 30 * 24 * 3600,
+                 revalidate_after: int = 3600,
+                 timeout: int = 60):
+        """
+        Args:
+            cache_dir: Directory for cached responses (defaults to courses/.cache/http)
+            max_size_bytes: Total size of cached bodies before least-recently-used entries are evicted
+            max_age_seconds: Entries older than this are evicted regardless of size
+            revalidate_after: Seconds an entry is served without contacting the server
+            timeout: Network timeout in seconds
+        """
+        self.cache_dir = cache_dir or self.DEFAULT_CACHE_DIR
+        self.max_size_bytes = max_size_bytes
+        self.max_age_seconds = max_age_seconds
+        self.revalidate_after = revalidate_after
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_paths(self, url: str):
+        """Get the (body, metadata) file paths for a URL."""
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.body", f"{base}.meta.json"
+
+    def _load_meta(self, meta_path: str) -> Optional[Dict]:
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        """Write a file atomically so a crash never leaves a half-written entry."""
+        tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def fetch_path(self, url: str) -> str:
+        """
+        Make sure the response for a URL is cached on disk and return the body path.
+
+        Args:
+            url: URL to download
+
+        Returns:
+            Path to the cached response body
+
+        Raises:
+            requests.RequestException: If the download fails and nothing is cached
+        """
+        body_path, meta_path = self._entry_paths(url)
+
+        with self._lock:
+            meta = self._load_meta(meta_path)
+            if meta and not os.path.exists(body_path):
+                meta = None
+
+            # Fresh enough - serve without contacting the server
+            if meta and time.time() - meta.get('validated_at', 0) < self.revalidate_after:
+                self._touch(meta, meta_path)
+                return body_path
+
+            # Revalidate with a conditional GET when we have validators
+            headers = {}
+            if meta:
+                if meta.get('etag'):
+                    headers['If-None-Match'] = meta['etag']
+                if meta.get('last_modified'):
+                    headers['If-Modified-Since'] = meta['last_modified']
+
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+                if response.status_code == 304 and meta:
+                    meta['validated_at'] = time.time()
+                    self._touch(meta, meta_path)
+                    return body_path
+                response.raise_for_status()
+            except requests.RequestException as e:
+                if meta:
+                    print(f"Warning: could not revalidate {url} ({e}), using cached copy")
+                    return body_path
+                raise
+
+            body = response.content
+            self._write_atomic(body_path, body)
+            meta = {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'size': len(body),
+                'stored_at': time.time(),
+                'validated_at': time.time(),
+                'accessed_at': time.time()
+            }
+            self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+
+            # The in-memory copy of this URL is stale now
+            with self._memory_lock:
+                self._memory.pop(url, None)
+
+            self._evict()
+            return body_path
+
+    def get_bytes(self, url: str) -> bytes:
+        """Get the raw response body for a URL."""
+        with open(self.fetch_path(url), 'rb') as f:
+            return f.read()
+
+    def get_json(self, url: str) -> Any:
+        """
+        Get the parsed JSON for a URL, downloading it at most once per process.
+
+        The returned object is shared between all callers in the process, so
+        treat it as read-only and copy anything you need to modify.
+
+        Args:
+            url: URL of the JSON dataset
+
+        Returns:
+            Parsed JSON data
+        """
+        with self._memory_lock:
+            if url in self._memory:
+                return self._memory[url]
+
+        data = json.loads(self.get_bytes(url))
+
+        with self._memory_lock:
+            self._memory[url] = data
+        return data
+
+    def _touch(self, meta: Dict, meta_path: str):
+        """Record an access so size eviction drops the least recently used entries."""
+        meta['accessed_at'] = time.time()
+        self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+
+    def _evict(self):
+        """Evict entries that are too old, then least recently used ones over the size budget."""
+        entries = []
+        now = time.time()
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith('.meta.json'):
+                continue
+            meta_path = os.path.join(self.cache_dir, filename)
+            body_path = meta_path[:-len('.meta.json')] + '.body'
+            meta = self._load_meta(meta_path)
+            if not meta or now - meta.get('stored_at', 0) > self.max_age_seconds:
+                self._remove_entry(body_path, meta_path, meta)
+                continue
+            entries.append((meta.get('accessed_at', 0), meta.get('size', 0), body_path, meta_path, meta))
+
+        total_size = sum(entry[1] for entry in entries)
+        # Never evict the most recently used entry - that's the one we just stored
+        for accessed_at, size, body_path, meta_path, meta in sorted(entries)[:-1]:
+            if total_size <= self.max_size_bytes:
+                break
+            self._remove_entry(body_path, meta_path, meta)
+            total_size -= size
+
+    def _remove_entry(self, body_path: str, meta_path: str, meta: Optional[Dict]):
+        for path in (body_path, meta_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        if meta and meta.get('url'):
+            with self._memory_lock:
+                self._memory.pop(meta['url'], None)
+
+    def clear(self):
+        """Remove every cached response from disk and memory."""
+        with self._lock:
+            for filename in os.listdir(self.cache_dir):
+                try:
+                    os.remove(os.path.join(self.cache_dir, filename))
+                except OSError:
+                    pass
+        with self._memory_lock:
+            self._memory.clear()
+
+
+_default_cache: Optional[HttpCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_cache() -> HttpCache:
+    """Get the shared cache instance used by all dataset downloads."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = HttpCache()
+        return _default_cache
+
+
+def get_json(url: str) -> Any:
+    """Download (or reuse) a JSON dataset through the shared cache."""
+    return get_cache().get_json(url)
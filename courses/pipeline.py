@@ -0,0 +1,81 @@
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+Stage = Callable[[Dict], Dict]
+
+
+class CoursePipeline:
+    """
+    Runs a sequence of processing stages over one in-memory course collection.
+
+    Each stage receives the course collection and returns it (modified in place or
+    replaced by a new dictionary). Wall-clock time and memory are recorded per stage.
+    """
+
+    def __init__(self, track_memory: bool = True):
+        """
+        Args:
+            track_memory: Whether to record per-stage memory with tracemalloc (slows stages down somewhat)
+        """
+        self.track_memory = track_memory
+        self.stages: List[Tuple[str, Stage]] = []
+        self.report: List[Dict] = []
+
+    def add_stage(self, name: str, stage: Stage) -> 'CoursePipeline':
+        """Append a stage; returns the pipeline so stages can be chained."""
+        self.stages.append((name, stage))
+        return self
+
+    def run(self, courses: Dict) -> Dict:
+        """
+        Run all stages in order.
+
+        Args:
+            courses: Course collection to process
+
+        Returns:
+            The course collection returned by the last stage
+        """
+        self.report = []
+        started_tracing = self.track_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+
+        try:
+            for step, (name, stage) in enumerate(self.stages, start=1):
+                print(f"\nStep {step}: {name}...")
+                if self.track_memory:
+                    tracemalloc.reset_peak()
+                    memory_before = tracemalloc.get_traced_memory()[0]
+
+                start_time = time.perf_counter()
+                courses = stage(courses)
+                elapsed = time.perf_counter() - start_time
+
+                entry = {'stage': name, 'seconds': elapsed, 'courses': len(courses)}
+                if self.track_memory:
+                    memory_after, memory_peak = tracemalloc.get_traced_memory()
+                    entry['memory_delta_mb'] = (memory_after - memory_before) / 2**20
+                    entry['memory_peak_mb'] = memory_peak / 2**20
+                self.report.append(entry)
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+        return courses
+
+    def print_report(self):
+        """Print the per-stage timing and memory report of the last run."""
+        print("\nPipeline report:")
+        header = f"{'stage':<28}{'seconds':>10}{'courses':>10}"
+        if self.track_memory:
+            header += f"{'delta MB':>12}{'peak MB':>10}"
+        print(header)
+        print("-" * len(header))
+        for entry in self.report:
+            line = f"{entry['stage']:<28}{entry['seconds']:>10.3f}{entry['courses']:>10}"
+            if self.track_memory:
+                line += f"{entry['memory_delta_mb']:>12.2f}{entry['memory_peak_mb']:>10.2f}"
+            print(line)
+        print(f"{'total':<28}{sum(entry['seconds'] for entry in self.report):>10.3f}")
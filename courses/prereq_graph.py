@@ -0,0 +1,526 @@
+import json
+import os
+import random
+import time
+from functools import cached_property
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Logic words that may still be in the preq / pareq lists (see remove_logic_words_from_courses)
+OR_WORDS = {'או', 'or'}
+AND_WORDS = {'וגם', 'and'}
+
+# Edge kinds
+PREREQ = 0  # Must be completed in an earlier semester
+COREQ = 1   # Must be taken in the same or an earlier semester
+
+REQUIREMENT_KEYS = (('preq', PREREQ), ('pareq', COREQ))
+
+COMPLETED = -1    # earliest semester of a completed course
+UNREACHABLE = -2  # earliest semester of a course whose requirements can't be met
+_UNMET = np.iinfo(np.int32).max  # value of a requirement clause that isn't met yet
+
+
+def parse_requirements(tokens: Optional[List[str]]) -> List[List[str]]:
+    """
+    Split a preq / pareq list into clauses. Every clause must be met, by any one of its courses.
+
+    'או' joins its neighbours into one clause; 'וגם', or no logic word at all (the pipeline
+    removes 'וגם'), starts a new clause. ['A', 'או', 'B', 'C'] is (A or B) and C.
+    """
+    clauses: List[List[str]] = []
+    join = False
+    for token in tokens or []:
+        if token in OR_WORDS:
+            join = True
+        elif token in AND_WORDS:
+            join = False
+        else:
+            if join and clauses:
+                clauses[-1].append(token)
+            else:
+                clauses.append([token])
+            join = False
+    return clauses
+
+
+def _csr(num_nodes: int, rows: np.ndarray, *columns: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Group edge columns by row.
+
+    Returns:
+        (offsets, *columns) where the edges of row i are at offsets[i]:offsets[i + 1]
+    """
+    order = np.argsort(rows, kind='stable')
+    offsets = np.zeros(num_nodes + 1, dtype=np.int32)
+    np.cumsum(np.bincount(rows, minlength=num_nodes), out=offsets[1:])
+    return (offsets,) + tuple(column[order] for column in columns)
+
+
+def _gather(offsets: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The CSR entries of several rows at once.
+
+    Returns:
+        (row of every entry, entry index)
+    """
+    starts = offsets[rows]
+    counts = offsets[rows + 1] - starts
+    ends = np.cumsum(counts)
+    total = int(ends[-1]) if len(ends) else 0
+    entries = np.arange(total, dtype=np.int32) + np.repeat(starts - (ends - counts), counts)
+    return np.repeat(rows, counts), entries
+
+
+def strongly_connected_components(nodes: Iterable[Hashable],
+                                  successors: Callable[[Hashable], Iterable[Hashable]]) -> List[List[Hashable]]:
+    """
+    Iterative Tarjan over the graph reachable from some nodes.
+
+    Args:
+        nodes: Nodes to start from
+        successors: The nodes a node has edges to; returning only some of them restricts
+            the search to a subgraph
+
+    Returns:
+        Components with more than one node
+    """
+    index: Dict[Hashable, int] = {}
+    low: Dict[Hashable, int] = {}
+    on_stack: Set[Hashable] = set()
+    stack: List[Hashable] = []
+    components: List[List[Hashable]] = []
+
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors(root)))]
+        while work:
+            node, children = work[-1]
+            child = next(children, None)
+            if child is not None:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors(child))))
+                elif child in on_stack and index[child] < low[node]:
+                    low[node] = index[child]
+                continue
+
+            work.pop()
+            if work and low[node] < low[work[-1][0]]:
+                low[work[-1][0]] = low[node]
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1:
+                    components.append(component)
+    return components
+
+
+class CourseGraph:
+    """
+    The prerequisite graph of a course catalog, built once and queried many times.
+
+    Courses get integer node ids in catalog order. Courses referenced by a requirement but
+    missing from the catalogs (other faculties, retired courses) get external nodes after
+    them; they have no requirements of their own. Edges point from the required course to
+    the course that requires it and are stored as NumPy CSR arrays in both directions.
+    Queries expand a whole frontier (or topological level) per step, so each is O(V + E)
+    with only as many Python iterations as the graph is deep.
+
+    A requirement clause lists the courses that can each satisfy it ('או'); a course can
+    be taken once all of its clauses are satisfied. A course listed in its own requirements
+    is recorded in self_loops and left out of the graph.
+    """
+
+    def __init__(self, catalogs: Iterable[Dict[str, Dict]]):
+        """
+        Args:
+            catalogs: Course collections (course number -> course data); the first
+                occurrence of a course number wins
+        """
+        self.codes: List[str] = []
+        self.index: Dict[str, int] = {}
+        courses: List[Dict] = []
+        for catalog in catalogs:
+            for course_number, course_data in catalog.items():
+                if course_number not in self.index:
+                    self.index[course_number] = len(self.codes)
+                    self.codes.append(course_number)
+                    courses.append(course_data)
+        self.num_courses = len(courses)
+
+        sources: List[int] = []
+        targets: List[int] = []
+        kinds: List[int] = []
+        clauses: List[int] = []
+        clause_count = [0] * self.num_courses
+        self.self_loops: List[str] = []
+        num_clauses = 0
+        for node, course_data in enumerate(courses):
+            for key, kind in REQUIREMENT_KEYS:
+                for clause in parse_requirements(course_data.get(key)):
+                    alternatives = {}
+                    for course_number in clause:
+                        if course_number == self.codes[node]:
+                            self.self_loops.append(course_number)
+                        else:
+                            alternatives.setdefault(self._node(course_number), None)
+                    if not alternatives:
+                        continue
+                    sources.extend(alternatives)
+                    targets.extend([node] * len(alternatives))
+                    kinds.extend([kind] * len(alternatives))
+                    clauses.extend([num_clauses] * len(alternatives))
+                    clause_count[node] += 1
+                    num_clauses += 1
+
+        self.num_nodes = len(self.codes)
+        self.num_edges = len(sources)
+        self.num_clauses = num_clauses
+        # External nodes have no clauses
+        self.clause_count = np.zeros(self.num_nodes, dtype=np.int32)
+        self.clause_count[:self.num_courses] = clause_count
+
+        sources = np.array(sources, dtype=np.int32)
+        targets = np.array(targets, dtype=np.int32)
+        kinds = np.array(kinds, dtype=np.int8)
+        clauses = np.array(clauses, dtype=np.int32)
+        # Dependents of each node, and the kind and clause of each of those edges
+        self.out_offsets, self.out_targets, self.out_kinds = _csr(self.num_nodes, sources, targets, kinds)
+        # Requirements of each node, and the clause each belongs to (grouped by clause)
+        self.in_offsets, self.in_sources, self.in_kinds, self.in_clauses = _csr(
+            self.num_nodes, targets, sources, kinds, clauses)
+
+    def _node(self, course_number: str) -> int:
+        """Node id of a course number, adding an external node for unknown courses."""
+        node = self.index.get(course_number)
+        if node is None:
+            node = self.index[course_number] = len(self.codes)
+            self.codes.append(course_number)
+        return node
+
+    @classmethod
+    def from_json_files(cls, *paths: str) -> 'CourseGraph':
+        """Build the graph from department JSON files, in the given order."""
+        catalogs = []
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                catalogs.append(json.load(f))
+        return cls(catalogs)
+
+    def _ids(self, course_numbers: Iterable[str]) -> np.ndarray:
+        """Node ids of course numbers; raises KeyError for courses not in the graph."""
+        return np.unique(np.array([self.index[course_number] for course_number in course_numbers],
+                                  dtype=np.int32))
+
+    def _codes(self, nodes: np.ndarray) -> List[str]:
+        return [self.codes[node] for node in nodes.tolist()]
+
+    def is_external(self, course_number: str) -> bool:
+        """Whether a course is only referenced by requirements and missing from the catalogs."""
+        return self.index[course_number] >= self.num_courses
+
+    @property
+    def dangling_references(self) -> Dict[str, List[str]]:
+        """Course number -> the required course numbers that are missing from the catalogs."""
+        dangling: Dict[str, List[str]] = {}
+        external = np.arange(self.num_courses, self.num_nodes, dtype=np.int32)
+        sources, edges = _gather(self.out_offsets, external)
+        for source, target in zip(sources.tolist(), self.out_targets[edges].tolist()):
+            dangling.setdefault(self.codes[target], []).append(self.codes[source])
+        return dangling
+
+    @cached_property
+    def levels(self) -> List[np.ndarray]:
+        """
+        Node ids grouped by topological level: level 0 has no requirements, and every
+        node comes after all of its requirements (level-synchronous Kahn's algorithm).
+        Courses on a requirement cycle, or depending on one, are left out.
+        """
+        in_degree = np.diff(self.in_offsets)
+        frontier = np.flatnonzero(in_degree == 0).astype(np.int32)
+        levels = []
+        while len(frontier):
+            levels.append(frontier)
+            _, edges = _gather(self.out_offsets, frontier)
+            targets, counts = np.unique(self.out_targets[edges], return_counts=True)
+            in_degree[targets] -= counts.astype(in_degree.dtype)
+            frontier = targets[in_degree[targets] == 0]
+        return levels
+
+    @cached_property
+    def topological_order(self) -> np.ndarray:
+        """Node ids with every course after all of its requirements (see levels)."""
+        return np.concatenate(self.levels) if self.levels else np.zeros(0, dtype=np.int32)
+
+    def has_cycles(self) -> bool:
+        return len(self.topological_order) < self.num_nodes
+
+    @cached_property
+    def _cycles(self) -> List[List[int]]:
+        # Only nodes left out of the topological order can be on a cycle. Peel off the
+        # ones that merely depend on a cycle (no dependents left), then run Tarjan on the rest.
+        residual = np.ones(self.num_nodes, dtype=bool)
+        residual[self.topological_order] = False
+        out_degree = np.zeros(self.num_nodes, dtype=np.int32)
+        sources, edges = _gather(self.out_offsets, np.flatnonzero(residual).astype(np.int32))
+        np.add.at(out_degree, sources[residual[self.out_targets[edges]]], 1)
+        frontier = np.flatnonzero(residual & (out_degree == 0)).astype(np.int32)
+        while len(frontier):
+            residual[frontier] = False
+            _, edges = _gather(self.in_offsets, frontier)
+            requirements, counts = np.unique(self.in_sources[edges], return_counts=True)
+            keep = residual[requirements]
+            requirements, counts = requirements[keep], counts[keep]
+            out_degree[requirements] -= counts.astype(np.int32)
+            frontier = requirements[out_degree[requirements] == 0]
+
+        nodes = np.flatnonzero(residual).tolist()
+        if not nodes:
+            return []
+        offsets, targets, member = self.out_offsets.tolist(), self.out_targets.tolist(), residual.tolist()
+        return strongly_connected_components(
+            nodes, lambda node: [target for target in targets[offsets[node]:offsets[node + 1]] if member[target]])
+
+    def cycles(self) -> List[List[str]]:
+        """Groups of courses that (directly or indirectly) require each other."""
+        return [[self.codes[node] for node in component] for component in self._cycles]
+
+    def _reachable(self, course_numbers: Iterable[str], offsets: np.ndarray, neighbours: np.ndarray,
+                   kinds: np.ndarray, include_coreqs: bool) -> Set[str]:
+        frontier = self._ids(course_numbers)
+        seen = np.zeros(self.num_nodes, dtype=bool)
+        seen[frontier] = True
+        found = []
+        while len(frontier):
+            _, edges = _gather(offsets, frontier)
+            if not include_coreqs:
+                edges = edges[kinds[edges] == PREREQ]
+            frontier = neighbours[edges]
+            frontier = np.unique(frontier[~seen[frontier]])
+            seen[frontier] = True
+            found.append(frontier)
+        return set(self._codes(np.concatenate(found))) if found else set()
+
+    def ancestors(self, course_numbers: Iterable[str], include_coreqs: bool = True) -> Set[str]:
+        """
+        Every course the given courses require, directly or indirectly (any alternative of
+        an 'או' clause counts).
+
+        Args:
+            course_numbers: Courses to start from (not included in the result)
+            include_coreqs: Whether to follow parallel requirements too
+        """
+        return self._reachable(course_numbers, self.in_offsets, self.in_sources, self.in_kinds, include_coreqs)
+
+    def descendants(self, course_numbers: Iterable[str], include_coreqs: bool = True) -> Set[str]:
+        """
+        Every course that requires one of the given courses, directly or indirectly.
+
+        Args:
+            course_numbers: Courses to start from (not included in the result)
+            include_coreqs: Whether to follow parallel requirements too
+        """
+        return self._reachable(course_numbers, self.out_offsets, self.out_targets, self.out_kinds, include_coreqs)
+
+    def longest_chain(self) -> List[str]:
+        """
+        The longest sequence of courses where each is a prerequisite of the next, ignoring
+        courses on requirement cycles.
+        """
+        length = np.zeros(self.num_nodes, dtype=np.int32)
+        previous = np.full(self.num_nodes, -1, dtype=np.int32)
+        for level in self.levels:
+            # Every requirement of a level is in an earlier level, so its lengths are final
+            sources, edges = _gather(self.out_offsets, level)
+            prereq = self.out_kinds[edges] == PREREQ
+            sources, targets = sources[prereq], self.out_targets[edges[prereq]]
+            candidates = length[sources] + 1
+            np.maximum.at(length, targets, candidates)
+            best = candidates == length[targets]
+            previous[targets[best]] = sources[best]
+
+        if not len(self.topological_order):
+            return []
+        chain = []
+        node = int(self.topological_order[np.argmax(length[self.topological_order])])
+        while node != -1:
+            chain.append(self.codes[node])
+            node = int(previous[node])
+        return chain[::-1]
+
+    @cached_property
+    def _requirement_plans(self) -> List[Tuple[np.ndarray, ...]]:
+        """
+        For each topological level, then for the nodes left out of the order (if any): the
+        nodes with requirements, the source and kind of their incoming edges, and where each
+        clause and each node starts among those edges. A node's incoming edges are grouped
+        by clause, in clause order, so both reductions are single reduceat calls.
+        """
+        groups = list(self.levels)
+        residual = np.ones(self.num_nodes, dtype=bool)
+        residual[self.topological_order] = False
+        groups.append(np.flatnonzero(residual).astype(np.int32))
+
+        plans = []
+        for nodes in groups:
+            nodes = nodes[self.clause_count[nodes] > 0]
+            _, edges = _gather(self.in_offsets, nodes)
+            clauses = self.in_clauses[edges]
+            clause_starts = np.flatnonzero(np.diff(clauses, prepend=-1))
+            node_starts = np.cumsum(self.clause_count[nodes]) - self.clause_count[nodes]
+            plans.append((nodes, self.in_sources[edges], self.in_kinds[edges] == PREREQ,
+                          clause_starts, node_starts))
+        return plans
+
+    @staticmethod
+    def _apply_plan(values: np.ndarray, plan: Tuple[np.ndarray, ...]) -> np.ndarray:
+        """Semester of each node of a plan: its latest clause, met by the clause's earliest course."""
+        nodes, sources, prereq, clause_starts, node_starts = plan
+        source_values = values[sources]
+        edge_values = np.where(prereq, source_values + 1, np.maximum(source_values, 0))
+        clause_values = np.minimum.reduceat(edge_values, clause_starts)
+        return np.maximum.reduceat(clause_values, node_starts)
+
+    def _earliest(self, completed: np.ndarray) -> np.ndarray:
+        """
+        Earliest semester of every node: one vectorized pass over the topological levels,
+        then the nodes on or behind requirement cycles semester by semester (a cycle can
+        still be left through an 'או' alternative or a completed course, and courses that
+        are parallel requirements of each other can be taken together).
+        """
+        # int64 so that an unmet value plus one stays out of range
+        values = np.zeros(self.num_nodes, dtype=np.int64)
+        values[completed] = COMPLETED
+        is_completed = values == COMPLETED
+        *level_plans, residual_plan = self._requirement_plans
+        for plan in level_plans:
+            nodes = plan[0]
+            values[nodes] = np.where(is_completed[nodes], COMPLETED, self._apply_plan(values, plan))
+
+        nodes, sources = residual_plan[0], residual_plan[1]
+        open_nodes = ~is_completed[nodes]
+        values[nodes[open_nodes]] = _UNMET
+        semester = 0
+        while open_nodes.any():
+            # The courses taken in a semester: the largest set of open courses whose prerequisites
+            # are met before it and whose parallel requirements are met before or within it
+            taken = open_nodes.copy()
+            while True:
+                values[nodes[taken]] = semester
+                fits = taken & (self._apply_plan(values, residual_plan) <= semester)
+                if np.array_equal(fits, taken):
+                    break
+                values[nodes[taken & ~fits]] = _UNMET
+                taken = fits
+            open_nodes &= ~taken
+            if taken.any():
+                semester += 1
+                continue
+            # Nothing changes until a requirement done in a later semester is met
+            later = values[sources]
+            later = later[(later >= semester) & (later < _UNMET)]
+            if not len(later):
+                break
+            semester = max(int(later.min()), semester + 1)
+        values[values >= _UNMET] = UNREACHABLE
+        return values.astype(np.int32)
+
+    def earliest_semesters(self, completed: Iterable[str] = ()) -> Dict[str, Optional[int]]:
+        """
+        The earliest semester each course can be taken in, counting from 0 (the next
+        semester), if every course is taken as early as possible. Offering patterns are
+        not taken into account.
+
+        Args:
+            completed: Courses already completed (left out of the result)
+
+        Returns:
+            Course number -> semester index, or None if the course's requirements can't be
+            met (requirement cycles)
+        """
+        earliest = self._earliest(self._ids(completed)).tolist()
+        return {self.codes[node]: (semester if semester != UNREACHABLE else None)
+                for node, semester in enumerate(earliest) if semester != COMPLETED}
+
+    def unlocks(self, completed: Iterable[str]) -> Set[str]:
+        """
+        Courses that have requirements and can be taken next semester once the given
+        courses are completed (parallel requirements may be taken alongside).
+        """
+        earliest = self._earliest(self._ids(completed))
+        return set(self._codes(np.flatnonzero((earliest == 0) & (self.clause_count > 0))))
+
+
+def synthetic_catalog(num_courses: int, seed: int = 0) -> Dict[str, Dict]:
+    """
+    A random layered catalog shaped like the department JSONs (up to four prerequisites
+    from earlier courses, some 'או' clauses, parallel requirements and external courses).
+    """
+    rng = random.Random(seed)
+    codes = [f"{i:08d}" for i in range(num_courses)]
+    catalog = {}
+    for i, code in enumerate(codes):
+        preq: List[str] = []
+        for _ in range(rng.randint(0, 4) if i else 0):
+            if preq:
+                preq.append('או' if rng.random() < 0.2 else 'וגם')
+            preq.append(codes[rng.randrange(max(0, i - 2000), i)] if rng.random() < 0.95
+                        else f"9{rng.randrange(10 ** 7):07d}")
+        pareq = [codes[rng.randrange(max(0, i - 500), i)]] if i and rng.random() < 0.1 else []
+        catalog[code] = {'name': code, 'preq': preq, 'pareq': pareq}
+    return catalog
+
+
+def benchmark(build) -> Dict[str, float]:
+    """
+    Time building a graph and each of its whole-graph queries, in milliseconds.
+
+    Args:
+        build: Callable returning the CourseGraph to time
+    """
+    timings = {}
+
+    def timed(name, function):
+        start_time = time.perf_counter()
+        result = function()
+        timings[name] = (time.perf_counter() - start_time) * 1000
+        return result
+
+    graph = timed('build_ms', build)
+    timed('topological_order_ms', lambda: graph.topological_order)
+    timed('cycles_ms', graph.cycles)
+    chain = timed('longest_chain_ms', graph.longest_chain)
+    timed('ancestors_ms', lambda: graph.ancestors(chain[-1:]))
+    timed('descendants_ms', lambda: graph.descendants(chain[:1]))
+    timed('earliest_semesters_ms', graph.earliest_semesters)
+    timed('unlocks_ms', lambda: graph.unlocks(chain[:1]))
+    timings.update(nodes=graph.num_nodes, edges=graph.num_edges, longest_chain=len(chain))
+    return timings
+
+
+if __name__ == "__main__":
+    json_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'JSONs')
+    runs = {
+        'math+physics': lambda: CourseGraph.from_json_files(
+            *(os.path.join(json_dir, f"{name}.json") for name in ('math', 'physics'))),
+        'synthetic 50k': lambda: CourseGraph([synthetic_catalog(50000)])
+    }
+    for label, load in runs.items():
+        timings = benchmark(load)
+        print(f"{label}: {timings.pop('nodes')} nodes, {timings.pop('edges')} edges, "
+              f"longest chain {timings.pop('longest_chain')}")
+        for name, value in timings.items():
+            print(f"  {name:<24}{value:>8.2f}")
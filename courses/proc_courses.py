@@ -3,23 +3,37 @@ import requests
 from bs4 import BeautifulSoup
 import re
 import time
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import os
+import threading
 import traceback
-import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from fetch_engine import RateLimitedSession
+from checkpoint import CheckpointStore
+from compact_catalog import COMPACT_DIR, compact_path, write_compact_catalog
 
 
 class CourseProcessor:
 
-    def __init__(self):
-        # Define delay ranges in seconds
-        self.min_delay = 3.0
-        self.max_delay = 5.0
-
-    def _random_delay(self):
-        """Add a random delay between requests to prevent rate limiting."""
-        delay = random.uniform(self.min_delay, self.max_delay)
-        time.sleep(delay)
+    def __init__(self, max_workers: int = 4, requests_per_second: float = 1.0, burst: int = 2):
+        """
+        Args:
+            max_workers: Number of courses enriched concurrently
+            requests_per_second: Politeness budget per host (ims.tau.ac.il)
+            burst: Number of requests a host may receive back to back
+        """
+        self.max_workers = max_workers
+        # Shared rate-limited client - replaces the fixed random sleeps before every request
+        self.session = RateLimitedSession(
+            requests_per_second=requests_per_second,
+            burst=burst,
+            pool_size=max_workers
+        )
+        # Department JSONs used to look up a course's first group for its syllabus link
+        json_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'JSONs')
+        self.group_index_paths = [os.path.join(json_dir, 'math.json'), os.path.join(json_dir, 'physics.json')]
+        self._group_index: Optional[Dict[str, str]] = None
+        self._group_index_lock = threading.Lock()
 
     def get_req(self, course_number: str, year: str, semester: str) -> Dict:
         """
@@ -33,9 +47,6 @@ class CourseProcessor:
         Returns:
             Dictionary containing prerequisites and parallel requirements lists
         """
-        # Add delay before making request
-        self._random_delay()
-        
         # Convert semester 'a'/'b' to '1'/'2' and create the year_sem parameter
         sem_num = '1' if semester.lower() == 'a' else '2'
         year_sem = f"{int(year)-1}{sem_num}"  # Use previous year for semester
@@ -54,8 +65,7 @@ class CourseProcessor:
         pareq_list = []
         
         # Fetch and parse the prerequisites page
-        response = requests.get(req_url)
-        response.raise_for_status()
+        response = self.session.get(req_url)
         soup = BeautifulSoup(response.text, 'html.parser')
         
         # Find the course number in the page title
@@ -105,37 +115,61 @@ class CourseProcessor:
             'req_url': req_url
         }
 
-    def get_course_link(self, course_number: str, year: str, semester: str) -> Dict:
+    def _get_group_index(self) -> Dict[str, str]:
+        """
+        Map each course number to its first group number, built once per processor
+        from the existing department JSONs.
+        
+        Returns:
+            Dictionary mapping course numbers to group numbers
+        """
+        if self._group_index is not None:
+            return self._group_index
+        # Enrichment workers call this concurrently; only publish the finished index
+        with self._group_index_lock:
+            if self._group_index is None:
+                group_index = {}
+                for json_file_path in self.group_index_paths:
+                    if not os.path.exists(json_file_path):
+                        continue
+                    with open(json_file_path, 'r', encoding='utf-8') as f:
+                        courses = json.load(f)
+                    for course_number, course_data in courses.items():
+                        group_code = self._first_group(course_data)
+                        if group_code:
+                            group_index.setdefault(course_number, group_code)
+                self._group_index = group_index
+        return self._group_index
+
+    @staticmethod
+    def _first_group(course_data: Dict) -> Optional[str]:
+        """Get the first group number of a course entry, if it has one."""
+        if course_data.get('groups'):
+            return course_data['groups'][0].get('group')
+        return None
+
+    def get_course_link(self, course_number: str, year: str, semester: str,
+                        course_data: Optional[Dict] = None) -> Dict:
         """
         Generate the course link URL using the first available group number.
+        This is a pure in-memory lookup - no request is made.
         
         Args:
             course_number: Course number without dashes
             year: Academic year
             semester: Semester ('a' or 'b')
+            course_data: Optional course entry being processed; its groups are used before the group index
             
         Returns:
             Dictionary containing the course link
         """
-        # Add delay before making request
-        self._random_delay()
-        
         # Base URL for TAU course information
         BASE_COURSE_LINK_URL = "https://www.ims.tau.ac.il/Tal/Syllabus/Syllabus_L.aspx?course={course_number}{group}&year={year}"
         
-        # Load the course data to get the group number
-        json_file_path = os.path.join('courses', 'JSONs', 'math.json')  # You might need to adjust this path
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            courses = json.load(f)
-        
         # Get the first available group number for this course
-        group_code = "01"  # Default fallback
-        if course_number in courses:
-            course_data = courses[course_number]
-            if 'groups' in course_data and course_data['groups']:
-                first_group = course_data['groups'][0]
-                if 'group' in first_group:
-                    group_code = first_group['group']
+        group_code = (course_data and self._first_group(course_data)) \
+            or self._get_group_index().get(course_number) \
+            or "01"  # Default fallback
         
         course_url = BASE_COURSE_LINK_URL.format(
             course_number=course_number,
@@ -146,8 +180,29 @@ class CourseProcessor:
         return {
             'course_link': course_url
         }
+
+    def get_course_links(self, courses: Dict[str, Dict]) -> Dict[str, str]:
+        """
+        Generate course links for a whole collection of courses at once.
+        
+        Args:
+            courses: Dictionary mapping course numbers to course data (with 'last_offered')
+            
+        Returns:
+            Dictionary mapping course numbers to their course links
+        """
+        links = {}
+        for course_number, course_data in courses.items():
+            last_offered = course_data.get('last_offered', '')
+            if not last_offered:
+                continue
+            links[course_number] = self.get_course_link(
+                course_number, last_offered[:-1], last_offered[-1].lower(), course_data
+            )['course_link']
+        return links
     
-    def get_eval_type(self, course_number: str, year: str, semester: str) -> Dict:
+    def get_eval_type(self, course_number: str, year: str, semester: str,
+                      course_link: Optional[str] = None) -> Dict:
         """
         Get the evaluation type for a course.
         
@@ -155,30 +210,31 @@ class CourseProcessor:
             course_number: Course number without dashes
             year: Academic year
             semester: Semester ('a' or 'b')
+            course_link: Optional syllabus link, generated if not given
             
         Returns:
-            Dictionary containing the evaluation type
+            Dictionary containing the evaluation type ('' if the page has none)
+            
+        Raises:
+            requests.RequestException: If the syllabus page can't be fetched
         """
-        # Add delay before making request
-        self._random_delay()
-        
         # Get the course link first
-        course_url = self.get_course_link(course_number, year, semester)['course_link']
+        course_url = course_link or self.get_course_link(course_number, year, semester)['course_link']
+        
+        # Use headers that mimic a real browser to get the full HTML
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'he-IL,he;q=0.9,en-US;q=0.8,en;q=0.7',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1',
+            'Cache-Control': 'max-age=0'
+        }
+        
+        # Request errors propagate, so the caller can leave eval_type out of the checkpoint
+        course_response = self.session.get(course_url, headers=headers)
         
         try:
-            # Use headers that mimic a real browser to get the full HTML
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'he-IL,he;q=0.9,en-US;q=0.8,en;q=0.7',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Cache-Control': 'max-age=0'
-            }
-            
-            course_response = requests.get(course_url, headers=headers)
-            course_response.raise_for_status()
-            
             # Get the raw HTML content
             html_content = course_response.text
             
@@ -274,13 +330,81 @@ class CourseProcessor:
         except Exception as e:
             return {'eval_type': ''}
 
-    def complete_course_data(self, json_file_path: str, limit: Optional[int] = None) -> Dict:
+    def _complete_course(self, course_number: str, course_data: Dict) -> Tuple[Dict, List[str], List[str]]:
+        """
+        Fetch the missing link, evaluation type and requirements for a single course.
+        Runs on a worker thread, so it only returns the new fields instead of modifying shared data.
+        
+        Args:
+            course_number: Course number without dashes
+            course_data: The course entry to complete
+            
+        Returns:
+            Tuple of (fields to add to the course, log messages, fields that failed to fetch)
+        """
+        updates = {}
+        messages = []
+        failed = []
+        
+        # Parse last_offered string into year and semester
+        last_offered = course_data.get('last_offered', '')
+        year = last_offered[:-1]  # Everything except last character
+        semester = last_offered[-1].lower()  # Last character ('a' or 'b')
+        
+        # Process each required field if missing
+        if 'course_link' not in course_data:
+            try:
+                link_data = self.get_course_link(course_number, year, semester, course_data)
+                updates['course_link'] = link_data['course_link']
+                messages.append(f"Added course link: {updates['course_link']}")
+            except Exception as e:
+                messages.append(f"Error getting course link: {e}")
+                updates['course_link'] = ''
+                failed.append('course_link')
+        
+        if 'eval_type' not in course_data:
+            try:
+                course_link = updates.get('course_link') or course_data.get('course_link')
+                eval_data = self.get_eval_type(course_number, year, semester, course_link)
+                updates['eval_type'] = eval_data['eval_type']
+                if eval_data['eval_type']:
+                    messages.append(f"Found evaluation type: '{eval_data['eval_type']}'")
+                else:
+                    messages.append(f"Could not find evaluation type for {course_number}")
+            except Exception as e:
+                messages.append(f"Error getting evaluation type: {e}")
+                updates['eval_type'] = ''
+                failed.append('eval_type')
+        
+        if 'preq' not in course_data or 'pareq' not in course_data:
+            try:
+                req_data = self.get_req(course_number, year, semester)
+                updates['preq'] = req_data['preq']
+                updates['pareq'] = req_data['pareq']
+                if 'req_url' in req_data:
+                    updates['req_url'] = req_data['req_url']
+                messages.append(f"Found {len(req_data['preq'])} prerequisites: {', '.join(req_data['preq']) if req_data['preq'] else 'None'}")
+                messages.append(f"Found {len(req_data['pareq'])} parallel requirements: {', '.join(req_data['pareq']) if req_data['pareq'] else 'None'}")
+            except Exception as e:
+                messages.append(f"Error getting requirements: {e}")
+                updates['preq'] = []
+                updates['pareq'] = []
+                failed.extend(['preq', 'pareq'])
+        
+        return updates, messages, failed
+
+    def complete_course_data(self, json_file_path: str, limit: Optional[int] = None,
+                             max_workers: Optional[int] = None, resume: bool = False,
+                             checkpoint_path: Optional[str] = None) -> Dict:
         """
         Add course link, prerequisites, parallel requirements, and evaluation type to courses data.
         
         Args:
             json_file_path: Path to JSON file containing course data
             limit: Optional maximum number of courses to process
+            max_workers: Number of courses to process concurrently (defaults to self.max_workers)
+            resume: Whether to restore checkpointed courses instead of starting over
+            checkpoint_path: Path to the checkpoint database (defaults to <json_file_path>.checkpoint.db)
             
         Returns:
             Updated course data dictionary
@@ -292,6 +416,54 @@ class CourseProcessor:
             courses = json.load(f)
         print(f"Loaded {len(courses)} courses from file")
         
+        self.complete_courses(
+            courses,
+            limit=limit,
+            max_workers=max_workers,
+            resume=resume,
+            checkpoint_path=checkpoint_path or f"{json_file_path}.checkpoint.db"
+        )
+        
+        # Save the updated courses back to the file
+        with open(json_file_path, 'w', encoding='utf-8') as f:
+            json.dump(courses, f, ensure_ascii=False, indent=2)
+            
+        print(f"\nSaved updated data to {json_file_path}")
+        
+        return courses
+
+    def complete_courses(self, courses: Dict, limit: Optional[int] = None,
+                         max_workers: Optional[int] = None, resume: bool = False,
+                         checkpoint_path: Optional[str] = None,
+                         on_batch: Optional[Callable[[List[str]], None]] = None,
+                         batch_size: int = 50) -> Dict:
+        """
+        Add course link, prerequisites, parallel requirements, and evaluation type to in-memory course data.
+        Courses are processed concurrently; the request rate is bounded by the session's per-host
+        politeness budget rather than by fixed sleeps. Every finished course is committed to a
+        checkpoint store right away, so an interrupted run can be resumed.
+        
+        Args:
+            courses: Course data to complete in place
+            limit: Optional maximum number of courses to process
+            max_workers: Number of courses to process concurrently (defaults to self.max_workers)
+            resume: Whether to restore checkpointed courses instead of starting over
+            checkpoint_path: Path to the checkpoint database; no checkpoint is kept if None
+            on_batch: Called with the course numbers of every batch_size finished courses
+                (and of the last, partial batch), e.g. to re-check their requirements
+            batch_size: Number of finished courses per on_batch call
+            
+        Returns:
+            The completed course data
+        """
+        # Restore courses finished by a previous run, or start a fresh checkpoint
+        checkpoint = CheckpointStore(checkpoint_path) if checkpoint_path else None
+        if checkpoint and resume:
+            restored = checkpoint.apply(courses)
+            print(f"Resumed {restored} courses from checkpoint {checkpoint.db_path}")
+        elif checkpoint:
+            checkpoint.clear()
+        
         # Skip courses that already have all required fields
         required_fields = {'eval_type', 'course_link', 'preq', 'pareq'}
         courses_to_process = {
@@ -310,95 +482,88 @@ class CourseProcessor:
         processed_count = 0
         success_count = 0
         error_count = 0
+        start_time = time.perf_counter()
         
-        for course_number, course_data in courses_to_process.items():
-            processed_count += 1
-            print(f"\nProcessing course {processed_count}/{len(courses_to_process)}: {course_number}")
-            
-            try:
-                # Skip if all fields already exist
-                if all(field in course_data for field in required_fields):
-                    print(f"Course {course_number} already complete, skipping")
-                    continue
-
-                # Parse last_offered string into year and semester
-                last_offered = course_data.get('last_offered', '')
-                if not last_offered:
+        futures = {}
+        batch: List[str] = []
+        workers = max_workers or self.max_workers
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            for course_number, course_data in courses_to_process.items():
+                # Courses without last_offered can't be looked up
+                if not course_data.get('last_offered', ''):
+                    processed_count += 1
                     print(f"No last_offered data for course {course_number}, skipping")
                     continue
-                    
-                year = last_offered[:-1]  # Everything except last character
-                semester = last_offered[-1].lower()  # Last character ('a' or 'b')
-                
-                # Process each required field if missing
-                if 'course_link' not in course_data:
-                    try:
-                        link_data = self.get_course_link(course_number, year, semester)
-                        course_data['course_link'] = link_data['course_link']
-                        print(f"Added course link: {course_data['course_link']}")
-                    except Exception as e:
-                        print(f"Error getting course link: {e}")
-                        course_data['course_link'] = ''
-                
-                if 'eval_type' not in course_data:
-                    try:
-                        eval_data = self.get_eval_type(course_number, year, semester)
-                        course_data['eval_type'] = eval_data['eval_type']
-                        if eval_data['eval_type']:
-                            print(f"Found evaluation type: '{eval_data['eval_type']}'")
-                        else:
-                            print(f"Could not find evaluation type for {course_number}")
-                    except Exception as e:
-                        print(f"Error getting evaluation type: {e}")
-                        course_data['eval_type'] = ''
+                future = executor.submit(self._complete_course, course_number, course_data)
+                futures[future] = course_number
+            
+            print(f"Processing {len(futures)} courses with {workers} workers "
+                  f"at up to {self.session.requests_per_second} requests/sec per host")
+            
+            for future in as_completed(futures):
+                course_number = futures[future]
+                course_data = courses[course_number]
+                processed_count += 1
+                print(f"\nProcessed course {processed_count}/{len(courses_to_process)}: {course_number}")
                 
-                if 'preq' not in course_data or 'pareq' not in course_data:
-                    try:
-                        req_data = self.get_req(course_number, year, semester)
-                        course_data['preq'] = req_data['preq']
-                        course_data['pareq'] = req_data['pareq']
-                        course_data['req_url'] = req_data['req_url']
-                        print(f"Found {len(req_data['preq'])} prerequisites: {', '.join(req_data['preq']) if req_data['preq'] else 'None'}")
-                        print(f"Found {len(req_data['pareq'])} parallel requirements: {', '.join(req_data['pareq']) if req_data['pareq'] else 'None'}")
-                    except Exception as e:
-                        print(f"Error getting requirements: {e}")
+                try:
+                    updates, messages, failed = future.result()
+                    course_data.update(updates)
+                    # Commit right away; failed fields are left out so a resumed run retries them
+                    if checkpoint:
+                        checkpoint.save_course(course_number, {
+                            field: value for field, value in updates.items() if field not in failed
+                        })
+                    for message in messages:
+                        print(message)
+                    success_count += 1
+                    print(f"Successfully processed course {course_number}")
+                    
+                except Exception as e:
+                    print(f"ERROR: Error processing course {course_number}: {e}")
+                    print(f"Stack trace: {traceback.format_exc()}")
+                    error_count += 1
+                    # Ensure all required fields exist even on error
+                    if 'preq' not in course_data:
                         course_data['preq'] = []
+                    if 'pareq' not in course_data:
                         course_data['pareq'] = []
+                    if 'eval_type' not in course_data:
+                        course_data['eval_type'] = ''
+                    if 'course_link' not in course_data:
+                        course_data['course_link'] = ''
                 
-                success_count += 1
-                print(f"Successfully processed course {course_number}")
-                
-            except Exception as e:
-                print(f"ERROR: Error processing course {course_number}: {e}")
-                print(f"Stack trace: {traceback.format_exc()}")
-                error_count += 1
-                # Ensure all required fields exist even on error
-                if 'preq' not in course_data:
-                    course_data['preq'] = []
-                if 'pareq' not in course_data:
-                    course_data['pareq'] = []
-                if 'eval_type' not in course_data:
-                    course_data['eval_type'] = ''
-                if 'course_link' not in course_data:
-                    course_data['course_link'] = ''
-                continue
+                batch.append(course_number)
+                if on_batch and len(batch) >= batch_size:
+                    on_batch(batch)
+                    batch = []
+            if on_batch and batch:
+                on_batch(batch)
+            executor.shutdown()
+        except KeyboardInterrupt:
+            # Don't wait for the queued courses - everything finished so far is checkpointed
+            executor.shutdown(wait=False, cancel_futures=True)
+            print(f"\nInterrupted after {success_count} courses; rerun with resume=True to continue")
+            raise
+        finally:
+            # Also reached when a worker or on_batch raises; the checkpoint keeps what finished
+            executor.shutdown(wait=False, cancel_futures=True)
+            if checkpoint:
+                checkpoint.close()
         
         # Print final statistics
+        elapsed = time.perf_counter() - start_time
         print("\nProcessing completed!")
         print(f"Total courses processed: {processed_count}")
         print(f"Successfully processed: {success_count}")
         print(f"Errors encountered: {error_count}")
+        print(f"Elapsed time: {elapsed:.1f}s")
         if processed_count > 0:
             print(f"Success rate: {(success_count/processed_count)*100:.2f}%")
         else:
             print("Success rate: N/A - no courses needed processing")
         
-        # Save the updated courses back to the file
-        with open(json_file_path, 'w', encoding='utf-8') as f:
-            json.dump(courses, f, ensure_ascii=False, indent=2)
-            
-        print(f"\nSaved updated data for {processed_count} courses")
-        
         return courses
 
     def delete_keys(self, json_file_path: str, keys: List[str]):
@@ -417,6 +582,23 @@ class CourseProcessor:
             courses = json.load(f)
             
         print(f"\nStarting to remove keys {keys} from {json_file_path}")
+        self.delete_keys_from_courses(courses, keys)
+        
+        # Save the updated data
+        with open(json_file_path, 'w', encoding='utf-8') as f:
+            json.dump(courses, f, ensure_ascii=False, indent=2)
+
+    def delete_keys_from_courses(self, courses: Dict, keys: List[str]) -> Dict[str, int]:
+        """
+        In-memory version of delete_keys: filters the course data in place.
+        
+        Args:
+            courses: Course data to filter
+            keys: List of keys to delete from each course entry
+            
+        Returns:
+            Dictionary with statistics about the changes made
+        """
         print(f"Original number of courses: {len(courses)}")
         
         # Track statistics
@@ -480,14 +662,15 @@ class CourseProcessor:
             if course_modified:
                 courses_modified += 1
         
-        # Save the updated data
-        with open(json_file_path, 'w', encoding='utf-8') as f:
-            json.dump(courses, f, ensure_ascii=False, indent=2)
-        
         # Print summary
         print("\nProcessing completed!")
         print(f"Modified {courses_modified} courses")
         print(f"Removed {total_keys_removed} total keys")
+        
+        return {
+            'courses_modified': courses_modified,
+            'total_keys_removed': total_keys_removed
+        }
 
     def remove_logic_words(self, json_file_path: str, logic_words: List[str] = None) -> Dict[str, Dict]:
         """ 
@@ -499,6 +682,29 @@ class CourseProcessor:
             json_file_path: Path to the JSON file containing course data
             logic_words: Optional list of logic words to remove. Can include any of: ['או', 'or', 'וגם', 'and']
             
+        Returns:
+            Dictionary containing statistics about the changes made
+        """
+        # Load the course data
+        with open(json_file_path, 'r', encoding='utf-8') as f:
+            courses = json.load(f)
+            
+        changes = self.remove_logic_words_from_courses(courses, logic_words)
+        
+        # Save the updated data back to the file
+        with open(json_file_path, 'w', encoding='utf-8') as f:
+            json.dump(courses, f, ensure_ascii=False, indent=2)
+        
+        return changes
+
+    def remove_logic_words_from_courses(self, courses: Dict, logic_words: List[str] = None) -> Dict[str, Dict]:
+        """ 
+        In-memory version of remove_logic_words: cleans the course data in place.
+        
+        Args:
+            courses: Course data to clean
+            logic_words: Optional list of logic words to remove. Can include any of: ['או', 'or', 'וגם', 'and']
+            
         Returns:
             Dictionary containing statistics about the changes made
         """
@@ -520,10 +726,6 @@ class CourseProcessor:
         expanded_logic_words = set()
         for word in logic_words:
             expanded_logic_words.update(LOGIC_WORD_EQUIVALENTS[word])
-
-        # Load the course data
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            courses = json.load(f)
             
         # Track changes
         changes = {
@@ -574,10 +776,6 @@ class CourseProcessor:
             if course_modified:
                 changes['courses_modified'] += 1
                 changes['modified_courses'][course_number] = course_changes
-        
-        # Save the updated data back to the file
-        with open(json_file_path, 'w', encoding='utf-8') as f:
-            json.dump(courses, f, ensure_ascii=False, indent=2)
             
         # Print summary
         print(f"\nProcessing completed!")
@@ -614,6 +812,20 @@ class CourseProcessor:
         with open(json_file_path, 'r', encoding='utf-8') as f:
             courses = json.load(f)
             
+        departments = self.split_courses_by_department(courses, department)
+        return self.save_departments(departments, os.path.dirname(json_file_path))
+
+    def split_courses_by_department(self, courses: Dict, department: str = None) -> Dict[str, Dict]:
+        """
+        Group in-memory course data by department.
+        
+        Args:
+            courses: Course data to split
+            department: Optional specific department to keep
+            
+        Returns:
+            Dictionary mapping department names to their courses
+        """
         # Dictionary to store courses by department
         departments = {}
         
@@ -635,9 +847,26 @@ class CourseProcessor:
                 # Add course to department
                 departments[dept][course_number] = course_data
         
+        return departments
+
+    def save_departments(self, departments: Dict[str, Dict], output_dir: str,
+                         compact: bool = True, compact_dir: str = COMPACT_DIR) -> Dict[str, int]:
+        """
+        Write one JSON file per department.
+        
+        Args:
+            departments: Dictionary mapping department names to their courses
+            output_dir: Directory to write the department files to
+            compact: Whether to also write the compact catalog (<department>.compact.json)
+                that course_graph.js loads
+            compact_dir: Directory to write the compact catalogs to, kept apart from the
+                department JSONs
+            
+        Returns:
+            Dictionary with department names as keys and number of courses as values
+        """
         # Create output directory if it doesn't exist
-        output_dir = os.path.dirname(json_file_path)
-        if not os.path.exists(output_dir):
+        if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir)
         
         # Save department files and count courses
@@ -653,6 +882,11 @@ class CourseProcessor:
             
             dept_counts[dept] = len(dept_courses)
             print(f"Created {output_path} with {len(dept_courses)} courses")
+            
+            if compact:
+                compact_output_path = compact_path(output_path, compact_dir)
+                compact_size = write_compact_catalog(dept_courses, compact_output_path)
+                print(f"Created {compact_output_path} ({compact_size} bytes)")
         
         return dept_counts
 
@@ -666,6 +900,28 @@ class CourseProcessor:
         Returns:
             Dictionary with statistics about the changes made
         """
+        # Load the course data
+        with open(json_file_path, 'r', encoding='utf-8') as f:
+            courses = json.load(f)
+        
+        reorganized_courses, stats = self.reorganize_course_keys(courses)
+        
+        # Save the reorganized data back to the file
+        with open(json_file_path, 'w', encoding='utf-8') as f:
+            json.dump(reorganized_courses, f, ensure_ascii=False, indent=2)
+        
+        return stats
+
+    def reorganize_course_keys(self, courses: Dict) -> Tuple[Dict, Dict[str, int]]:
+        """
+        In-memory version of reorgnize_keys.
+        
+        Args:
+            courses: Course data to reorganize
+            
+        Returns:
+            Tuple of (reorganized course data, statistics about the changes made)
+        """
         # Define the desired key order
         key_order = [
             "name",
@@ -680,10 +936,6 @@ class CourseProcessor:
             "req_url"
         ]
         
-        # Load the course data
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            courses = json.load(f)
-        
         # Track statistics
         stats = {
             'courses_processed': 0,
@@ -714,16 +966,12 @@ class CourseProcessor:
             
             reorganized_courses[course_number] = ordered_course
         
-        # Save the reorganized data back to the file
-        with open(json_file_path, 'w', encoding='utf-8') as f:
-            json.dump(reorganized_courses, f, ensure_ascii=False, indent=2)
-        
         # Print summary
         print(f"\nReorganization completed!")
         print(f"Processed {stats['courses_processed']} courses")
         print(f"Modified order in {stats['courses_modified']} courses")
         
-        return stats
+        return reorganized_courses, stats
     
 if __name__ == "__main__":
     processor = CourseProcessor()
@@ -0,0 +1,229 @@
+import json
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set
+
+from prereq_graph import parse_requirements, strongly_connected_components
+
+REPORT_VERSION = 1
+
+
+class RequirementValidator:
+    """
+    Checks the preq / pareq references of a course collection for requirement cycles,
+    references to courses missing from the collection (dangling) and courses that list
+    themselves.
+
+    validate() checks the whole collection in linear time. update() re-checks after some
+    courses changed (e.g. an enrichment batch): a new cycle has to run through a changed
+    course, and a cycle can only break if it contained one, so only the courses on paths
+    between changed courses, plus the cycles they were on, go through Tarjan again.
+
+    Every listed course counts as an edge, including the alternatives of an 'או' clause, so
+    a reported cycle may run through an alternative the clause can be met without; the
+    report marks those edges as optional.
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        # Course -> required course -> 'preq' or 'pareq' ('preq' if listed in both)
+        self.requires: Dict[str, Dict[str, str]] = {}
+        # Course -> required courses only listed as one of several 'או' alternatives
+        self.optional: Dict[str, Set[str]] = {}
+        self.required_by: Dict[str, Set[str]] = {}
+        self.num_edges = 0
+        self.courses: Set[str] = set()
+        self.dangling: Dict[str, List[str]] = {}
+        self.self_loops: Dict[str, List[str]] = {}
+        self.cycles: List[List[str]] = []
+        self._cycle_of: Dict[str, int] = {}
+        self.last_check: Dict = {}
+        self._printed_summary: Optional[Dict] = None
+
+    def _set_requirements(self, course_number: str, course_data: Optional[Dict]):
+        previous = self.requires.pop(course_number, {})
+        self.num_edges -= len(previous)
+        for required in previous:
+            self.required_by[required].discard(course_number)
+        self.self_loops.pop(course_number, None)
+        self.optional.pop(course_number, None)
+        if course_data is None:
+            return
+
+        requires: Dict[str, str] = {}
+        optional: Set[str] = set()
+        mandatory: Set[str] = set()
+        for key in ('pareq', 'preq'):
+            for clause in parse_requirements(course_data.get(key)):
+                for required in clause:
+                    if required == course_number:
+                        self.self_loops.setdefault(course_number, []).append(key)
+                        continue
+                    requires[required] = key
+                    (optional if len(clause) > 1 else mandatory).add(required)
+        self.requires[course_number] = requires
+        if optional - mandatory:
+            self.optional[course_number] = optional - mandatory
+        self.num_edges += len(requires)
+        for required in requires:
+            self.required_by.setdefault(required, set()).add(course_number)
+
+    def _check_dangling(self, course_numbers: Iterable[str]):
+        for course_number in course_numbers:
+            missing = [required for required in self.requires.get(course_number, {})
+                       if required not in self.courses]
+            if missing:
+                self.dangling[course_number] = missing
+            else:
+                self.dangling.pop(course_number, None)
+
+    def _successors(self, course_number: str) -> List[str]:
+        return [required for required in self.requires.get(course_number, {}) if required in self.courses]
+
+    def _set_cycles(self, cycles: List[List[str]]):
+        self.cycles = sorted(sorted(cycle) for cycle in cycles)
+        self._cycle_of = {course_number: i for i, cycle in enumerate(self.cycles) for course_number in cycle}
+
+    def validate(self, courses: Dict[str, Dict]) -> Dict:
+        """
+        Check a whole course collection.
+
+        Args:
+            courses: Course number -> course data
+
+        Returns:
+            The report (see report())
+        """
+        start_time = time.perf_counter()
+        self._reset()
+        self.courses = set(courses)
+        for course_number, course_data in courses.items():
+            self._set_requirements(course_number, course_data)
+        self._check_dangling(courses)
+        self._set_cycles(strongly_connected_components(courses, self._successors))
+        self.last_check = {'mode': 'full', 'courses_checked': len(courses),
+                           'elapsed_ms': round((time.perf_counter() - start_time) * 1000, 2)}
+        return self.report()
+
+    def update(self, courses: Dict[str, Dict], changed: Iterable[str]) -> Dict:
+        """
+        Re-check after some courses were added, changed or removed.
+
+        Args:
+            courses: The current course collection
+            changed: Course numbers whose data (or presence) changed
+
+        Returns:
+            The report (see report()), covering the whole collection
+        """
+        start_time = time.perf_counter()
+        changed = set(changed)
+        added_or_removed = set()
+        for course_number in changed:
+            present = course_number in courses
+            if present != (course_number in self.courses):
+                added_or_removed.add(course_number)
+                (self.courses.add if present else self.courses.discard)(course_number)
+            self._set_requirements(course_number, courses.get(course_number))
+
+        # Courses referencing one that appeared or disappeared may have gained or lost a dangling reference
+        recheck = set(changed)
+        for course_number in added_or_removed:
+            recheck.update(self.required_by.get(course_number, ()))
+        self._check_dangling(recheck)
+
+        # Affected subgraph: courses both reachable from and reaching a changed course,
+        # plus every course that shared a cycle with a changed course before the change
+        sources = [course_number for course_number in changed if course_number in self.courses]
+        reachable = self._reach(sources, self._successors)
+        region = self._reach(sources, lambda course_number: [
+            dependent for dependent in self.required_by.get(course_number, ()) if dependent in reachable])
+        stale = {self._cycle_of[course_number] for course_number in changed if course_number in self._cycle_of}
+        for i in stale:
+            region.update(course_number for course_number in self.cycles[i] if course_number in self.courses)
+
+        kept = [cycle for i, cycle in enumerate(self.cycles) if i not in stale and not region.intersection(cycle)]
+        found = strongly_connected_components(sorted(region), lambda course_number: [
+            required for required in self._successors(course_number) if required in region])
+        self._set_cycles(kept + found)
+        self.last_check = {'mode': 'incremental', 'courses_checked': len(region | recheck),
+                           'elapsed_ms': round((time.perf_counter() - start_time) * 1000, 2)}
+        return self.report()
+
+    @staticmethod
+    def _reach(start: Iterable[str], neighbours) -> Set[str]:
+        seen = set(start)
+        queue = deque(seen)
+        while queue:
+            for neighbour in neighbours(queue.popleft()):
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    queue.append(neighbour)
+        return seen
+
+    def report(self) -> Dict:
+        """
+        Machine-readable result of the last check.
+
+        Returns:
+            Dictionary with version, the course and edge counts, cycles (courses and the
+            requirement edges between them, with coreq_only set when every edge is a
+            parallel requirement, optional_edges listing the edges that are only an 'או'
+            alternative and through_alternatives set when there are any), dangling (course
+            -> missing course numbers), self_loops (course -> the keys listing it), summary
+            counts and the last check's mode, courses_checked and elapsed_ms
+        """
+        cycles = []
+        for cycle in self.cycles:
+            members = set(cycle)
+            edges = [[course_number, required, kind]
+                     for course_number in cycle
+                     for required, kind in self.requires.get(course_number, {}).items() if required in members]
+            optional_edges = [[course_number, required] for course_number, required, _ in edges
+                              if required in self.optional.get(course_number, ())]
+            cycles.append({'courses': cycle, 'edges': edges,
+                           'coreq_only': all(kind == 'pareq' for _, _, kind in edges),
+                           'optional_edges': optional_edges,
+                           'through_alternatives': bool(optional_edges)})
+
+        return {
+            'version': REPORT_VERSION,
+            'courses': len(self.courses),
+            'edges': self.num_edges,
+            'cycles': cycles,
+            'dangling': dict(sorted(self.dangling.items())),
+            'self_loops': dict(sorted(self.self_loops.items())),
+            'summary': {
+                'cycles': len(cycles),
+                'cycles_through_alternatives': sum(cycle['through_alternatives'] for cycle in cycles),
+                'courses_on_cycles': sum(len(cycle) for cycle in self.cycles),
+                'courses_with_dangling': len(self.dangling),
+                'dangling_references': sum(len(missing) for missing in self.dangling.values()),
+                'self_loops': len(self.self_loops)
+            },
+            'last_check': self.last_check
+        }
+
+    def write_report(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+
+    def print_summary(self, only_changes: bool = False):
+        """
+        Print the summary counts of the last check.
+
+        Args:
+            only_changes: Skip printing if the counts are the same as when last printed
+                (for the per-batch checks during enrichment)
+        """
+        summary = self.report()['summary']
+        if only_changes and summary == self._printed_summary:
+            return
+        self._printed_summary = summary
+        print(f"Requirement check ({self.last_check.get('mode')}, {self.last_check.get('courses_checked')} courses, "
+              f"{self.last_check.get('elapsed_ms')} ms): {summary['cycles']} cycles over "
+              f"{summary['courses_on_cycles']} courses ({summary['cycles_through_alternatives']} through 'או' "
+              f"alternatives), {summary['dangling_references']} dangling references "
+              f"in {summary['courses_with_dangling']} courses, {summary['self_loops']} self-references")
@@ -3,6 +3,7 @@ import re
 from typing import Dict
 import requests
 from collections import defaultdict
+from grade_summary import GRADE_RANGES, get_summary_store
 
 class ToolsCourse:
     """Class to get information about courses"""
@@ -257,40 +258,23 @@ class ToolsCourse:
             'modified_courses': {}
         }
         
-        # Fetch grades from arazim-project
-        GRADES_URL = "https://arazim-project.com/data/grades.json"
-        
         try:
-            response = requests.get(GRADES_URL)
-            response.raise_for_status()
-            all_grades = response.json()
+            # All-time averages (ignoring 0.0 means) come precomputed from the grade summary table
+            summaries = get_summary_store().get_many(courses.keys())
             
             # Process each course
             for course_number, course_data in courses.items():
-                course_grades = all_grades.get(course_number, {})
+                summary = summaries.get(course_number)
                 
-                if course_grades:
-                    # Collect all valid mean grades across years/semesters/groups
-                    all_means = []
-                    
-                    for semester, groups in course_grades.items():
-                        for group_num, grade_infos in groups.items():
-                            for grade_info in grade_infos:
-                                if isinstance(grade_info, dict):
-                                    mean_grade = grade_info.get('mean')
-                                    # Only include non-zero grades
-                                    if mean_grade is not None and mean_grade != 0.0:
-                                        all_means.append(mean_grade)
-                    
-                    # Calculate and add all-time average grade if we have valid grades
-                    if all_means:
-                        course_data['avg_grade'] = round(sum(all_means) / len(all_means), 2)
-                        changes['courses_modified'] += 1
-                        changes['modified_courses'][course_number] = {
-                            'name': course_data.get('name', ''),
-                            'avg_grade': course_data['avg_grade'],
-                            'grades_counted': len(all_means)
-                        }
+                # Add the all-time average grade if we have valid grades
+                if summary and summary['avg_grade'] is not None:
+                    course_data['avg_grade'] = summary['avg_grade']
+                    changes['courses_modified'] += 1
+                    changes['modified_courses'][course_number] = {
+                        'name': course_data.get('name', ''),
+                        'avg_grade': course_data['avg_grade'],
+                        'grades_counted': summary['grades_counted']
+                    }
             
             # Save the updated data back to the file
             with open(json_file_path, 'w', encoding='utf-8') as f:
@@ -323,12 +307,6 @@ class ToolsCourse:
         Returns:
             Dictionary containing statistics about the changes made
         """
-        # Define the correct grade ranges
-        GRADE_RANGES = [
-            "0-49", "50-59", "60-64", "65-69", "70-74",
-            "75-79", "80-84", "85-89", "90-94", "95-100"
-        ]
-        
         # Load the course data
         with open(json_file_path, 'r', encoding='utf-8') as f:
             courses = json.load(f)
@@ -339,51 +317,26 @@ class ToolsCourse:
             'modified_courses': {}
         }
         
-        # Fetch grades from arazim-project
-        GRADES_URL = "https://arazim-project.com/data/grades.json"
-        
         try:
-            response = requests.get(GRADES_URL)
-            response.raise_for_status()
-            all_grades = response.json()
+            # All-time distributions come precomputed from the grade summary table
+            summaries = get_summary_store().get_many(courses.keys())
             
             # Process each course
             for course_number, course_data in courses.items():
-                course_grades = all_grades.get(course_number, {})
+                summary = summaries.get(course_number)
                 
-                if course_grades:
-                    # Initialize total distribution
-                    total_distribution = [0] * 10  # 10 grade ranges
-                    total_students = 0
+                # Only add distribution if we have data
+                if summary and summary['total_students'] > 0:
+                    # Convert distribution to grade ranges using the correct mapping
+                    course_data['grade_distribution'] = dict(zip(GRADE_RANGES, summary['distribution']))
+                    course_data['total_students'] = summary['total_students']
                     
-                    # Aggregate distributions across all semesters and groups
-                    for semester, groups in course_grades.items():
-                        for group_num, grade_infos in groups.items():
-                            for grade_info in grade_infos:
-                                if isinstance(grade_info, dict) and 'distribution' in grade_info:
-                                    dist = grade_info['distribution']
-                                    if isinstance(dist, list) and len(dist) == 10:
-                                        # Add the distribution counts
-                                        for i in range(10):
-                                            total_distribution[i] += dist[i]
-                                            total_students += dist[i]
-                
-                    # Only add distribution if we have data
-                    if total_students > 0:
-                        # Convert distribution to grade ranges using the correct mapping
-                        grade_ranges = {}
-                        for i in range(10):
-                            grade_ranges[GRADE_RANGES[i]] = total_distribution[i]
-                        
-                        course_data['grade_distribution'] = grade_ranges
-                        course_data['total_students'] = total_students
-                        
-                        changes['courses_modified'] += 1
-                        changes['modified_courses'][course_number] = {
-                            'name': course_data.get('name', ''),
-                            'distribution_added': True,
-                            'total_students': total_students
-                        }
+                    changes['courses_modified'] += 1
+                    changes['modified_courses'][course_number] = {
+                        'name': course_data.get('name', ''),
+                        'distribution_added': True,
+                        'total_students': summary['total_students']
+                    }
             
             # Save the updated data back to the file
             with open(json_file_path, 'w', encoding='utf-8') as f:
@@ -0,0 +1,83 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from db import DEFAULT_DB_PATH, CourseDatabase
+
+
+class AsyncCourseDatabase:
+    """
+    Asyncio facade over the read API of CourseDatabase.
+
+    Queries run on a bounded thread pool so they never block the event loop; each worker
+    thread uses its own pooled read-only connection. Identical queries that arrive while
+    one is already running share its result instead of hitting the database again, so the
+    returned objects may be shared between callers and must be treated as read-only.
+    A facade instance belongs to one event loop.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, max_workers: int = 4,
+                 coalesce: bool = True, db: Optional[CourseDatabase] = None):
+        """
+        Args:
+            db_path: Path to the SQLite database file (ignored if db is given)
+            max_workers: Maximum number of queries running at the same time
+            coalesce: Whether identical concurrent queries share one execution
+            db: Existing CourseDatabase to wrap
+        """
+        self.db = db or CourseDatabase(db_path)
+        self.coalesce = coalesce
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='course-db')
+        self._in_flight: Dict[tuple, asyncio.Future] = {}
+        self.coalesced = 0  # Number of calls answered by an already running query
+
+    async def _run(self, method_name: str, *args, **kwargs):
+        key = (method_name, args, tuple(sorted(kwargs.items())))
+        future = self._in_flight.get(key) if self.coalesce else None
+        if future is not None:
+            self.coalesced += 1
+        else:
+            loop = asyncio.get_running_loop()
+            call = functools.partial(getattr(self.db, method_name), *args, **kwargs)
+            future = loop.run_in_executor(self._executor, call)
+            if self.coalesce:
+                self._in_flight[key] = future
+                future.add_done_callback(
+                    lambda done: self._in_flight.pop(key) if self._in_flight.get(key) is done else None)
+        # A cancelled caller must not cancel the query for the others waiting on it
+        return await asyncio.shield(future)
+
+    async def search_courses(self, query: str, faculty: Optional[str] = None,
+                             limit: int = 50, offset: int = 0) -> List[Dict]:
+        return await self._run('search_courses', query, faculty, limit, offset)
+
+    async def get_course_info(self, course_code: str) -> Optional[Dict]:
+        return await self._run('get_course_info', course_code)
+
+    async def get_prerequisites_tree(self, course_code: str) -> Dict:
+        return await self._run('get_prerequisites_tree', course_code)
+
+    async def get_course_grades(self, course_code: str) -> List[Dict]:
+        return await self._run('get_course_grades', course_code)
+
+    async def get_courses_by_type(self, faculty_name: str, include_seminars: bool = True,
+                                  include_guided_reading: bool = True, include_projects: bool = True,
+                                  include_isolated: bool = True) -> List[Dict]:
+        return await self._run('get_courses_by_type', faculty_name, include_seminars,
+                               include_guided_reading, include_projects, include_isolated)
+
+    def query_stats(self) -> Dict[str, Dict]:
+        """Per-query latency counters of the underlying database (time spent in the worker threads)."""
+        return self.db.query_stats()
+
+    async def close(self):
+        """Wait for running queries, then shut down the workers and close the connections."""
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+        self.db.close()
+
+    async def __aenter__(self) -> 'AsyncCourseDatabase':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
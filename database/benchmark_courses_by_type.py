@@ -0,0 +1,157 @@
+import itertools
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from db import CourseDatabase
+
+# Compares the original get_courses_by_type query (GROUP BY + GROUP_CONCAT DISTINCT, three
+# correlated EXISTS on course_resources, filters in HAVING) with the flags-table version on a
+# synthetic database:
+#   python database/benchmark_courses_by_type.py [course_count]
+# Without the course_resources index the original query scans every resource row for every
+# course, so that variant is only timed (once) on small databases.
+
+UNINDEXED_LIMIT = 5000
+
+LEGACY_QUERY = """
+    SELECT
+        c.course_code,
+        c.name,
+        d.name as department,
+        f.name as faculty,
+        GROUP_CONCAT(DISTINCT CASE WHEN p.is_parallel = 0 THEN pc.course_code END) as prereqs,
+        GROUP_CONCAT(DISTINCT CASE WHEN p.is_parallel = 1 THEN pc.course_code END) as coreqs,
+        EXISTS (
+            SELECT 1 FROM course_resources cr
+            WHERE cr.course_id = c.id AND cr.resource_type = 'seminar'
+        ) as is_seminar,
+        EXISTS (
+            SELECT 1 FROM course_resources cr
+            WHERE cr.course_id = c.id AND cr.resource_type = 'guided_reading'
+        ) as is_guided_reading,
+        EXISTS (
+            SELECT 1 FROM course_resources cr
+            WHERE cr.course_id = c.id AND cr.resource_type = 'project'
+        ) as is_project
+    FROM courses c
+    LEFT JOIN departments d ON c.department_id = d.id
+    LEFT JOIN faculties f ON d.faculty_id = f.id
+    LEFT JOIN prerequisites p ON c.id = p.course_id
+    LEFT JOIN courses pc ON p.prerequisite_course_id = pc.id
+    WHERE f.name = ?
+    GROUP BY c.id
+    HAVING 1=1
+"""
+
+
+def legacy_courses_by_type(conn, faculty_name: str, include_seminars: bool = True,
+                           include_guided_reading: bool = True, include_projects: bool = True,
+                           include_isolated: bool = True) -> List[Dict]:
+    """The original implementation."""
+    query = LEGACY_QUERY
+    conditions = []
+    if not include_seminars:
+        conditions.append("is_seminar = 0")
+    if not include_guided_reading:
+        conditions.append("is_guided_reading = 0")
+    if not include_projects:
+        conditions.append("is_project = 0")
+    if not include_isolated:
+        conditions.append("(prereqs IS NOT NULL OR coreqs IS NOT NULL)")
+    if conditions:
+        query += " AND " + " AND ".join(conditions)
+
+    return [{
+        'course_code': course['course_code'],
+        'name': course['name'],
+        'faculty': course['faculty'],
+        'department': course['department'],
+        'prereqs': course['prereqs'].split(',') if course['prereqs'] else [],
+        'coreqs': course['coreqs'].split(',') if course['coreqs'] else [],
+        'is_seminar': bool(course['is_seminar']),
+        'is_guided_reading': bool(course['is_guided_reading']),
+        'is_project': bool(course['is_project'])
+    } for course in conn.execute(query, (faculty_name,)).fetchall()]
+
+
+def build_database(db_path: str, course_count: int, seed: int = 0) -> CourseDatabase:
+    """10 faculties x 10 departments, ~2 prerequisites and ~5 resources (mostly exam links) per course."""
+    rng = random.Random(seed)
+    db = CourseDatabase(db_path)
+    conn = db.get_connection()
+    conn.executemany("INSERT INTO faculties (name) VALUES (?)", [(f"faculty {i}",) for i in range(10)])
+    conn.executemany("INSERT INTO departments (faculty_id, name) VALUES (?, ?)",
+                     [(i // 10 + 1, f"department {i}") for i in range(100)])
+    conn.executemany("INSERT INTO courses (course_code, name, department_id) VALUES (?, ?, ?)",
+                     [(f"{i:08d}", f"course {i}", rng.randint(1, 100)) for i in range(course_count)])
+    conn.executemany(
+        "INSERT OR IGNORE INTO prerequisites (course_id, prerequisite_course_id, is_parallel) VALUES (?, ?, ?)",
+        [(rng.randint(1, course_count), rng.randint(1, course_count), rng.random() < 0.2)
+         for _ in range(course_count * 2)])
+    resource_types = ['exam'] * 17 + ['seminar', 'guided_reading', 'project']
+    conn.executemany("INSERT INTO course_resources (course_id, resource_type, url) VALUES (?, ?, '')",
+                     [(rng.randint(1, course_count), rng.choice(resource_types)) for _ in range(course_count * 5)])
+    conn.commit()
+    return db
+
+
+def normalize(courses: List[Dict]) -> List[Dict]:
+    return [dict(course, prereqs=sorted(course['prereqs']), coreqs=sorted(course['coreqs'])) for course in courses]
+
+
+def main():
+    course_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        start = time.perf_counter()
+        db = build_database(os.path.join(tmp_dir, 'benchmark.db'), course_count)
+        conn = db.get_read_connection()
+        print(f"{course_count} courses built in {time.perf_counter() - start:.1f}s")
+
+        option_sets = [dict(zip(('include_seminars', 'include_guided_reading', 'include_projects',
+                                 'include_isolated'), values))
+                       for values in itertools.product((True, False), repeat=4)]
+        faculty = "faculty 3"
+        mismatches = sum(
+            normalize(legacy_courses_by_type(conn, faculty, **options))
+            != normalize(db.get_courses_by_type(faculty, **options))
+            for options in option_sets
+        )
+        print(f"Output check over {len(option_sets)} filter combinations: "
+              f"{'identical' if not mismatches else f'{mismatches} differ'}")
+
+        def time_runs(fn, repeat: int = 3) -> float:
+            start_time = time.perf_counter()
+            for _ in range(repeat):
+                for options in option_sets:
+                    fn(faculty, **options)
+            return (time.perf_counter() - start_time) / (repeat * len(option_sets))
+
+        new = time_runs(db.get_courses_by_type)
+        legacy_indexed = time_runs(lambda *args, **kwargs: legacy_courses_by_type(conn, *args, **kwargs))
+
+        print(f"\n{'implementation':<40}{'ms per call':>12}")
+        if course_count <= UNINDEXED_LIMIT:
+            writer = db.get_connection()
+            writer.execute("DROP INDEX idx_course_resources_course_type")
+            writer.commit()
+            start_time = time.perf_counter()
+            legacy_courses_by_type(conn, faculty)
+            legacy = time.perf_counter() - start_time
+            print(f"{'original query, no resources index':<40}{legacy * 1000:>12.1f}")
+        else:
+            print(f"{'original query, no resources index':<40}{'skipped':>12}")
+        print(f"{'original query, with resources index':<40}{legacy_indexed * 1000:>12.1f}")
+        print(f"{'flags table':<40}{new * 1000:>12.1f}")
+        db.close()
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
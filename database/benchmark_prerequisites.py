@@ -0,0 +1,140 @@
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from db import CourseDatabase
+
+# Compares the original per-course recursion with the recursive-CTE closure and the
+# prerequisite_closure table lookup.
+# Run from the repository root:
+#   python database/benchmark_prerequisites.py [chain_length]
+# (the original recursion overflows the Python stack on chains longer than ~990 courses)
+
+JSON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'courses', 'JSONs')
+JSON_FILES = ['math.json', 'physics.json']
+
+
+def legacy_prerequisites_tree(conn: sqlite3.Connection, course_code: str) -> Dict:
+    """The original implementation: one query per visited course."""
+    def get_prereqs_recursive(code: str, visited: set) -> set:
+        if code in visited:
+            return set()
+
+        visited.add(code)
+        prereqs = conn.execute("""
+            SELECT pc.course_code, p.is_parallel
+            FROM courses c
+            JOIN prerequisites p ON c.id = p.course_id
+            JOIN courses pc ON p.prerequisite_course_id = pc.id
+            WHERE c.course_code = ?
+        """, (code,)).fetchall()
+
+        result = set()
+        for prereq in prereqs:
+            result.add((prereq['course_code'], bool(prereq['is_parallel'])))
+            if not prereq['is_parallel']:  # Only recurse for non-parallel prerequisites
+                result.update(get_prereqs_recursive(prereq['course_code'], visited))
+
+        return result
+
+    prereqs = get_prereqs_recursive(course_code, set())
+    return {
+        'direct_prereqs': [p[0] for p in prereqs if not p[1]],
+        'coreqs': [p[0] for p in prereqs if p[1]],
+        'all_prereqs': list(set(p[0] for p in prereqs))
+    }
+
+
+def build_database(db_path: str, chain_length: int) -> CourseDatabase:
+    """Import the department JSONs (with their requirements) plus a synthetic linear chain."""
+    db = CourseDatabase(db_path)
+    db.bulk_import_json_courses([os.path.join(JSON_DIR, name) for name in JSON_FILES])
+
+    # A long chain models the worst case for the per-course recursion
+    chain = [f"9999{i:04d}" for i in range(chain_length)]
+    with db.get_connection() as conn:
+        conn.executemany("INSERT OR IGNORE INTO courses (course_code, name) VALUES (?, ?)",
+                         [(code, f"chain {i}") for i, code in enumerate(chain)])
+        chain_ids = dict(conn.execute("SELECT course_code, id FROM courses WHERE course_code LIKE '9999%'"))
+        db._add_prerequisite_edges(conn, [(chain_ids[chain[i]], chain_ids[chain[i - 1]], False)
+                                          for i in range(1, chain_length)])
+        conn.commit()
+    return db
+
+
+def closure_table_tree(conn: sqlite3.Connection, course_code: str) -> List:
+    """The prerequisite_closure lookup behind get_prerequisites_tree, on a given connection."""
+    return conn.execute("""
+        SELECT oc.course_code, cl.depth, cl.via_parallel
+        FROM courses c
+        JOIN prerequisite_closure cl ON cl.course_id = c.id
+        JOIN courses oc ON oc.id = cl.ancestor_id
+        WHERE c.course_code = ?
+    """, (course_code,)).fetchall()
+
+
+def new_connection(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def normalize(tree: Dict) -> Dict:
+    return {key: sorted(value) for key, value in tree.items()}
+
+
+def time_calls(fn, course_codes, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for course_code in course_codes:
+            fn(course_code)
+    return (time.perf_counter() - start) / (repeat * len(course_codes))
+
+
+def main():
+    chain_length = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        db = build_database(os.path.join(tmp_dir, 'benchmark.db'), chain_length)
+        with db.get_connection() as conn:
+            course_codes = [row[0] for row in conn.execute("SELECT course_code FROM courses")]
+            edge_count = conn.execute("SELECT COUNT(*) FROM prerequisites").fetchone()[0]
+        catalog_codes = [code for code in course_codes if not code.startswith('9999')]
+        chain_tail = [course_codes[-1]]
+        print(f"{len(course_codes)} courses, {edge_count} prerequisite edges, chain of {chain_length}")
+
+        conn = db.get_connection()
+        mismatches = [code for code in course_codes
+                      if normalize(legacy_prerequisites_tree(conn, code)) != normalize(db.get_prerequisites_tree(code))]
+        print(f"Output check: {'identical' if not mismatches else f'{len(mismatches)} courses differ'}")
+
+        # "new" opens a connection per lookup (as CourseDatabase did before pooling),
+        # "pooled" reuses the thread's pooled connection and so measures the queries alone
+        implementations = {
+            'recursion': legacy_prerequisites_tree,
+            'CTE': db._prerequisite_closure,
+            'closure table': closure_table_tree,
+        }
+        print(f"\n{'workload':<26}{'connection':<12}" + "".join(f"{name + ' ms':>18}" for name in implementations))
+        for label, codes in (('catalog (every course)', catalog_codes), (f'end of {chain_length}-chain', chain_tail)):
+            for mode in ('new', 'pooled'):
+                line = f"{label:<26}{mode:<12}"
+                for fn in implementations.values():
+                    if mode == 'new':
+                        elapsed = time_calls(lambda code: fn(new_connection(db.db_path), code), codes, 5)
+                    else:
+                        elapsed = time_calls(lambda code: fn(conn, code), codes, 5)
+                    line += f"{elapsed * 1000:>18.3f}"
+                print(line)
+        db.close()
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
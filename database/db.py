@@ -1,80 +1,418 @@
 import sqlite3
 import json
 import os
-from typing import Dict, List, Optional, Union
+import re
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
-import requests
+
+try:
+    import ijson  # Optional: faster incremental JSON parsing
+except ImportError:
+    ijson = None
+
+try:
+    import resource  # Unix only, used to report peak memory
+except ImportError:
+    resource = None
+
+# The dataset download cache lives with the course tools
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'courses'))
+from http_cache import HttpCache, get_cache
+
+from cache import TTLCache
+from pool import ConnectionPool, timed_query
+
+DATABASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCHEMA_PATH = os.path.join(DATABASE_DIR, 'schema.sql')
+DEFAULT_DB_PATH = os.path.join(DATABASE_DIR, 'courses.db')
+
+# Transitive prerequisites of :course_code. Like getAllPrerequisites in course_graph.js, the walk
+# only continues through non-parallel prerequisites; the depth bound stops cycles.
+PREREQUISITE_CLOSURE_SQL = """
+    WITH RECURSIVE closure(course_id, depth, is_parallel) AS (
+        SELECT p.prerequisite_course_id, 1, p.is_parallel
+        FROM prerequisites p
+        JOIN courses c ON c.id = p.course_id
+        WHERE c.course_code = :course_code
+        UNION
+        SELECT p.prerequisite_course_id, cl.depth + 1, p.is_parallel
+        FROM closure cl
+        JOIN prerequisites p ON p.course_id = cl.course_id
+        WHERE cl.is_parallel = 0
+          AND cl.depth < (SELECT COUNT(*) FROM courses)
+    )
+    SELECT pc.course_code, MIN(cl.depth) AS depth, cl.is_parallel
+    FROM closure cl
+    JOIN courses pc ON pc.id = cl.course_id
+    GROUP BY pc.course_code, cl.is_parallel
+    ORDER BY depth, pc.course_code
+"""
+
+# Closure rows gained by adding the edge :course_id -> :prerequisite_id. Every course that reaches
+# :course_id through non-parallel prerequisites (and :course_id itself) now also requires the new
+# prerequisite and, if the edge is not parallel, everything the prerequisite requires.
+CLOSURE_ADD_EDGE_SQL = """
+    INSERT INTO prerequisite_closure (course_id, ancestor_id, depth, via_parallel)
+    SELECT src.course_id, dst.ancestor_id, src.depth + dst.depth, dst.via_parallel
+    FROM (
+        SELECT :course_id AS course_id, 0 AS depth
+        UNION ALL
+        SELECT course_id, depth FROM prerequisite_closure
+        WHERE ancestor_id = :course_id AND via_parallel = 0
+    ) src, (
+        SELECT :prerequisite_id AS ancestor_id, 1 AS depth, :is_parallel AS via_parallel
+        UNION ALL
+        SELECT ancestor_id, depth + 1, via_parallel FROM prerequisite_closure
+        WHERE course_id = :prerequisite_id AND :is_parallel = 0
+    ) dst
+    WHERE 1
+    ON CONFLICT (course_id, ancestor_id, via_parallel) DO UPDATE SET depth = MIN(depth, excluded.depth)
+"""
+
+# Full recomputation of the closure from the prerequisites table
+CLOSURE_REBUILD_SQL = """
+    INSERT INTO prerequisite_closure (course_id, ancestor_id, depth, via_parallel)
+    WITH RECURSIVE closure(course_id, ancestor_id, depth, via_parallel) AS (
+        SELECT course_id, prerequisite_course_id, 1, is_parallel
+        FROM prerequisites
+        UNION
+        SELECT cl.course_id, p.prerequisite_course_id, cl.depth + 1, p.is_parallel
+        FROM closure cl
+        JOIN prerequisites p ON p.course_id = cl.ancestor_id
+        WHERE cl.via_parallel = 0
+          AND cl.depth < (SELECT COUNT(*) FROM courses)
+    )
+    SELECT course_id, ancestor_id, MIN(depth), via_parallel
+    FROM closure
+    GROUP BY course_id, ancestor_id, via_parallel
+"""
+
+# Hebrew-aware text normalization for the course_search index: niqqud and cantillation marks are
+# dropped, final letters are folded into their regular forms and quote marks inside abbreviations
+# (ד"ר, דו״ח, פרופ') are removed so that typed and stored spellings meet.
+HEBREW_MARKS = {code: None for code in range(0x0591, 0x05C8)}
+HEBREW_MARKS.update({0x05BE: ' ', 0x05C0: ' ', 0x05C3: ' ', 0x05C6: ' '})  # Maqaf and punctuation split words
+HEBREW_FINAL_LETTERS = {'ך': 'כ', 'ם': 'מ', 'ן': 'נ', 'ף': 'פ', 'ץ': 'צ'}
+HEBREW_QUOTES = {'"': None, "'": None, '״': None, '׳': None, '`': None, '‘': None, '’': None, '“': None, '”': None}
+HEBREW_TRANSLATION = str.maketrans({**HEBREW_MARKS, **HEBREW_FINAL_LETTERS, **HEBREW_QUOTES})
+
+
+def normalize_hebrew(text: Optional[str]) -> str:
+    """Normalize text for indexing and querying the course_search table."""
+    if not text:
+        return ''
+    return text.translate(HEBREW_TRANSLATION).lower()
+
+
+def course_code_terms(course_code: Optional[str]) -> str:
+    """Index terms for a course code: the full code plus its two halves, without dashes."""
+    if not course_code:
+        return ''
+    code = course_code.replace('-', '')
+    return f"{code} {code[:4]} {code[4:]}" if len(code) == 8 else code
+
+# Everything get_course_info returns, in one round trip
+COURSE_INFO_SQL = """
+    SELECT c.id, c.course_code, c.name,
+           f.name AS faculty, d.name AS department,
+           (
+               SELECT json_group_array(json_object('year', year, 'semester', semester))
+               FROM (
+                   SELECT year, semester
+                   FROM course_offerings
+                   WHERE course_id = c.id
+                   ORDER BY year DESC, semester DESC
+               )
+           ) AS offerings,
+           (
+               SELECT json_group_array(json_object('group', cg.group_number, 'lecturer', l.name))
+               FROM course_groups cg
+               LEFT JOIN lecturers l ON cg.lecturer_id = l.id
+               JOIN course_offerings co ON cg.course_offering_id = co.id
+               WHERE co.course_id = c.id
+           ) AS groups,
+           (
+               SELECT json_group_array(json_object(
+                   'year', year, 'semester', semester, 'group_number', group_number, 'moed', moed,
+                   'average_grade', json(average_grade), 'median_grade', json(median_grade),
+                   'standard_deviation', json(standard_deviation), 'distribution', json(distribution)))
+               FROM (
+                   -- json() renders REALs with 15 significant digits; 17 round-trip exactly
+                   SELECT year, semester, group_number, moed,
+                          CASE WHEN average_grade IS NULL THEN 'null'
+                               ELSE printf('%!.17g', average_grade) END AS average_grade,
+                          CASE WHEN median_grade IS NULL THEN 'null'
+                               ELSE printf('%!.17g', median_grade) END AS median_grade,
+                          CASE WHEN standard_deviation IS NULL THEN 'null'
+                               ELSE printf('%!.17g', standard_deviation) END AS standard_deviation,
+                          distribution
+                   FROM course_grades
+                   WHERE course_id = c.id
+                   ORDER BY year DESC, semester DESC, group_number, moed
+               )
+           ) AS grades
+    FROM courses c
+    LEFT JOIN departments d ON c.department_id = d.id
+    LEFT JOIN faculties f ON d.faculty_id = f.id
+    WHERE c.course_code = ?
+"""
+
+
+GRADES_URL = "https://arazim-project.com/data/grades.json"
+
+GRADE_UPSERT_SQL = """
+    INSERT INTO course_grades
+        (course_id, year, semester, group_number, moed,
+         average_grade, median_grade, standard_deviation, distribution)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(course_id, year, semester, group_number, moed) DO UPDATE SET
+        average_grade = excluded.average_grade,
+        median_grade = excluded.median_grade,
+        standard_deviation = excluded.standard_deviation,
+        distribution = excluded.distribution
+"""
+
+
+def iter_json_object(path: str, chunk_size: int = 1 << 20) -> Iterator[Tuple[str, object]]:
+    """
+    Stream the (key, value) pairs of a top-level JSON object without loading the whole file.
+    
+    Uses ijson when it is installed, otherwise decodes one member at a time with the
+    standard library decoder, reading more of the file whenever a value is incomplete.
+    """
+    if ijson is not None:
+        with open(path, 'rb') as f:
+            # use_float keeps numbers as floats instead of Decimal
+            yield from ijson.kvitems(f, '', use_float=True)
+        return
+    
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = f.read(chunk_size).lstrip()
+        if not buffer.startswith('{'):
+            raise ValueError(f"{path} does not contain a JSON object")
+        start = 1  # Start of the member being decoded
+        eof = False
+        
+        while True:
+            pos = start
+            try:
+                # '[,] "key": value' or the closing brace
+                while buffer[pos] in ' \t\r\n,':
+                    pos += 1
+                if buffer[pos] == '}':
+                    return
+                key, pos = decoder.raw_decode(buffer, pos)
+                while buffer[pos] in ' \t\r\n':
+                    pos += 1
+                if buffer[pos] != ':':
+                    raise ValueError(f"Malformed JSON object in {path}")
+                pos += 1
+                while buffer[pos] in ' \t\r\n':
+                    pos += 1
+                value, pos = decoder.raw_decode(buffer, pos)
+                while buffer[pos] in ' \t\r\n':
+                    pos += 1
+                # A number cut off by the end of the buffer decodes to its prefix
+                if buffer[pos] in '0123456789.eE+-':
+                    raise IndexError
+                if buffer[pos] not in ',}':
+                    raise ValueError(f"Malformed JSON object in {path}")
+            except (json.JSONDecodeError, IndexError):
+                if eof:
+                    raise ValueError(f"Truncated JSON object in {path}")
+                # Drop the members already yielded and retry this one with more data
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[start:] + chunk
+                start = 0
+                continue
+            yield key, value
+            start = pos
+
+def execute_script(conn: sqlite3.Connection, script: str):
+    """
+    Run an SQL script statement by statement.
+    
+    Unlike Connection.executescript this doesn't commit first, so the script runs inside
+    the caller's transaction.
+    """
+    statement = ''
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            conn.execute(statement)
+            statement = ''
+    if statement.strip():
+        conn.execute(statement)
+
 
 class CourseDatabase:
-    def __init__(self, db_path: str = "database/courses.db"):
-        """Initialize the database connection."""
-        self.db_path = db_path
-        self._ensure_db_exists()
+    # Bumped whenever a migration step is added to _migrate
+    SCHEMA_VERSION = 3
 
-    def _ensure_db_exists(self):
-        """Create the database and tables if they don't exist."""
-        if not os.path.exists(os.path.dirname(self.db_path)):
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, cached_statements: int = 256,
+                 course_info_cache_size: int = 1024, course_info_ttl: float = 300.0):
+        """
+        Initialize the database connection pool and bring the schema up to date.
+        
+        Args:
+            db_path: Path to the SQLite database file
+            cached_statements: Prepared statement cache size of each pooled connection
+            course_info_cache_size: Number of courses kept in the get_course_info cache
+            course_info_ttl: Seconds before a cached course is re-read (bounds staleness
+                when another process writes to the database)
+        """
+        self.db_path = db_path
+        if os.path.dirname(self.db_path) and not os.path.exists(os.path.dirname(self.db_path)):
             os.makedirs(os.path.dirname(self.db_path))
+        self.pool = ConnectionPool(db_path, setup=self._setup_connection, cached_statements=cached_statements)
+        self.course_info_cache = TTLCache(course_info_cache_size, course_info_ttl)
+        self._migrate()
+
+    @staticmethod
+    def _setup_connection(conn: sqlite3.Connection):
+        conn.row_factory = sqlite3.Row  # This makes rows act like dictionaries
+        # Used by the course_search triggers
+        conn.create_function('hebrew_normalize', 1, normalize_hebrew, deterministic=True)
+        conn.create_function('course_code_terms', 1, course_code_terms, deterministic=True)
+
+    def _migrate(self):
+        """Apply the schema migrations the database hasn't seen yet (tracked in PRAGMA user_version)."""
+        conn = self.get_connection()
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= self.SCHEMA_VERSION:
+            return
         
-        with self.get_connection() as conn:
-            with open('database/schema.sql', 'r') as f:
-                conn.executescript(f.read())
+        conn.execute("BEGIN IMMEDIATE")  # Concurrent openers wait here and then find the work done
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                self._migrate_v1(conn)
+            if version < 2:
+                self._migrate_v2(conn)
+            if version < 3:
+                self._migrate_v3(conn)
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def _migrate_v1(self, conn: sqlite3.Connection):
+        """Create the schema, or upgrade a database created by earlier versions of this class."""
+        # Columns added after the first release (CREATE TABLE IF NOT EXISTS won't add them)
+        course_columns = [row['name'] for row in conn.execute("PRAGMA table_info(courses)")]
+        if course_columns and 'eval_type' not in course_columns:
+            conn.execute("ALTER TABLE courses ADD COLUMN eval_type TEXT")
+        
+        with open(SCHEMA_PATH, 'r', encoding='utf-8') as f:
+            execute_script(conn, f.read())
+        
+        # Courses stored before the search index existed are indexed once
+        indexed = conn.execute("SELECT COUNT(*) FROM course_search").fetchone()[0]
+        if indexed != conn.execute("SELECT COUNT(*) FROM courses").fetchone()[0]:
+            self._index_courses(conn)
+        
+        # Databases created before the closure table existed need it filled once
+        has_prereqs = conn.execute("SELECT 1 FROM prerequisites LIMIT 1").fetchone()
+        has_closure = conn.execute("SELECT 1 FROM prerequisite_closure LIMIT 1").fetchone()
+        if has_prereqs and not has_closure:
+            self._rebuild_prerequisite_closure(conn)
+
+    def _migrate_v2(self, conn: sqlite3.Connection):
+        """Add the course_type_flags table and covering indexes for get_courses_by_type."""
+        # Superseded by idx_prerequisites_course_covering
+        conn.execute("DROP INDEX IF EXISTS idx_prerequisites_course")
+        with open(SCHEMA_PATH, 'r', encoding='utf-8') as f:
+            execute_script(conn, f.read())  # Only creates the objects that are missing
+        self._rebuild_course_type_flags(conn)
+
+    def _migrate_v3(self, conn: sqlite3.Connection):
+        """Store the 10-bucket grade distribution with every grade row."""
+        grade_columns = [row['name'] for row in conn.execute("PRAGMA table_info(course_grades)")]
+        if 'distribution' not in grade_columns:
+            conn.execute("ALTER TABLE course_grades ADD COLUMN distribution TEXT")
+
+    @staticmethod
+    def _rebuild_course_type_flags(conn: sqlite3.Connection):
+        conn.execute("DELETE FROM course_type_flags")
+        conn.execute("""
+            INSERT INTO course_type_flags (course_id, is_seminar, is_guided_reading, is_project, has_prerequisites)
+            SELECT c.id,
+                   EXISTS (SELECT 1 FROM course_resources r WHERE r.course_id = c.id AND r.resource_type = 'seminar'),
+                   EXISTS (SELECT 1 FROM course_resources r WHERE r.course_id = c.id AND r.resource_type = 'guided_reading'),
+                   EXISTS (SELECT 1 FROM course_resources r WHERE r.course_id = c.id AND r.resource_type = 'project'),
+                   EXISTS (SELECT 1 FROM prerequisites p WHERE p.course_id = c.id)
+            FROM courses c
+        """)
 
     def get_connection(self) -> sqlite3.Connection:
-        """Get a database connection that returns dictionaries for rows."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # This makes rows act like dictionaries
-        return conn
+        """Get this thread's pooled read-write connection (rows act like dictionaries)."""
+        return self.pool.writer()
 
+    def get_read_connection(self) -> sqlite3.Connection:
+        """Get this thread's pooled read-only connection (rows act like dictionaries)."""
+        return self.pool.reader()
+
+    def query_stats(self) -> Dict[str, Dict]:
+        """Get per-query latency counters (count, total_ms, avg_ms, max_ms) since the pool was created."""
+        return self.pool.stats.snapshot()
+
+    def close(self):
+        """Close all pooled connections."""
+        self.pool.close_all()
+
+    @timed_query
     def get_courses_by_type(self, faculty_name: str, include_seminars: bool = True, 
                           include_guided_reading: bool = True, include_projects: bool = True,
                           include_isolated: bool = True) -> List[Dict]:
-        """Get courses filtered by type and faculty, similar to course_graph.js filtering."""
-        with self.get_connection() as conn:
-            query = """
+        """
+        Get courses filtered by type and faculty, similar to course_graph.js filtering.
+        
+        Type filters test the precomputed course_type_flags row of each course, and the
+        prerequisite lists are read per returned course from the prerequisites index.
+        """
+        conditions = ["f.name = ?"]
+        if not include_seminars:
+            conditions.append("t.is_seminar = 0")
+        if not include_guided_reading:
+            conditions.append("t.is_guided_reading = 0")
+        if not include_projects:
+            conditions.append("t.is_project = 0")
+        if not include_isolated:
+            conditions.append("t.has_prerequisites = 1")
+        
+        with self.get_read_connection() as conn:
+            courses = conn.execute(f"""
                 SELECT 
                     c.course_code,
                     c.name,
                     d.name as department,
                     f.name as faculty,
-                    GROUP_CONCAT(DISTINCT CASE WHEN p.is_parallel = 0 THEN pc.course_code END) as prereqs,
-                    GROUP_CONCAT(DISTINCT CASE WHEN p.is_parallel = 1 THEN pc.course_code END) as coreqs,
-                    EXISTS (
-                        SELECT 1 FROM course_resources cr 
-                        WHERE cr.course_id = c.id AND cr.resource_type = 'seminar'
-                    ) as is_seminar,
-                    EXISTS (
-                        SELECT 1 FROM course_resources cr 
-                        WHERE cr.course_id = c.id AND cr.resource_type = 'guided_reading'
-                    ) as is_guided_reading,
-                    EXISTS (
-                        SELECT 1 FROM course_resources cr 
-                        WHERE cr.course_id = c.id AND cr.resource_type = 'project'
-                    ) as is_project
-                FROM courses c
-                LEFT JOIN departments d ON c.department_id = d.id
-                LEFT JOIN faculties f ON d.faculty_id = f.id
-                LEFT JOIN prerequisites p ON c.id = p.course_id
-                LEFT JOIN courses pc ON p.prerequisite_course_id = pc.id
-                WHERE f.name = ?
-                GROUP BY c.id
-                HAVING 1=1
-            """
-            
-            conditions = []
-            if not include_seminars:
-                conditions.append("is_seminar = 0")
-            if not include_guided_reading:
-                conditions.append("is_guided_reading = 0")
-            if not include_projects:
-                conditions.append("is_project = 0")
-            if not include_isolated:
-                conditions.append("(prereqs IS NOT NULL OR coreqs IS NOT NULL)")
-            
-            if conditions:
-                query += " AND " + " AND ".join(conditions)
-            
-            courses = conn.execute(query, (faculty_name,)).fetchall()
+                    (
+                        SELECT GROUP_CONCAT(pc.course_code)
+                        FROM prerequisites p
+                        JOIN courses pc ON p.prerequisite_course_id = pc.id
+                        WHERE p.course_id = c.id AND p.is_parallel = 0
+                    ) as prereqs,
+                    (
+                        SELECT GROUP_CONCAT(pc.course_code)
+                        FROM prerequisites p
+                        JOIN courses pc ON p.prerequisite_course_id = pc.id
+                        WHERE p.course_id = c.id AND p.is_parallel = 1
+                    ) as coreqs,
+                    t.is_seminar,
+                    t.is_guided_reading,
+                    t.is_project
+                FROM faculties f
+                JOIN departments d ON d.faculty_id = f.id
+                JOIN courses c ON c.department_id = d.id
+                JOIN course_type_flags t ON t.course_id = c.id
+                WHERE {" AND ".join(conditions)}
+                ORDER BY c.id
+            """, (faculty_name,)).fetchall()
             
             return [{
                 'course_code': course['course_code'],
@@ -88,103 +426,214 @@ class CourseDatabase:
                 'is_project': bool(course['is_project'])
             } for course in courses]
 
+    @timed_query
+    def get_prerequisite_closure(self, course_code: str) -> List[Dict]:
+        """
+        Get the transitive prerequisite closure of a course in a single recursive query.
+        
+        Like getAllPrerequisites in course_graph.js, the walk only continues through
+        non-parallel prerequisites; parallel requirements are reported but not expanded.
+        
+        Args:
+            course_code: Course code to resolve
+            
+        Returns:
+            List of dictionaries with course_code, depth (1 = direct requirement, the
+            shortest distance is kept) and is_parallel, ordered by depth
+        """
+        with self.get_read_connection() as conn:
+            return self._prerequisite_closure(conn, course_code)
+
+    @staticmethod
+    def _prerequisite_closure(conn: sqlite3.Connection, course_code: str) -> List[Dict]:
+        """Run the closure query on an open connection."""
+        rows = conn.execute(PREREQUISITE_CLOSURE_SQL, {'course_code': course_code}).fetchall()
+        return [{
+            'course_code': row['course_code'],
+            'depth': row['depth'],
+            'is_parallel': bool(row['is_parallel'])
+        } for row in rows]
+
+    def _closure_lookup(self, course_code: str, dependents: bool) -> List[Dict]:
+        """Read the closure rows of a course in either direction from prerequisite_closure."""
+        own, other = ('ancestor_id', 'course_id') if dependents else ('course_id', 'ancestor_id')
+        with self.get_read_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT oc.course_code, cl.depth, cl.via_parallel
+                FROM courses c
+                JOIN prerequisite_closure cl ON cl.{own} = c.id
+                JOIN courses oc ON oc.id = cl.{other}
+                WHERE c.course_code = ?
+                ORDER BY cl.depth, oc.course_code
+            """, (course_code,)).fetchall()
+            return [dict(row) for row in rows]
+
+    @timed_query
     def get_prerequisites_tree(self, course_code: str) -> Dict:
         """Get the complete prerequisite tree for a course, similar to getAllPrerequisites in course_graph.js."""
-        with self.get_connection() as conn:
-            def get_prereqs_recursive(code: str, visited: set) -> set:
-                if code in visited:
-                    return set()
-                
-                visited.add(code)
-                prereqs = conn.execute("""
-                    SELECT pc.course_code, p.is_parallel
-                    FROM courses c
-                    JOIN prerequisites p ON c.id = p.course_id
-                    JOIN courses pc ON p.prerequisite_course_id = pc.id
-                    WHERE c.course_code = ?
-                """, (code,)).fetchall()
-                
-                result = set()
-                for prereq in prereqs:
-                    result.add((prereq['course_code'], bool(prereq['is_parallel'])))
-                    if not prereq['is_parallel']:  # Only recurse for non-parallel prerequisites
-                        result.update(get_prereqs_recursive(prereq['course_code'], visited))
-                
-                return result
+        closure = self._closure_lookup(course_code, dependents=False)
+        return {
+            'direct_prereqs': [p['course_code'] for p in closure if not p['via_parallel']],
+            'coreqs': [p['course_code'] for p in closure if p['via_parallel']],
+            'all_prereqs': list(dict.fromkeys(p['course_code'] for p in closure))
+        }
 
-            prereqs = get_prereqs_recursive(course_code, set())
-            return {
-                'direct_prereqs': [p[0] for p in prereqs if not p[1]],
-                'coreqs': [p[0] for p in prereqs if p[1]],
-                'all_prereqs': list(set(p[0] for p in prereqs))
-            }
+    @timed_query
+    def get_dependents_tree(self, course_code: str) -> Dict:
+        """
+        Get every course that requires this course, directly or through a prerequisite chain.
+        
+        Args:
+            course_code: Course code to look up
+            
+        Returns:
+            Dictionary with direct_dependents (courses that need it as a regular prerequisite),
+            coreq_dependents (courses that list it as a parallel requirement) and all_dependents
+        """
+        closure = self._closure_lookup(course_code, dependents=True)
+        return {
+            'direct_dependents': [d['course_code'] for d in closure if not d['via_parallel']],
+            'coreq_dependents': [d['course_code'] for d in closure if d['via_parallel']],
+            'all_dependents': list(dict.fromkeys(d['course_code'] for d in closure))
+        }
 
-    def search_courses(self, query: str, faculty: Optional[str] = None) -> List[Dict]:
-        """Enhanced search function similar to the search in course_graph.js."""
-        with self.get_connection() as conn:
-            sql = """
+    @timed_query
+    def search_courses(self, query: str, faculty: Optional[str] = None,
+                       limit: int = 50, offset: int = 0) -> List[Dict]:
+        """
+        Full-text search over course codes, names, lecturers and evaluation types.
+        
+        Every word of the query is matched as a prefix, so partial codes ('0366', '0366-11')
+        and partially typed Hebrew words work. Results are ranked by bm25, code and name
+        matches weighing more than lecturers and evaluation types.
+        
+        Args:
+            query: Search text
+            faculty: Optional faculty name to restrict the results to
+            limit: Maximum number of results
+            offset: Number of ranked results to skip (for paging)
+            
+        Returns:
+            List of dictionaries with course_code, name, department and faculty
+        """
+        # Dashes inside course codes are not part of the indexed codes
+        terms = re.findall(r'\w+', normalize_hebrew(re.sub(r'(?<=\d)-(?=\d)', '', query)))
+        
+        params = []
+        faculty_filter = ""
+        if faculty:
+            faculty_filter = """IN (
+                    SELECT fc.id FROM courses fc
+                    JOIN departments fd ON fc.department_id = fd.id
+                    JOIN faculties ff ON fd.faculty_id = ff.id
+                    WHERE ff.name = ?
+                )"""
+        
+        if terms:
+            # Every match is ranked before the page is cut, so only limit + offset rows
+            # reach the joins
+            source = f"""(
+                SELECT rowid AS id, bm25(course_search, 10.0, 5.0, 1.0, 1.0) AS score
+                FROM course_search
+                WHERE course_search MATCH ? {"AND rowid " + faculty_filter if faculty else ""}
+                ORDER BY score, rowid
+                LIMIT ?
+            ) s
+            JOIN courses c ON c.id = s.id"""
+            params.append(' '.join(f'"{term}"*' for term in terms))
+            if faculty:
+                params.append(faculty)
+            params.append(limit + offset)
+            where = ""
+            order = "s.score, s.id"
+        else:  # Nothing to match - list the courses in code order
+            source = "courses c"
+            where = "WHERE c.id " + faculty_filter if faculty else ""
+            order = "c.course_code"
+            if faculty:
+                params.append(faculty)
+        
+        with self.get_read_connection() as conn:
+            sql = f"""
                 SELECT 
                     c.course_code,
                     c.name,
                     d.name as department,
                     f.name as faculty
-                FROM courses c
+                FROM {source}
                 LEFT JOIN departments d ON c.department_id = d.id
                 LEFT JOIN faculties f ON d.faculty_id = f.id
-                WHERE (c.course_code LIKE ? OR c.name LIKE ?)
+                {where}
+                ORDER BY {order}
+                LIMIT ? OFFSET ?
             """
-            params = [f'%{query}%', f'%{query}%']
-            
-            if faculty:
-                sql += " AND f.name = ?"
-                params.append(faculty)
+            params.extend([limit, offset])
             
             return [dict(row) for row in conn.execute(sql, params).fetchall()]
 
-    def get_course_info(self, course_code: str) -> Optional[Dict]:
-        """Get comprehensive information about a course including grades."""
+    def rebuild_search_index(self):
+        """Rebuild the course_search full-text index from the courses tables."""
         with self.get_connection() as conn:
-            # Get basic course info
-            course = conn.execute("""
-                SELECT c.id, c.course_code, c.name,
-                       f.name as faculty, d.name as department
-                FROM courses c
-                LEFT JOIN departments d ON c.department_id = d.id
-                LEFT JOIN faculties f ON d.faculty_id = f.id
-                WHERE c.course_code = ?
-            """, (course_code,)).fetchone()
-            
-            if not course:
-                return None
-            
-            course_info = dict(course)
-            
-            # Get offerings
-            offerings = conn.execute("""
-                SELECT year, semester
-                FROM course_offerings
-                WHERE course_id = ?
-                ORDER BY year DESC, semester DESC
-            """, (course['id'],)).fetchall()
-            course_info['offerings'] = [dict(o) for o in offerings]
-            
-            # Get groups and lecturers - using "group_number" instead of "group"
-            groups = conn.execute("""
-                SELECT cg.group_number, l.name as lecturer
-                FROM course_groups cg
-                LEFT JOIN lecturers l ON cg.lecturer_id = l.id
-                JOIN course_offerings co ON cg.course_offering_id = co.id
-                WHERE co.course_id = ?
-            """, (course['id'],)).fetchall()
-            # Convert to the expected format with 'group' key
-            course_info['groups'] = [{'group': g['group_number'], 'lecturer': g['lecturer']} for g in groups]
-            
-            # Get grades
-            grades = self.get_course_grades(course_code)
-            if grades:
-                course_info['grades'] = grades
-            
-            return course_info
+            self._index_courses(conn)
+            conn.commit()
+
+    @staticmethod
+    def _index_courses(conn: sqlite3.Connection, course_ids: Optional[List[int]] = None):
+        """(Re)write the course_search rows of the given courses, or of every course if None."""
+        if course_ids is None:
+            conn.execute("DELETE FROM course_search")
+            selected = "1"
+            params = ()
+        else:
+            ids_json = json.dumps(list(course_ids))
+            conn.execute("DELETE FROM course_search WHERE rowid IN (SELECT value FROM json_each(?))", (ids_json,))
+            selected = "c.id IN (SELECT value FROM json_each(?))"
+            params = (ids_json,)
+        
+        conn.execute(f"""
+            INSERT INTO course_search (rowid, codes, name, lecturers, eval_type)
+            SELECT c.id, course_code_terms(c.course_code), hebrew_normalize(c.name),
+                   hebrew_normalize((
+                       SELECT GROUP_CONCAT(DISTINCT l.name)
+                       FROM course_offerings o
+                       JOIN course_groups g ON g.course_offering_id = o.id
+                       JOIN lecturers l ON l.id = g.lecturer_id
+                       WHERE o.course_id = c.id
+                   )),
+                   hebrew_normalize(c.eval_type)
+            FROM courses c
+            WHERE {selected}
+        """, params)
+
+    @timed_query
+    def get_course_info(self, course_code: str) -> Optional[Dict]:
+        """
+        Get comprehensive information about a course including grades.
+        
+        The course, its offerings, groups and grades are read in one statement (the lists are
+        aggregated with json_group_array) and kept in a read-through LRU/TTL cache. Every call
+        returns a copy of the cached entry, so callers may modify the result.
+        """
+        course_info = self.course_info_cache.get(course_code)
+        if course_info is TTLCache.MISSING:
+            with self.get_read_connection() as conn:
+                row = conn.execute(COURSE_INFO_SQL, (course_code,)).fetchone()
+            course_info = None
+            if row:
+                course_info = dict(row)
+                for key in ('offerings', 'groups', 'grades'):
+                    course_info[key] = json.loads(course_info[key])
+                if not course_info['grades']:
+                    del course_info['grades']
+            self.course_info_cache.put(course_code, course_info)
+        
+        if course_info is None:
+            return None
+        # Copy the cached entry down to the row dictionaries and their lists (grade distributions)
+        return {key: [{item_key: list(item_value) if isinstance(item_value, list) else item_value
+                       for item_key, item_value in item.items()} for item in value]
+                if isinstance(value, list) else value
+                for key, value in course_info.items()}
 
     def mark_course_type(self, course_code: str, course_type: str):
         """Mark a course as a specific type (seminar, guided_reading, project)."""
@@ -199,103 +648,202 @@ class CourseDatabase:
             """, (course_code, course_type))
             conn.commit()
 
-    def import_json_courses(self, json_path: str):
+    def import_json_courses(self, json_path: str) -> Dict:
         """Import courses from a JSON file into the database."""
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        return self.bulk_import_json_courses([json_path])
 
-        with self.get_connection() as conn:
-            # Process each course
-            for course_code, course_data in data.items():
-                # Extract faculty and department from the faculty field
-                faculty_parts = course_data['faculty'].split('/')
-                faculty_name = faculty_parts[0]
-                department_name = faculty_parts[1] if len(faculty_parts) > 1 else None
-
-                # Add faculty
-                cursor = conn.execute(
-                    "INSERT OR IGNORE INTO faculties (name) VALUES (?)",
-                    (faculty_name,)
-                )
-                faculty_id = cursor.lastrowid or conn.execute(
-                    "SELECT id FROM faculties WHERE name = ?",
-                    (faculty_name,)
-                ).fetchone()[0]
-
-                # Add department if it exists
-                department_id = None
-                if department_name:
-                    cursor = conn.execute(
-                        "INSERT OR IGNORE INTO departments (faculty_id, name) VALUES (?, ?)",
-                        (faculty_id, department_name)
-                    )
-                    department_id = cursor.lastrowid or conn.execute(
-                        "SELECT id FROM departments WHERE faculty_id = ? AND name = ?",
-                        (faculty_id, department_name)
-                    ).fetchone()[0]
-
-                # Add course
-                cursor = conn.execute(
-                    """INSERT OR IGNORE INTO courses 
-                       (course_code, name, department_id) 
-                       VALUES (?, ?, ?)""",
-                    (course_code, course_data['name'], department_id)
+    def bulk_import_json_courses(self, json_paths: List[str]) -> Dict:
+        """
+        Import courses from one or more JSON files in a single transaction.
+        
+        Dimension rows (faculties, departments, courses, offerings, lecturers) are
+        inserted with executemany and their IDs resolved in memory with one SELECT
+        per table, instead of an INSERT plus SELECT fallback for every row.
+        
+        Args:
+            json_paths: Paths to course JSON files (e.g. the department JSONs)
+            
+        Returns:
+            Dictionary with per-table insert counts, total rows, elapsed seconds and rows/sec
+        """
+        start_time = time.perf_counter()
+        
+        data = {}
+        for json_path in json_paths:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data.update(json.load(f))
+        
+        # Collect the rows of every table up front
+        faculty_names = set()
+        department_keys = set()
+        courses = []
+        for course_code, course_data in data.items():
+            # Extract faculty and department from the faculty field
+            faculty_parts = course_data['faculty'].split('/')
+            faculty_name = faculty_parts[0]
+            department_name = faculty_parts[1] if len(faculty_parts) > 1 else None
+            faculty_names.add(faculty_name)
+            if department_name:
+                department_keys.add((faculty_name, department_name))
+            
+            offering = None
+            if 'last_offered' in course_data:
+                year = int(course_data['last_offered'][:-1])  # Remove 'a' or 'b'
+                semester = course_data['last_offered'][-1]
+                offering = (year, semester)
+            courses.append((course_code, course_data, faculty_name, department_name, offering))
+        
+        lecturer_names = {
+            group['lecturer']
+            for _, course_data, _, _, _ in courses
+            for group in course_data.get('groups', [])
+            if group.get('lecturer')
+        }
+        
+        stats = {}
+        conn = self.get_connection()
+        # Pooled writers already run with journal_mode=WAL and synchronous=NORMAL
+        conn.execute("PRAGMA temp_store=MEMORY")
+        
+        conn.execute("BEGIN")
+        try:
+            # The per-row search index triggers are suspended for the load (inside the
+            # transaction, so other connections never see them missing); the imported
+            # courses are indexed with one statement at the end instead
+            suspended_triggers = [
+                row['sql'] for row in conn.execute(
+                    "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name IN (?, ?)",
+                    ('course_search_insert', 'course_search_group_insert')
                 )
-                course_id = cursor.lastrowid or conn.execute(
-                    "SELECT id FROM courses WHERE course_code = ?",
-                    (course_code,)
-                ).fetchone()[0]
-
-                # Add course offering
-                if 'last_offered' in course_data:
-                    year = course_data['last_offered'][:-1]  # Remove 'a' or 'b'
-                    semester = course_data['last_offered'][-1]
-                    conn.execute(
-                        """INSERT OR IGNORE INTO course_offerings 
-                           (course_id, year, semester) 
-                           VALUES (?, ?, ?)""",
-                        (course_id, year, semester)
-                    )
-
-                # Process groups and lecturers
-                if 'groups' in course_data:
-                    for group in course_data['groups']:
-                        if group['lecturer']:
-                            # Add lecturer
-                            cursor = conn.execute(
-                                "INSERT OR IGNORE INTO lecturers (name) VALUES (?)",
-                                (group['lecturer'],)
-                            )
-                            lecturer_id = cursor.lastrowid or conn.execute(
-                                "SELECT id FROM lecturers WHERE name = ?",
-                                (group['lecturer'],)
-                            ).fetchone()[0]
-
-                            # Add course group
-                            conn.execute(
-                                """INSERT OR IGNORE INTO course_groups 
-                                   (course_offering_id, group_number, lecturer_id) 
-                                   VALUES (
-                                       (SELECT id FROM course_offerings 
-                                        WHERE course_id = ? AND year = ? AND semester = ?),
-                                       ?, ?
-                                   )""",
-                                (course_id, year, semester, group['group'], lecturer_id)
-                            )
-
-                # Add course resources (exam links)
-                if 'exam_links' in course_data:
-                    for link in course_data['exam_links']:
-                        conn.execute(
-                            """INSERT OR IGNORE INTO course_resources 
-                               (course_id, resource_type, url) 
-                               VALUES (?, 'exam', ?)""",
-                            (course_id, link)
-                        )
+            ]
+            conn.execute("DROP TRIGGER IF EXISTS course_search_insert")
+            conn.execute("DROP TRIGGER IF EXISTS course_search_group_insert")
+            
+            # Faculties
+            stats['faculties'] = conn.executemany(
+                "INSERT OR IGNORE INTO faculties (name) VALUES (?)",
+                [(name,) for name in faculty_names]
+            ).rowcount
+            faculty_ids = {row['name']: row['id'] for row in conn.execute("SELECT id, name FROM faculties")}
+            
+            # Departments
+            stats['departments'] = conn.executemany(
+                "INSERT OR IGNORE INTO departments (faculty_id, name) VALUES (?, ?)",
+                [(faculty_ids[faculty], department) for faculty, department in department_keys]
+            ).rowcount
+            department_ids = {
+                (row['faculty_id'], row['name']): row['id']
+                for row in conn.execute("SELECT id, faculty_id, name FROM departments")
+            }
+            
+            # Courses
+            stats['courses'] = conn.executemany(
+                "INSERT OR IGNORE INTO courses (course_code, name, department_id) VALUES (?, ?, ?)",
+                [(course_code, course_data['name'],
+                  department_ids[(faculty_ids[faculty], department)] if department else None)
+                 for course_code, course_data, faculty, department, _ in courses]
+            ).rowcount
+            course_ids = {row['course_code']: row['id'] for row in conn.execute("SELECT id, course_code FROM courses")}
+            # Evaluation type is refreshed on re-import (the search index follows via trigger)
+            eval_types = {}
+            for course_code, course_data, _, _, _ in courses:
+                eval_type = course_data.get('eval_type')
+                if isinstance(eval_type, list):  # Some courses list several evaluation types
+                    eval_type = ', '.join(eval_type)
+                if eval_type:
+                    eval_types[course_ids[course_code]] = eval_type
+            conn.executemany(
+                "UPDATE courses SET eval_type = ? WHERE id = ? AND eval_type IS NOT ?",
+                [(eval_type, course_id, eval_type) for course_id, eval_type in eval_types.items()]
+            )
+            
+            # Course offerings
+            stats['course_offerings'] = conn.executemany(
+                "INSERT OR IGNORE INTO course_offerings (course_id, year, semester) VALUES (?, ?, ?)",
+                [(course_ids[course_code], offering[0], offering[1])
+                 for course_code, _, _, _, offering in courses if offering]
+            ).rowcount
+            offering_ids = {
+                (row['course_id'], row['year'], row['semester']): row['id']
+                for row in conn.execute("SELECT id, course_id, year, semester FROM course_offerings")
+            }
+            
+            # Lecturers
+            stats['lecturers'] = conn.executemany(
+                "INSERT OR IGNORE INTO lecturers (name) VALUES (?)",
+                [(name,) for name in lecturer_names]
+            ).rowcount
+            lecturer_ids = {row['name']: row['id'] for row in conn.execute("SELECT id, name FROM lecturers")}
+            
+            # Course groups of the offering each course was last given in
+            group_rows = []
+            for course_code, course_data, _, _, offering in courses:
+                if not offering:
+                    continue
+                offering_id = offering_ids[(course_ids[course_code], offering[0], offering[1])]
+                for group in course_data.get('groups', []):
+                    if group.get('lecturer'):
+                        group_rows.append((offering_id, group['group'], lecturer_ids[group['lecturer']]))
+            stats['course_groups'] = conn.executemany(
+                "INSERT OR IGNORE INTO course_groups (course_offering_id, group_number, lecturer_id) VALUES (?, ?, ?)",
+                group_rows
+            ).rowcount
+            
+            # Course resources (exam links) - skip links that are already stored
+            existing_links = {
+                (row['course_id'], row['url'])
+                for row in conn.execute("SELECT course_id, url FROM course_resources WHERE resource_type = 'exam'")
+            }
+            resource_rows = {
+                (course_ids[course_code], link)
+                for course_code, course_data, _, _, _ in courses
+                for link in course_data.get('exam_links', [])
+            } - existing_links
+            stats['course_resources'] = conn.executemany(
+                "INSERT INTO course_resources (course_id, resource_type, url) VALUES (?, 'exam', ?)",
+                sorted(resource_rows)
+            ).rowcount
+            
+            # Prerequisites ('preq') and parallel requirements ('pareq'), skipping the
+            # 'וגם'/'או' logic words and courses that are not in the database
+            edges = [
+                (course_ids[course_code], course_ids[prereq], is_parallel)
+                for course_code, course_data, _, _, _ in courses
+                for key, is_parallel in (('preq', False), ('pareq', True))
+                for prereq in course_data.get(key, [])
+                if prereq in course_ids
+            ]
+            closure_before = conn.execute("SELECT COUNT(*) FROM prerequisite_closure").fetchone()[0]
+            stats['prerequisites'] = self._add_prerequisite_edges(conn, edges)
+            stats['prerequisite_closure'] = conn.execute(
+                "SELECT COUNT(*) FROM prerequisite_closure").fetchone()[0] - closure_before
+            
+            self._index_courses(conn, [course_ids[course_code] for course_code, _, _, _, _ in courses])
+            for trigger_sql in suspended_triggers:
+                conn.execute(trigger_sql)
+            
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        self.course_info_cache.invalidate(course_code for course_code, _, _, _, _ in courses)
+        
+        elapsed = time.perf_counter() - start_time
+        total_rows = sum(stats.values())
+        result = {
+            'inserted': stats,
+            'total_rows': total_rows,
+            'elapsed_seconds': round(elapsed, 4),
+            'rows_per_sec': round(total_rows / elapsed, 1) if elapsed > 0 else float('inf')
+        }
+        print(f"Imported {len(courses)} courses from {len(json_paths)} file(s): "
+              f"{total_rows} new rows in {elapsed:.3f}s ({result['rows_per_sec']} rows/sec)")
+        return result
 
+    @timed_query
     def get_prerequisites(self, course_code: str) -> List[Dict]:
         """Get prerequisites for a course."""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             return conn.execute("""
                 SELECT c2.course_code, c2.name, p.is_parallel
                 FROM prerequisites p
@@ -304,96 +852,180 @@ class CourseDatabase:
                 WHERE c1.course_code = ?
             """, (course_code,)).fetchall()
 
-    def add_prerequisite(self, course_code: str, prereq_code: str, is_parallel: bool = False):
-        """Add a prerequisite relationship between courses."""
+    def add_prerequisite(self, course_code: str, prereq_code: str, is_parallel: bool = False) -> bool:
+        """
+        Add a prerequisite relationship between courses and update the closure table.
+        
+        Returns:
+            True if a new relationship was stored, False if it existed or a course is unknown
+        """
         with self.get_connection() as conn:
-            conn.execute("""
-                INSERT OR IGNORE INTO prerequisites (course_id, prerequisite_course_id, is_parallel)
-                VALUES (
-                    (SELECT id FROM courses WHERE course_code = ?),
-                    (SELECT id FROM courses WHERE course_code = ?),
-                    ?
-                )
-            """, (course_code, prereq_code, is_parallel))
+            course_ids = dict(conn.execute(
+                "SELECT course_code, id FROM courses WHERE course_code IN (?, ?)",
+                (course_code, prereq_code)
+            ).fetchall())
+            if course_code not in course_ids or prereq_code not in course_ids:
+                print(f"Unknown course in prerequisite {course_code} -> {prereq_code}")
+                return False
+            
+            added = self._add_prerequisite_edges(conn, [(course_ids[course_code], course_ids[prereq_code], is_parallel)])
             conn.commit()
+            return added > 0
 
-    def import_course_grades(self, cache_grades: bool = True):
-        """Import course grades from arazim-project.com."""
+    @staticmethod
+    def _add_prerequisite_edges(conn: sqlite3.Connection, edges: List[tuple]) -> int:
+        """
+        Insert prerequisite edges and extend the closure table with each new one.
         
-        GRADES_URL = "https://arazim-project.com/data/grades.json"
+        Args:
+            conn: Open connection (the caller commits)
+            edges: (course_id, prerequisite_course_id, is_parallel) tuples
+            
+        Returns:
+            Number of edges that were not stored yet
+        """
+        added = 0
+        for course_id, prerequisite_id, is_parallel in edges:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO prerequisites (course_id, prerequisite_course_id, is_parallel) VALUES (?, ?, ?)",
+                (course_id, prerequisite_id, bool(is_parallel))
+            )
+            if cursor.rowcount:  # Existing edges are already part of the closure
+                conn.execute(CLOSURE_ADD_EDGE_SQL, {
+                    'course_id': course_id,
+                    'prerequisite_id': prerequisite_id,
+                    'is_parallel': int(bool(is_parallel))
+                })
+                added += 1
+        return added
+
+    def rebuild_prerequisite_closure(self) -> int:
+        """
+        Recompute the prerequisite_closure table from scratch.
+        
+        Returns:
+            Number of closure rows
+        """
+        with self.get_connection() as conn:
+            count = self._rebuild_prerequisite_closure(conn)
+            conn.commit()
+            return count
+
+    @staticmethod
+    def _rebuild_prerequisite_closure(conn: sqlite3.Connection) -> int:
+        conn.execute("DELETE FROM prerequisite_closure")
+        return conn.execute(CLOSURE_REBUILD_SQL).rowcount
+
+    def import_course_grades(self, cache_grades: bool = True, grades_path: Optional[str] = None,
+                             batch_size: int = 5000) -> Optional[Dict]:
+        """
+        Import course grades from arazim-project.com.
+        
+        The dataset is streamed one course at a time from the download cache instead of being
+        parsed into memory as a whole, and the rows are written with batched executemany calls
+        in a single transaction.
         
+        Args:
+            cache_grades: Serve grades.json from the download cache without revalidating it
+                (False checks the server for a newer copy first)
+            grades_path: Local grades.json to import instead of downloading it
+            batch_size: Rows per executemany call
+            
+        Returns:
+            Dictionary with rows, courses, skipped_courses, elapsed_seconds, rows_per_sec and
+            peak_rss_mb, or None if the import failed
+        """
+        start_time = time.perf_counter()
         try:
-            # Fetch grades data
-            response = requests.get(GRADES_URL)
-            response.raise_for_status()
-            grades_data = response.json()
+            if grades_path is None:
+                http_cache = get_cache() if cache_grades else HttpCache(revalidate_after=0)
+                grades_path = http_cache.fetch_path(GRADES_URL)
             
-            with self.get_connection() as conn:
-                # Create grades table if it doesn't exist
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS course_grades (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        course_id INTEGER,
-                        year INTEGER NOT NULL,
-                        semester TEXT NOT NULL,
-                        group_number TEXT NOT NULL,
-                        moed INTEGER NOT NULL,
-                        average_grade REAL,
-                        median_grade REAL,
-                        standard_deviation REAL,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        FOREIGN KEY (course_id) REFERENCES courses(id),
-                        UNIQUE(course_id, year, semester, group_number, moed)
-                    )
-                """)
-                
-                for course_number, semester_data in grades_data.items():
-                    # Get course_id if it exists in our database
-                    course = conn.execute(
-                        "SELECT id FROM courses WHERE course_code = ?",
-                        (course_number,)
-                    ).fetchone()
-                    
-                    if course:
-                        course_id = course['id']
-                        for semester, groups in semester_data.items():
-                            year = semester[:-1]  # Remove 'a' or 'b' from semester
-                            sem = semester[-1]    # Get 'a' or 'b'
-                            
-                            for group_number, grade_infos in groups.items():
-                                for grade_info in grade_infos:
-                                    if not isinstance(grade_info, dict):
-                                        continue
-                                        
-                                    moed = grade_info.get('moed', 0)
-                                    mean = grade_info.get('mean')
-                                    median = grade_info.get('median')
-                                    std_dev = grade_info.get('standard_deviation')
-                                    
-                                    if mean is not None:  # Only insert if we have grade data
-                                        conn.execute("""
-                                            INSERT OR REPLACE INTO course_grades 
-                                            (course_id, year, semester, group_number, moed, 
-                                             average_grade, median_grade, standard_deviation)
-                                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                                        """, (course_id, year, sem, group_number, moed,
-                                             mean, median, std_dev))
+            conn = self.get_connection()
+            # Course numbers are matched without dashes, like in the grades dataset
+            course_ids = {
+                row['course_code'].replace('-', ''): (row['id'], row['course_code'])
+                for row in conn.execute("SELECT id, course_code FROM courses")
+            }
             
-            conn.commit()
+            batch = []
+            row_count = 0
+            skipped_courses = 0
+            imported_courses = []
+            
+            conn.execute("BEGIN")
+            try:
+                for course_number, semester_data in iter_json_object(grades_path):
+                    course = course_ids.get(course_number.replace('-', ''))
+                    if course is None or not isinstance(semester_data, dict):
+                        skipped_courses += 1
+                        continue
+                    course_id, course_code = course
+                    imported_courses.append(course_code)
+                    
+                    for semester, groups in semester_data.items():
+                        year = semester[:-1]  # Remove 'a' or 'b' from semester
+                        sem = semester[-1]    # Get 'a' or 'b'
+                        
+                        for group_number, grade_infos in groups.items():
+                            for grade_info in grade_infos:
+                                if not isinstance(grade_info, dict) or grade_info.get('mean') is None:
+                                    continue  # Only insert if we have grade data
+                                distribution = grade_info.get('distribution')
+                                batch.append((
+                                    course_id, year, sem, group_number, grade_info.get('moed', 0),
+                                    grade_info['mean'], grade_info.get('median'),
+                                    grade_info.get('standard_deviation'),
+                                    json.dumps(distribution) if distribution else None
+                                ))
+                    
+                    if len(batch) >= batch_size:
+                        conn.executemany(GRADE_UPSERT_SQL, batch)
+                        row_count += len(batch)
+                        batch.clear()
+                
+                conn.executemany(GRADE_UPSERT_SQL, batch)
+                row_count += len(batch)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            self.course_info_cache.invalidate(imported_courses)
             
         except Exception as e:
             print(f"Error importing grades: {e}")
+            return None
+        
+        elapsed = time.perf_counter() - start_time
+        stats = {
+            'rows': row_count,
+            'courses': len(imported_courses),
+            'skipped_courses': skipped_courses,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_sec': round(row_count / elapsed) if elapsed > 0 else None,
+            # ru_maxrss is in kilobytes on Linux and bytes on macOS
+            'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                                 / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+                           if resource else None
+        }
+        print(f"Imported {row_count} grade rows for {len(imported_courses)} courses "
+              f"({skipped_courses} not in the database) in {elapsed:.2f}s, "
+              f"{stats['rows_per_sec']} rows/s, peak RSS {stats['peak_rss_mb']} MB")
+        return stats
 
+    @timed_query
     def get_course_grades(self, course_code: str) -> List[Dict]:
         """Get grade history for a specific course."""
-        with self.get_connection() as conn:
+        with self.get_read_connection() as conn:
             grades = conn.execute("""
                 SELECT cg.year, cg.semester, cg.group_number, cg.moed,
-                       cg.average_grade, cg.median_grade, cg.standard_deviation
+                       cg.average_grade, cg.median_grade, cg.standard_deviation,
+                       cg.distribution
                 FROM course_grades cg
                 JOIN courses c ON c.id = cg.course_id
                 WHERE c.course_code = ?
                 ORDER BY cg.year DESC, cg.semester DESC, cg.group_number, cg.moed
             """, (course_code,)).fetchall()
             
-            return [dict(g) for g in grades] 
\ No newline at end of file
+            return [dict(g, distribution=json.loads(g['distribution']) if g['distribution'] else None)
+                    for g in grades]
\ No newline at end of file
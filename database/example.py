@@ -5,12 +5,13 @@ def main():
     # Initialize the database
     db = CourseDatabase()
 
-    # Import all JSON files from the courses directory
-    courses_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'courses')
-    for filename in os.listdir(courses_dir):
-        if filename.endswith('.json'):
-            print(f"Importing {filename}...")
-            db.import_json_courses(os.path.join(courses_dir, filename))
+    # Import all department JSON files in one transaction
+    json_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'courses', 'JSONs')
+    json_paths = [os.path.join(json_dir, filename)
+                  for filename in sorted(os.listdir(json_dir)) if filename.endswith('.json')]
+    import_stats = db.bulk_import_json_courses(json_paths)
+    for table, count in import_stats['inserted'].items():
+        print(f"  {table}: {count} new rows")
 
     # Example: Search for a physics course
     print("\nSearching for 'physics' courses:")
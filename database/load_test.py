@@ -0,0 +1,110 @@
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import tempfile
+import time
+from typing import Dict, List
+
+from async_db import AsyncCourseDatabase
+from db import DATABASE_DIR, DEFAULT_DB_PATH, CourseDatabase
+
+# Load test for AsyncCourseDatabase: concurrent clients issue a mix of the read queries a
+# course-graph endpoint would serve and the latency percentiles are reported per query.
+# Runs against a temporary copy of the database, with the department JSONs imported:
+#   python database/load_test.py --clients 50 --requests 2000
+
+JSON_DIR = os.path.join(os.path.dirname(DATABASE_DIR), 'courses', 'JSONs')
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def build_workload(db: CourseDatabase, count: int, seed: int) -> List[tuple]:
+    """Random (method, args) requests; a few popular courses get most of the traffic, like a real site."""
+    with db.get_read_connection() as conn:
+        codes = [row['course_code'] for row in conn.execute("SELECT course_code FROM courses")]
+        names = [row['name'] for row in conn.execute("SELECT name FROM courses")]
+        faculties = [row['name'] for row in conn.execute("SELECT name FROM faculties")]
+
+    rng = random.Random(seed)
+    popular = rng.sample(codes, min(20, len(codes)))
+    workload = []
+    for _ in range(count):
+        code = rng.choice(popular) if rng.random() < 0.6 else rng.choice(codes)
+        word = rng.choice(names).split()[0]
+        kind = rng.random()
+        if kind < 0.35:
+            workload.append(('search_courses', (word[:rng.randint(1, len(word))],)))
+        elif kind < 0.6:
+            workload.append(('get_course_info', (code,)))
+        elif kind < 0.8:
+            workload.append(('get_prerequisites_tree', (code,)))
+        elif kind < 0.95:
+            workload.append(('get_course_grades', (code,)))
+        else:
+            workload.append(('get_courses_by_type', (rng.choice(faculties),)))
+    return workload
+
+
+async def run_load(adb: AsyncCourseDatabase, workload: List[tuple], clients: int) -> Dict[str, List[float]]:
+    latencies: Dict[str, List[float]] = {}
+    queue = list(reversed(workload))
+
+    async def client():
+        while queue:
+            method, args = queue.pop()
+            start_time = time.perf_counter()
+            await getattr(adb, method)(*args)
+            latencies.setdefault(method, []).append(time.perf_counter() - start_time)
+
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return latencies
+
+
+def print_report(label: str, latencies: Dict[str, List[float]], elapsed: float, coalesced: int):
+    total = sum(len(values) for values in latencies.values())
+    print(f"\n{label}: {total} requests in {elapsed:.2f}s ({total / elapsed:.0f} req/s), {coalesced} coalesced")
+    print(f"{'query':<26}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    rows = sorted(latencies.items()) + [('all', [value for values in latencies.values() for value in values])]
+    for method, values in rows:
+        values = sorted(values)
+        print(f"{method:<26}{len(values):>8}{percentile(values, 0.5) * 1000:>10.2f}"
+              f"{percentile(values, 0.99) * 1000:>10.2f}{values[-1] * 1000:>10.2f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Load test the async course database API')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='Database to copy for the test')
+    parser.add_argument('--clients', type=int, default=50, help='Concurrent clients')
+    parser.add_argument('--requests', type=int, default=2000, help='Requests per run')
+    parser.add_argument('--workers', type=int, default=4, help='Database worker threads')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(tmp_dir, 'load_test.db')
+        shutil.copy(args.db, db_path)
+        db = CourseDatabase(db_path)
+        db.bulk_import_json_courses([os.path.join(JSON_DIR, name)
+                                     for name in sorted(os.listdir(JSON_DIR)) if name.endswith('.json')])
+        workload = build_workload(db, args.requests, args.seed)
+        db.close()
+
+        for coalesce in (False, True):
+            adb = AsyncCourseDatabase(db_path, max_workers=args.workers, coalesce=coalesce)
+            start_time = time.perf_counter()
+            latencies = await run_load(adb, workload, args.clients)
+            elapsed = time.perf_counter() - start_time
+            print_report(f"{args.clients} clients, {args.workers} workers, coalescing {'on' if coalesce else 'off'}",
+                         latencies, elapsed, adb.coalesced)
+            await adb.close()
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
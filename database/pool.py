@@ -0,0 +1,122 @@
+import functools
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class QueryStats:
+    """Thread-safe per-query latency counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict] = {}
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            entry = self._stats.setdefault(name, {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+            entry['count'] += 1
+            entry['total_seconds'] += seconds
+            entry['max_seconds'] = max(entry['max_seconds'], seconds)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Get the counters recorded so far.
+
+        Returns:
+            Dictionary mapping query names to count, total_ms, avg_ms and max_ms
+        """
+        with self._lock:
+            return {
+                name: {
+                    'count': entry['count'],
+                    'total_ms': round(entry['total_seconds'] * 1000, 3),
+                    'avg_ms': round(entry['total_seconds'] * 1000 / entry['count'], 3),
+                    'max_ms': round(entry['max_seconds'] * 1000, 3)
+                }
+                for name, entry in self._stats.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+def timed_query(method: Callable) -> Callable:
+    """Record the latency of a method in the owner's pool.stats under the method name."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        start_time = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.pool.stats.record(method.__name__, time.perf_counter() - start_time)
+    return wrapper
+
+
+class ConnectionPool:
+    """
+    Per-thread SQLite connections for one database file.
+
+    Every thread gets one read-write connection (WAL journal, synchronous=NORMAL) and one
+    read-only connection, each created on first use and reused afterwards, so prepared
+    statements stay in the connection's statement cache between calls. In WAL mode the
+    readers don't block the writer and vice versa.
+    """
+
+    def __init__(self, db_path: str, setup: Optional[Callable[[sqlite3.Connection], None]] = None,
+                 cached_statements: int = 256, timeout: float = 30.0):
+        """
+        Args:
+            db_path: Path to the database file
+            setup: Called with every new connection (row factory, SQL functions, ...)
+            cached_statements: Size of the prepared statement cache of each connection
+            timeout: Seconds to wait for a lock held by another connection
+        """
+        self.db_path = db_path
+        self.setup = setup
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+        self.stats = QueryStats()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+
+    def _connect(self, read_only: bool) -> sqlite3.Connection:
+        if read_only:
+            # The writer switched the file to WAL, which is persistent, before any reader connects
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, timeout=self.timeout,
+                                   cached_statements=self.cached_statements, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout,
+                                   cached_statements=self.cached_statements, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        if self.setup:
+            self.setup(conn)
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    def writer(self) -> sqlite3.Connection:
+        """Get the calling thread's read-write connection."""
+        conn = getattr(self._local, 'writer', None)
+        if conn is None:
+            conn = self._local.writer = self._connect(read_only=False)
+        return conn
+
+    def reader(self) -> sqlite3.Connection:
+        """Get the calling thread's read-only connection."""
+        conn = getattr(self._local, 'reader', None)
+        if conn is None:
+            self.writer()  # Makes sure the database exists and is in WAL mode
+            conn = self._local.reader = self._connect(read_only=True)
+        return conn
+
+    def close_all(self):
+        """Close every connection of every thread; threads reconnect on their next call."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
@@ -21,6 +21,7 @@ CREATE TABLE IF NOT EXISTS courses (
     course_code TEXT NOT NULL UNIQUE,
     name TEXT NOT NULL,
     department_id INTEGER,
+    eval_type TEXT, -- e.g. 'בחינה סופית'
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (department_id) REFERENCES departments(id)
 );
@@ -67,6 +68,19 @@ CREATE TABLE IF NOT EXISTS prerequisites (
     UNIQUE(course_id, prerequisite_course_id)
 );
 
+-- Transitive closure of prerequisites (maintained incrementally by the application).
+-- A row means ancestor_id is required, directly or through a chain of non-parallel
+-- prerequisites, before course_id; via_parallel flags a parallel final requirement.
+CREATE TABLE IF NOT EXISTS prerequisite_closure (
+    course_id INTEGER NOT NULL,
+    ancestor_id INTEGER NOT NULL,
+    depth INTEGER NOT NULL, -- Shortest chain length, 1 for direct prerequisites
+    via_parallel BOOLEAN NOT NULL DEFAULT FALSE,
+    FOREIGN KEY (course_id) REFERENCES courses(id),
+    FOREIGN KEY (ancestor_id) REFERENCES courses(id),
+    PRIMARY KEY (course_id, ancestor_id, via_parallel)
+) WITHOUT ROWID;
+
 -- Course resources table (for links to exams, materials, etc.)
 CREATE TABLE IF NOT EXISTS course_resources (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -79,6 +93,17 @@ CREATE TABLE IF NOT EXISTS course_resources (
     FOREIGN KEY (course_id) REFERENCES courses(id)
 );
 
+-- Course type flags (one row per course, maintained by the triggers below) so that
+-- type filters are plain column tests instead of subqueries on course_resources
+CREATE TABLE IF NOT EXISTS course_type_flags (
+    course_id INTEGER PRIMARY KEY,
+    is_seminar BOOLEAN NOT NULL DEFAULT FALSE,
+    is_guided_reading BOOLEAN NOT NULL DEFAULT FALSE,
+    is_project BOOLEAN NOT NULL DEFAULT FALSE,
+    has_prerequisites BOOLEAN NOT NULL DEFAULT FALSE, -- Regular or parallel
+    FOREIGN KEY (course_id) REFERENCES courses(id)
+);
+
 -- Course grades table
 CREATE TABLE IF NOT EXISTS course_grades (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -90,6 +115,7 @@ CREATE TABLE IF NOT EXISTS course_grades (
     average_grade REAL,
     median_grade REAL,
     standard_deviation REAL,
+    distribution TEXT,  -- JSON array with the 10-bucket grade histogram
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (course_id) REFERENCES courses(id),
     UNIQUE(course_id, year, semester, group_number, moed)
@@ -98,6 +124,134 @@ CREATE TABLE IF NOT EXISTS course_grades (
 -- Create indexes for better query performance
 CREATE INDEX IF NOT EXISTS idx_courses_code ON courses(course_code);
 CREATE INDEX IF NOT EXISTS idx_course_offerings_year_sem ON course_offerings(year, semester);
-CREATE INDEX IF NOT EXISTS idx_prerequisites_course ON prerequisites(course_id);
+CREATE INDEX IF NOT EXISTS idx_prerequisites_course_covering ON prerequisites(course_id, is_parallel, prerequisite_course_id);
+CREATE INDEX IF NOT EXISTS idx_prerequisite_closure_ancestor ON prerequisite_closure(ancestor_id, via_parallel, course_id);
 CREATE INDEX IF NOT EXISTS idx_course_groups_offering ON course_groups(course_offering_id);
-CREATE INDEX IF NOT EXISTS idx_course_grades ON course_grades(course_id, year, semester, group_number, moed);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_courses_department ON courses(department_id);
+CREATE INDEX IF NOT EXISTS idx_course_resources_course_type ON course_resources(course_id, resource_type);
+CREATE INDEX IF NOT EXISTS idx_course_grades ON course_grades(course_id, year, semester, group_number, moed);
+
+-- Full-text search over courses (rowid = courses.id). Text is stored normalized by the
+-- hebrew_normalize() / course_code_terms() functions that CourseDatabase registers on
+-- every connection, so writes to courses and course_groups need one of its connections.
+CREATE VIRTUAL TABLE IF NOT EXISTS course_search USING fts5(
+    codes,      -- Course code and its two halves, without dashes
+    name,
+    lecturers,
+    eval_type,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '1 2 3 4'
+);
+
+CREATE TRIGGER IF NOT EXISTS course_search_insert AFTER INSERT ON courses BEGIN
+    INSERT INTO course_search (rowid, codes, name, lecturers, eval_type)
+    VALUES (new.id, course_code_terms(new.course_code), hebrew_normalize(new.name), '',
+            hebrew_normalize(new.eval_type));
+END;
+
+CREATE TRIGGER IF NOT EXISTS course_search_update AFTER UPDATE OF course_code, name, eval_type ON courses BEGIN
+    UPDATE course_search
+    SET codes = course_code_terms(new.course_code),
+        name = hebrew_normalize(new.name),
+        eval_type = hebrew_normalize(new.eval_type)
+    WHERE rowid = new.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS course_search_delete AFTER DELETE ON courses BEGIN
+    DELETE FROM course_search WHERE rowid = old.id;
+END;
+
+-- Lecturers of a course are refreshed whenever one of its groups changes
+CREATE TRIGGER IF NOT EXISTS course_search_group_insert AFTER INSERT ON course_groups BEGIN
+    UPDATE course_search
+    SET lecturers = (
+        SELECT hebrew_normalize(GROUP_CONCAT(DISTINCT l.name))
+        FROM course_offerings o
+        JOIN course_groups g ON g.course_offering_id = o.id
+        JOIN lecturers l ON l.id = g.lecturer_id
+        WHERE o.course_id = course_search.rowid
+    )
+    WHERE rowid = (SELECT course_id FROM course_offerings WHERE id = new.course_offering_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS course_search_group_update AFTER UPDATE ON course_groups BEGIN
+    UPDATE course_search
+    SET lecturers = (
+        SELECT hebrew_normalize(GROUP_CONCAT(DISTINCT l.name))
+        FROM course_offerings o
+        JOIN course_groups g ON g.course_offering_id = o.id
+        JOIN lecturers l ON l.id = g.lecturer_id
+        WHERE o.course_id = course_search.rowid
+    )
+    WHERE rowid IN (SELECT course_id FROM course_offerings
+                    WHERE id IN (old.course_offering_id, new.course_offering_id));
+END;
+
+CREATE TRIGGER IF NOT EXISTS course_search_group_delete AFTER DELETE ON course_groups BEGIN
+    UPDATE course_search
+    SET lecturers = (
+        SELECT hebrew_normalize(GROUP_CONCAT(DISTINCT l.name))
+        FROM course_offerings o
+        JOIN course_groups g ON g.course_offering_id = o.id
+        JOIN lecturers l ON l.id = g.lecturer_id
+        WHERE o.course_id = course_search.rowid
+    )
+    WHERE rowid = (SELECT course_id FROM course_offerings WHERE id = old.course_offering_id);
+END;
+
+-- Course type flags
+CREATE TRIGGER IF NOT EXISTS course_type_flags_course_insert AFTER INSERT ON courses BEGIN
+    INSERT OR IGNORE INTO course_type_flags (course_id) VALUES (new.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS course_type_flags_course_delete AFTER DELETE ON courses BEGIN
+    DELETE FROM course_type_flags WHERE course_id = old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS course_type_flags_resource_insert AFTER INSERT ON course_resources
+WHEN new.resource_type IN ('seminar', 'guided_reading', 'project') BEGIN
+    UPDATE course_type_flags
+    SET is_seminar = is_seminar OR new.resource_type = 'seminar',
+        is_guided_reading = is_guided_reading OR new.resource_type = 'guided_reading',
+        is_project = is_project OR new.resource_type = 'project'
+    WHERE course_id = new.course_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS course_type_flags_resource_delete AFTER DELETE ON course_resources
+WHEN old.resource_type IN ('seminar', 'guided_reading', 'project') BEGIN
+    UPDATE course_type_flags
+    SET is_seminar = EXISTS (SELECT 1 FROM course_resources
+                             WHERE course_id = old.course_id AND resource_type = 'seminar'),
+        is_guided_reading = EXISTS (SELECT 1 FROM course_resources
+                                    WHERE course_id = old.course_id AND resource_type = 'guided_reading'),
+        is_project = EXISTS (SELECT 1 FROM course_resources
+                             WHERE course_id = old.course_id AND resource_type = 'project')
+    WHERE course_id = old.course_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS course_type_flags_resource_update AFTER UPDATE OF course_id, resource_type ON course_resources BEGIN
+    UPDATE course_type_flags
+    SET is_seminar = EXISTS (SELECT 1 FROM course_resources r
+                             WHERE r.course_id = course_type_flags.course_id AND r.resource_type = 'seminar'),
+        is_guided_reading = EXISTS (SELECT 1 FROM course_resources r
+                                    WHERE r.course_id = course_type_flags.course_id AND r.resource_type = 'guided_reading'),
+        is_project = EXISTS (SELECT 1 FROM course_resources r
+                             WHERE r.course_id = course_type_flags.course_id AND r.resource_type = 'project')
+    WHERE course_id IN (old.course_id, new.course_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS course_type_flags_prerequisite_insert AFTER INSERT ON prerequisites BEGIN
+    UPDATE course_type_flags SET has_prerequisites = TRUE WHERE course_id = new.course_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS course_type_flags_prerequisite_delete AFTER DELETE ON prerequisites BEGIN
+    UPDATE course_type_flags
+    SET has_prerequisites = EXISTS (SELECT 1 FROM prerequisites WHERE course_id = old.course_id)
+    WHERE course_id = old.course_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS course_type_flags_prerequisite_update AFTER UPDATE OF course_id ON prerequisites BEGIN
+    UPDATE course_type_flags
+    SET has_prerequisites = EXISTS (SELECT 1 FROM prerequisites p WHERE p.course_id = course_type_flags.course_id)
+    WHERE course_id IN (old.course_id, new.course_id);
+END;